@@ -0,0 +1,48 @@
+import random
+import timeit
+from Lucky_number import GuessIndex
+
+def play_with_lists(lucky_list, lucky_number, guesses):
+    """Resolve guesses the way play_game did: a range per guess and a rebuilt list per near miss."""
+    for player_choice in guesses:
+        if player_choice == lucky_number:
+            return
+        elif player_choice in range(lucky_number - 10, lucky_number + 11):
+            lucky_list = [num for num in lucky_list if abs(num - player_choice) <= 10]
+
+def play_with_index(lucky_list, lucky_number, guesses):
+    """Resolve the same guesses with a GuessIndex."""
+    index = GuessIndex(lucky_list, lucky_number)
+    for player_choice in guesses:
+        outcome = index.resolve(player_choice, require_member=False)
+        if outcome == "win":
+            return
+        elif outcome == "near":
+            index.narrow(player_choice)
+
+def make_games(n_games, seed=42):
+    """Generate games and the guesses of a player picking random numbers from the list."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(n_games):
+        lucky_list = rng.sample(range(101), 9)
+        lucky_number = rng.randint(0, 100)
+        lucky_list.append(lucky_number)
+        guesses = [rng.choice(lucky_list) for _ in range(5)] + [lucky_number]
+        games.append((lucky_list, lucky_number, guesses))
+    return games
+
+if __name__ == "__main__":
+    games = make_games(10000)
+    for name, play in [("lists", play_with_lists), ("index", play_with_index)]:
+        seconds = min(timeit.repeat(lambda: [play(*game) for game in games], number=1, repeat=5))
+        guesses = sum(len(game[2]) for game in games)
+        print(f"{name:>6}: {seconds * 1000:.1f} ms for {len(games)} games ({guesses / seconds:,.0f} guesses/s)")
+
+    # Resolving a single guess, without building the game
+    index = GuessIndex(*games[0][:2])
+    lucky_number = games[0][1]
+    n = 1000000
+    range_seconds = timeit.timeit(lambda: 55 in range(lucky_number - 10, lucky_number + 11), number=n)
+    index_seconds = timeit.timeit(lambda: index.resolve(55), number=n)
+    print(f"single guess: range {range_seconds / n * 1e9:.0f} ns, index {index_seconds / n * 1e9:.0f} ns")
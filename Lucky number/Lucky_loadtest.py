@@ -0,0 +1,93 @@
+import time
+import random
+import asyncio
+import argparse
+from Lucky_server import SessionStore, start_server
+
+async def send(reader, writer, line, latencies):
+    """Send one command and return the reply, recording its latency."""
+    start = time.perf_counter()
+    writer.write((line + "\n").encode())
+    await writer.drain()
+    reply = (await reader.readline()).decode().split()
+    latencies.append(time.perf_counter() - start)
+    return reply
+
+async def play_games(host, port, n_games, rng, guess_latencies):
+    """Play n_games complete games over one connection, guessing untried numbers at random."""
+    reader, writer = await asyncio.open_connection(host, port)
+    new_latencies = []
+    for _ in range(n_games):
+        reply = await send(reader, writer, "NEW", new_latencies)
+        sid, lucky_list = reply[1], [int(num) for num in reply[2:]]
+        tried = set()
+        while True:
+            untried = [num for num in lucky_list if num not in tried] or lucky_list
+            guess = rng.choice(untried)
+            tried.add(guess)
+            reply = await send(reader, writer, f"GUESS {sid} {guess}", guess_latencies)
+            if reply[0] == "WIN":
+                break
+            if reply[0] == "NEAR":
+                lucky_list = [int(num) for num in reply[1:]]
+    writer.close()
+    await writer.wait_closed()
+
+def percentile(values, q):
+    """Return the q-th percentile of values (nearest rank)."""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
+
+async def run_load_test(host=None, port=8765, clients=100, games_per_client=20, seed=None):
+    """
+    Play many games concurrently and measure the server.
+
+    Parameters:
+    - host (str): Server to test; None starts a server in this process.
+    - port (int): Port of the server.
+    - clients (int): Concurrent connections.
+    - games_per_client (int): Games played one after another on each connection.
+    - seed (int): Seed of the guessing strategy.
+
+    Returns:
+    - stats (dict): Sessions per second, guesses per second and guess latency percentiles in ms.
+    """
+    server = None
+    if host is None:
+        server = await start_server(SessionStore(seed=seed), "127.0.0.1", 0)
+        host, port = "127.0.0.1", server.sockets[0].getsockname()[1]
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        play_games(host, port, games_per_client, random.Random(rng.random()), latencies)
+        for _ in range(clients)
+    ])
+    seconds = time.perf_counter() - start
+    if server is not None:
+        server.eviction.cancel()
+        server.close()
+        await server.wait_closed()
+    return {
+        "sessions": clients * games_per_client,
+        "seconds": seconds,
+        "sessions_per_second": clients * games_per_client / seconds,
+        "guesses_per_second": len(latencies) / seconds,
+        "guess_latency_p50_ms": percentile(latencies, 50) * 1000,
+        "guess_latency_p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for Lucky_server.py.")
+    parser.add_argument("--host", help="Server to test (default: start one in this process).")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the server.")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent connections.")
+    parser.add_argument("--games", type=int, default=20, help="Games per connection.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load_test(args.host, args.port, args.clients, args.games, args.seed))
+    print(f"Sessions per second: {stats['sessions_per_second']:,.0f}")
+    print(f"Guesses per second: {stats['guesses_per_second']:,.0f}")
+    print(f"Guess latency p50: {stats['guess_latency_p50_ms']:.2f} ms")
+    print(f"Guess latency p99: {stats['guess_latency_p99_ms']:.2f} ms")
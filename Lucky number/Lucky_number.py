@@ -1,7 +1,53 @@
 import random
+from bisect import bisect_left, bisect_right
+
+class GuessIndex:
+    """Precomputed answers to the guesses of one game: the lucky list as bytes and a window over it."""
+    WINDOW = 10  # A guess within WINDOW of the lucky number is a near miss
+    __slots__ = ("values", "lo", "hi", "lucky_number")
+
+    def __init__(self, lucky_list, lucky_number):
+        # One byte per number (0..100); the narrowed list is always the window values[lo:hi]
+        self.values = bytes(lucky_list)
+        self.lo = 0
+        self.hi = len(self.values)
+        self.lucky_number = lucky_number
+
+    def contains(self, guess):
+        """Check whether a number is in the narrowed list."""
+        return 0 <= guess <= 255 and guess in self.values[self.lo:self.hi]
+
+    def resolve(self, guess, require_member=True):
+        """Answer a guess with "win", "near", "invalid" or "not-in-list"."""
+        if require_member and not self.contains(guess):
+            return "not-in-list"
+        distance = guess - self.lucky_number
+        if distance == 0:
+            return "win"
+        elif -self.WINDOW <= distance <= self.WINDOW:
+            return "near"
+        return "invalid"
+
+    def narrow(self, guess):
+        """Keep only the numbers within WINDOW of the guess by moving the window, without building a new list."""
+        if self.lo == 0 and self.hi == len(self.values):
+            # Sorted on the first narrowing only, so games without a near miss never pay for it
+            self.values = bytes(sorted(self.values))
+        self.lo = bisect_left(self.values, guess - self.WINDOW, self.lo, self.hi)
+        self.hi = bisect_right(self.values, guess + self.WINDOW, self.lo, self.hi)
+
+    def narrowed_list(self):
+        """Return the narrowed list in ascending order."""
+        return sorted(self.values[self.lo:self.hi])
+
+    def __len__(self):
+        return self.hi - self.lo
 
 class LuckyNumberGame:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # Random stream of this game: a NumPy Generator (e.g. from
+        # Lucky_simulator.spawn_generators), or None for the global random module
+        self.rng = rng
         # Initialize game variables
         self.player_name = None
         self.player_birthdate = None
@@ -9,6 +55,20 @@ class LuckyNumberGame:
         self.lucky_list = []
         self.lucky_number = None
         self.tries_count = 0
+        self.guess_index = None
+
+    @property
+    def lucky_list(self):
+        """The lucky list; once play_game has indexed the game, the narrowed list of its GuessIndex."""
+        if self.guess_index is not None:
+            return self.guess_index.narrowed_list()
+        return self._lucky_list
+
+    @lucky_list.setter
+    def lucky_list(self, lucky_list):
+        # A new list replaces the index built from the previous one
+        self._lucky_list = lucky_list
+        self.guess_index = None
 
     def get_player_name(self):
         """Get the player's name."""
@@ -49,19 +109,27 @@ class LuckyNumberGame:
 
     def generate_lucky_list(self):
         """Generate a list of lucky numbers."""
-        # Generate a list of 9 random integers between 0 and 100 (inclusive)
-        self.lucky_list = random.sample(range(101), 9)
+        # Generate a list of 9 distinct random integers between 0 and 100 (inclusive)
+        if self.rng is None:
+            self.lucky_list = random.sample(range(101), 9)
+        else:
+            self.lucky_list = self.rng.choice(101, size=9, replace=False).tolist()
 
     def generate_lucky_number(self):
         """Generate a lucky number and add it to the lucky list."""
         # Generate a random lucky number between 0 and 100 (inclusive)
-        self.lucky_number = random.randint(0, 100)
+        if self.rng is None:
+            self.lucky_number = random.randint(0, 100)
+        else:
+            self.lucky_number = int(self.rng.integers(0, 101))
         # Add the lucky number to the lucky list
         self.lucky_list.append(self.lucky_number)
 
     def play_game(self):
         """Play the game."""
         try_count = 0  # Initialize try_count to 0
+        # Index the current game so every guess is answered in constant time
+        self.guess_index = GuessIndex(self.lucky_list, self.lucky_number)
         while True:
             try_count += 1  # Increment the try_count for each try
             # Display the current try number and the current lucky list
@@ -70,7 +138,9 @@ class LuckyNumberGame:
             player_input = input("Choose a lucky number from the list: ")
             try:
                 player_choice = int(player_input)
-                if player_choice == self.lucky_number:
+                # Guesses outside the list have always been accepted here, so membership is not required
+                outcome = self.guess_index.resolve(player_choice, require_member=False)
+                if outcome == "win":
                     self.tries_count += 1
                     # Display a congratulatory message with the try number
                     print(f"Congratulations! You got the lucky number from try #{self.tries_count}")
@@ -79,7 +149,12 @@ class LuckyNumberGame:
                         break
                     else:
                         self.reset_game()  # Reset the game if the player wants to play again
-                elif player_choice in range(self.lucky_number - 10, self.lucky_number + 11):
+                        # Deal a new game; the old index would answer for the previous lucky number
+                        self.generate_lucky_list()
+                        self.generate_lucky_number()
+                        self.guess_index = GuessIndex(self.lucky_list, self.lucky_number)
+                        try_count = 0
+                elif outcome == "near":
                     self.tries_count += 1
                     # Shorten the lucky list based on the player's choice
                     self.shorten_lucky_list(player_choice)
@@ -90,12 +165,16 @@ class LuckyNumberGame:
 
     def shorten_lucky_list(self, player_choice):
         """Shorten the lucky list based on the player's choice."""
-        # Filter the lucky list to include only numbers within 10 units of the player's choice
-        self.lucky_list = [num for num in self.lucky_list if abs(num - player_choice) <= 10]
+        if self.guess_index is not None:
+            # The index moves its window; lucky_list reads the narrowed list from it
+            self.guess_index.narrow(player_choice)
+        else:
+            # Filter the lucky list to include only numbers within 10 units of the player's choice
+            self.lucky_list = [num for num in self.lucky_list if abs(num - player_choice) <= 10]
 
     def reset_game(self):
         """Reset the game by reinitializing game variables."""
-        self.__init__()  # Reset all game variables
+        self.__init__(self.rng)  # Reset all game variables, keeping the game's random stream
 
 if __name__ == "__main__":
     random.seed(42)  # Set a fixed seed for reproducibility
@@ -0,0 +1,156 @@
+import time
+import random
+import asyncio
+import argparse
+from Lucky_number import GuessIndex
+
+class GameSession:
+    # Fixed attributes keep each of the thousands of sessions small
+    __slots__ = ("index", "tries_count", "last_seen")
+
+    def __init__(self, rng):
+        """Start a game: 9 lucky numbers plus the lucky number, like LuckyNumberGame."""
+        lucky_list = rng.sample(range(101), 9)
+        lucky_number = rng.randint(0, 100)
+        lucky_list.append(lucky_number)
+        self.index = GuessIndex(lucky_list, lucky_number)
+        self.tries_count = 0
+        self.last_seen = time.monotonic()
+
+    def guess(self, player_choice):
+        """
+        Apply one guess with the rules of LuckyNumberGame.play_game and return the outcome,
+        except that the guess must be in the current list: other numbers are "not-in-list"
+        and do not count as a try.
+        """
+        self.last_seen = time.monotonic()
+        outcome = self.index.resolve(player_choice)
+        if outcome == "win":
+            self.tries_count += 1
+        elif outcome == "near":
+            self.tries_count += 1
+            # Shorten the lucky list based on the player's choice
+            self.index.narrow(player_choice)
+        return outcome
+
+    def lucky_list(self):
+        """Return the current lucky list in ascending order."""
+        return " ".join(map(str, self.index.narrowed_list()))
+
+class SessionStore:
+    def __init__(self, max_idle=300.0, seed=None):
+        """
+        Keep the sessions of a server.
+
+        Parameters:
+        - max_idle (float): Seconds after which an idle session is evicted.
+        - seed (int): Seed of the random generator used for new games.
+        """
+        self.sessions = {}
+        self.next_id = 0
+        self.max_idle = max_idle
+        self.rng = random.Random(seed)
+
+    def new(self):
+        """Create a session and return its id."""
+        self.next_id += 1
+        self.sessions[self.next_id] = GameSession(self.rng)
+        return self.next_id
+
+    def evict_idle(self, now=None):
+        """Remove the sessions idle for longer than max_idle and return how many were removed."""
+        now = time.monotonic() if now is None else now
+        idle = [sid for sid, session in self.sessions.items() if now - session.last_seen > self.max_idle]
+        for sid in idle:
+            del self.sessions[sid]
+        return len(idle)
+
+# Answer one line of the text protocol
+def handle_command(store, line):
+    """
+    Commands, one per line:
+    NEW                 -> OK <sid> <lucky list>
+    GUESS <sid> <n>     -> WIN <tries> | NEAR <lucky list> | INVALID | NOTINLIST
+    LIST <sid>          -> OK <sid> <lucky list>
+    QUIT <sid>          -> BYE
+    """
+    parts = line.split()
+    if not parts:
+        return "ERROR empty command"
+    command = parts[0].upper()
+    if command == "NEW":
+        sid = store.new()
+        return f"OK {sid} {store.sessions[sid].lucky_list()}"
+    try:
+        session = store.sessions[int(parts[1])]
+    except (IndexError, ValueError, KeyError):
+        return "ERROR unknown session"
+    if command == "GUESS":
+        try:
+            player_choice = int(parts[2])
+        except (IndexError, ValueError):
+            return "ERROR Invalid input. Please enter a number."
+        outcome = session.guess(player_choice)
+        if outcome == "win":
+            # A finished game frees its session
+            del store.sessions[int(parts[1])]
+            return f"WIN {session.tries_count}"
+        if outcome == "near":
+            return f"NEAR {session.lucky_list()}"
+        if outcome == "not-in-list":
+            return "NOTINLIST"
+        return "INVALID"
+    if command == "LIST":
+        session.last_seen = time.monotonic()
+        return f"OK {parts[1]} {session.lucky_list()}"
+    if command == "QUIT":
+        del store.sessions[int(parts[1])]
+        return "BYE"
+    return f"ERROR unknown command {command}"
+
+async def serve_client(store, reader, writer):
+    """Answer the commands of one TCP connection; a connection may run many sessions."""
+    try:
+        while line := await reader.readline():
+            writer.write((handle_command(store, line.decode()) + "\n").encode())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def evict_forever(store, interval):
+    """Evict idle sessions every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        store.evict_idle()
+
+async def start_server(store, host="127.0.0.1", port=8765, evict_interval=10.0):
+    """
+    Start the game server and its eviction task.
+
+    Returns:
+    - server (Server): The asyncio server; server.eviction is the eviction task.
+    """
+    server = await asyncio.start_server(lambda reader, writer: serve_client(store, reader, writer), host, port)
+    server.eviction = asyncio.create_task(evict_forever(store, evict_interval))
+    return server
+
+async def main(host, port, max_idle, seed):
+    store = SessionStore(max_idle, seed)
+    server = await start_server(store, host, port)
+    print(f"Lucky Number server listening on {host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-session Lucky Number Game server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port.")
+    parser.add_argument("--max-idle", type=float, default=300.0, help="Seconds before an idle session is evicted.")
+    parser.add_argument("--seed", type=int, help="Random seed for new games.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.max_idle, args.seed))
+    except KeyboardInterrupt:
+        pass
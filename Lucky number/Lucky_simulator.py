@@ -0,0 +1,235 @@
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Game constants, matching LuckyNumberGame
+LIST_SIZE = 9      # Numbers drawn without replacement by generate_lucky_list
+MAX_NUMBER = 100   # Numbers are drawn from 0..MAX_NUMBER
+WINDOW = 10        # A guess within WINDOW of the lucky number shortens the list
+
+def spawn_generators(seed, n_streams):
+    """
+    Create independent random streams from one seed with SeedSequence.spawn.
+    Stream i only depends on the seed and i, so results do not depend on
+    which process consumes it.
+
+    Parameters:
+    - seed (int or SeedSequence): Root seed; None draws fresh entropy.
+    - n_streams (int): Number of streams, e.g. one per game or per block.
+
+    Returns:
+    - generators (list): NumPy Generators.
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in root.spawn(n_streams)]
+
+def generate_games(rng, n_games):
+    """
+    Generate the lucky lists and lucky numbers of many games at once.
+    Each row holds LIST_SIZE distinct numbers in random order (like
+    random.sample) followed by the lucky number, which may repeat one of them
+    (like generate_lucky_number).
+
+    Parameters:
+    - rng (Generator): NumPy random generator.
+    - n_games (int): Number of games.
+
+    Returns:
+    - values (ndarray): (n_games, LIST_SIZE + 1) int8 lucky lists.
+    - lucky (ndarray): (n_games,) int8 lucky numbers.
+    """
+    # Draw with replacement and redraw the rows that contain a duplicate;
+    # about 70% of rows are accepted each round
+    first, second = np.triu_indices(LIST_SIZE, 1)
+    samples = rng.integers(0, MAX_NUMBER + 1, size=(n_games, LIST_SIZE), dtype=np.int8)
+    redraw = np.arange(n_games)
+    while len(redraw):
+        rows = samples[redraw]
+        redraw = redraw[(rows[:, first] == rows[:, second]).any(axis=1)]
+        samples[redraw] = rng.integers(0, MAX_NUMBER + 1, size=(len(redraw), LIST_SIZE), dtype=np.int8)
+    lucky = rng.integers(0, MAX_NUMBER + 1, size=n_games, dtype=np.int8)
+    return np.concatenate([samples, lucky[:, None]], axis=1), lucky
+
+# Guessing strategies: called as strategy(values, active, tried, rng) with the
+# (games, LIST_SIZE + 1) lucky lists, a mask of the numbers still in each list
+# and a mask of the numbers already guessed; they return one guess per game.
+
+def untried(active, tried):
+    """Mask of the numbers in the current list that were not guessed yet, or the whole list if none are left."""
+    candidates = active & ~tried
+    exhausted = ~candidates.any(axis=1)
+    candidates[exhausted] = active[exhausted]
+    return candidates
+
+def random_strategy(values, active, tried, rng):
+    """Guess a random number from the current list, possibly one already guessed."""
+    keys = rng.random(values.shape, dtype=np.float32)
+    keys[~active] = -1.0
+    return values[np.arange(len(values)), keys.argmax(axis=1)]
+
+def random_untried_strategy(values, active, tried, rng):
+    """Guess a random number from the current list that was not guessed before."""
+    keys = rng.random(values.shape, dtype=np.float32)
+    keys[~untried(active, tried)] = -1.0
+    return values[np.arange(len(values)), keys.argmax(axis=1)]
+
+def first_strategy(values, active, tried, rng):
+    """Guess the first number of the current list that was not guessed before."""
+    return values[np.arange(len(values)), untried(active, tried).argmax(axis=1)]
+
+def median_strategy(values, active, tried, rng):
+    """Guess the median of the untried numbers of the current list, which shortens it the most on a near miss."""
+    candidates = untried(active, tried)
+    ordered = np.sort(np.where(candidates, values, np.iinfo(values.dtype).max), axis=1)
+    middle = (candidates.sum(axis=1) - 1) // 2
+    return ordered[np.arange(len(values)), middle]
+
+STRATEGIES = {
+    "random": random_strategy,
+    "random_untried": random_untried_strategy,
+    "first": first_strategy,
+    "median": median_strategy,
+}
+
+def play_games(values, lucky, strategy, rng, max_guesses=100):
+    """
+    Play many games at once with the rules of LuckyNumberGame.play_game:
+    guessing the lucky number wins, a guess within WINDOW of it counts as a
+    try and shortens the list to the numbers within WINDOW of the guess, and
+    any other guess is invalid and leaves the list unchanged. The lists are
+    never reallocated; shortening clears entries of the active mask.
+
+    Parameters:
+    - values (ndarray): (n_games, LIST_SIZE + 1) lucky lists.
+    - lucky (ndarray): (n_games,) lucky numbers.
+    - strategy (callable): Guessing strategy (see STRATEGIES).
+    - rng (Generator): NumPy random generator passed to the strategy.
+    - max_guesses (int): Games not won after this many guesses are abandoned.
+
+    Returns:
+    - won (ndarray): True for the games that were won.
+    - tries (ndarray): tries_count of each game (valid guesses, including the winning one).
+    - guesses (ndarray): Number of guesses of each game, including invalid ones.
+    """
+    n_games = len(values)
+    won = np.zeros(n_games, dtype=bool)
+    tries = np.zeros(n_games, dtype=np.int32)
+    guesses = np.zeros(n_games, dtype=np.int32)
+
+    # State of the games still being played; finished games are dropped after
+    # every guess so each step works on compact arrays
+    playing = np.arange(n_games)
+    values = np.asarray(values, dtype=np.int8)
+    lucky = np.asarray(lucky, dtype=np.int8)
+    active = np.ones(values.shape, dtype=bool)
+    tried = np.zeros(values.shape, dtype=bool)
+    step_tries = np.zeros(n_games, dtype=np.int32)
+
+    for step in range(1, max_guesses + 1):
+        guess = strategy(values, active, tried, rng).astype(np.int8)
+        tried |= values == guess[:, None]
+
+        distance = np.abs(guess - lucky)
+        valid = distance <= WINDOW
+        step_tries += valid
+        finished = distance == 0
+
+        # Near misses keep only the numbers within WINDOW of the guess
+        near = valid & ~finished
+        active &= ~near[:, None] | (np.abs(values - guess[:, None]) <= WINDOW)
+
+        won[playing[finished]] = True
+        tries[playing[finished]] = step_tries[finished]
+        guesses[playing[finished]] = step
+        keep = ~finished
+        if not keep.any():
+            break
+        playing, values, lucky = playing[keep], values[keep], lucky[keep]
+        active, tried, step_tries = active[keep], tried[keep], step_tries[keep]
+
+    else:
+        # Games not won after max_guesses are abandoned
+        tries[playing] = step_tries
+        guesses[playing] = max_guesses
+
+    return won, tries, guesses
+
+def play_block(strategy, n_games, rng, max_guesses=100):
+    """
+    Generate and play one block of games with its own generator.
+
+    Returns:
+    - wins (int): Games won.
+    - tries_histogram (ndarray): Won games per tries_count.
+    - total_guesses (int): Guesses of the won games.
+    """
+    if isinstance(strategy, str):
+        strategy = STRATEGIES[strategy]
+    values, lucky = generate_games(rng, n_games)
+    won, tries, guesses = play_games(values, lucky, strategy, rng, max_guesses)
+    tries_histogram = np.bincount(tries[won], minlength=max_guesses + 1)
+    return int(won.sum()), tries_histogram, int(guesses[won].sum())
+
+def simulate(strategy="random_untried", n_games=1000000, seed=None, block_size=1 << 18, max_guesses=100, workers=1):
+    """
+    Simulate many games and aggregate the results. Games are generated and
+    played in blocks of block_size to bound memory. Every block draws from
+    its own stream spawned from the seed, so a seed gives the same results
+    whatever the number of workers.
+
+    Parameters:
+    - strategy (str or callable): Name in STRATEGIES or a module-level strategy function.
+    - n_games (int): Number of games.
+    - seed (int): Seed of the NumPy random streams.
+    - block_size (int): Games generated and played at once.
+    - max_guesses (int): Games not won after this many guesses are abandoned.
+    - workers (int): Processes playing blocks in parallel; 1 plays them in this process.
+
+    Returns:
+    - stats (dict): Win rate, mean tries and guesses of the won games, the
+      histogram of tries and the simulation speed.
+    """
+    sizes = [min(block_size, n_games - first) for first in range(0, n_games, block_size)]
+    rngs = spawn_generators(seed, len(sizes))
+    start = time.perf_counter()
+
+    jobs = ([strategy] * len(sizes), sizes, rngs, [max_guesses] * len(sizes))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            blocks = list(executor.map(play_block, *jobs))
+    else:
+        blocks = list(map(play_block, *jobs))
+
+    wins = sum(block[0] for block in blocks)
+    tries_histogram = np.zeros(max_guesses + 1, dtype=np.int64)
+    for block in blocks:
+        tries_histogram += block[1]
+    total_guesses = sum(block[2] for block in blocks)
+
+    seconds = time.perf_counter() - start
+    return {
+        "games": n_games,
+        "win_rate": wins / n_games,
+        "mean_tries": float((tries_histogram * np.arange(max_guesses + 1)).sum() / max(wins, 1)),
+        "mean_guesses": total_guesses / max(wins, 1),
+        "tries_histogram": {tries: int(count) for tries, count in enumerate(tries_histogram) if count},
+        "seconds": seconds,
+        "games_per_second": n_games / seconds if seconds > 0 else float("inf"),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of the Lucky Number Game.")
+    parser.add_argument("--games", type=int, default=1000000, help="Number of games.")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), default="random_untried", help="Guessing strategy.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    parser.add_argument("--max-guesses", type=int, default=100, help="Guesses before a game is abandoned.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes playing blocks of games in parallel.")
+    args = parser.parse_args()
+
+    stats = simulate(args.strategy, args.games, args.seed, max_guesses=args.max_guesses, workers=args.workers)
+    print(f"Strategy: {args.strategy}")
+    print(f"Win rate: {stats['win_rate']:.4f}")
+    print(f"Mean tries: {stats['mean_tries']:.3f}")
+    print(f"Mean guesses: {stats['mean_guesses']:.3f}")
+    print(f"Games per second: {stats['games_per_second']:,.0f}")
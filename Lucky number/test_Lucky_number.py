@@ -3,7 +3,7 @@ from unittest.mock import patch
 from io import StringIO
 import random
 from datetime import date
-from Lucky_number import LuckyNumberGame
+from Lucky_number import LuckyNumberGame, GuessIndex
 
 # Define a test class for LuckyNumberGame
 class TestLuckyNumberGame(unittest.TestCase):
@@ -103,6 +103,21 @@ class TestLuckyNumberGame(unittest.TestCase):
         with patch('builtins.print') as mock_print:
             game.play_game()
 
+    # Test case: Testing that the lucky list is read from the game's index once play starts
+    @patch('builtins.input', side_effect=['35', '42', 'n'])
+    def test_play_game_narrows_index(self, mock_input):
+        # Create an instance of LuckyNumberGame
+        game = LuckyNumberGame()
+        # Set the lucky_number and lucky_list attributes
+        game.lucky_number = 42
+        game.lucky_list = [90, 10, 35, 50, 42]
+        with patch('builtins.print') as mock_print:
+            game.play_game()
+        # The near miss moved the window of the index instead of rebuilding the list
+        self.assertEqual(game.lucky_list, [35, 42])
+        self.assertIsInstance(game.guess_index.values, bytes)
+        self.assertIn("the new list is: [35, 42]", mock_print.call_args_list[1][0][0])
+
     # Test case: Testing the reset_game() method
     @patch('builtins.input', side_effect=['n'])
     def test_reset_game(self, mock_input):
@@ -120,6 +135,30 @@ class TestLuckyNumberGame(unittest.TestCase):
         self.assertIsNone(game.lucky_number)
         self.assertEqual(game.tries_count, 0)
 
+    # Test case: Testing the precomputed guess outcomes of GuessIndex
+    def test_guess_index(self):
+        index = GuessIndex([90, 10, 35, 50, 42], 42)
+        self.assertEqual(index.resolve(42), "win")
+        self.assertEqual(index.resolve(35), "near")
+        self.assertEqual(index.resolve(90), "invalid")
+        self.assertEqual(index.resolve(41), "not-in-list")
+        # Outside the list, the legacy rules of play_game still apply
+        self.assertEqual(index.resolve(41, require_member=False), "near")
+        # Narrowing keeps the numbers within 10 of the guess, in ascending order
+        index.narrow(35)
+        self.assertEqual(index.narrowed_list(), [35, 42])
+        self.assertEqual(len(index), 2)
+        self.assertFalse(index.contains(50))
+        self.assertTrue(index.contains(42))
+        self.assertEqual(index.resolve(50), "not-in-list")
+        # A guess far outside 0..100 empties the list instead of failing
+        for guess in (500, -50):
+            index = GuessIndex([90, 10, 35, 50, 42], 42)
+            index.narrow(guess)
+            self.assertEqual(index.narrowed_list(), [])
+            self.assertFalse(index.contains(42))
+            self.assertEqual(index.resolve(guess), "not-in-list")
+
 #  running the unit tests
 if __name__ == '__main__':
     unittest.main()
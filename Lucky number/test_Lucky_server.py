@@ -0,0 +1,53 @@
+import unittest
+from Lucky_number import GuessIndex
+from Lucky_server import GameSession, SessionStore, handle_command
+from Lucky_loadtest import run_load_test
+
+# Define a test class for the game server
+class TestLuckyServer(unittest.IsolatedAsyncioTestCase):
+
+    # Test case: Testing a game played through the text protocol
+    def test_handle_command(self):
+        store = SessionStore(seed=42)
+        reply = handle_command(store, "NEW").split()
+        sid = int(reply[1])
+        session = store.sessions[sid]
+        # Force a known game
+        session.index = GuessIndex([10, 35, 50, 90, 42], 42)
+        self.assertEqual(handle_command(store, f"GUESS {sid} 90"), "INVALID")
+        self.assertEqual(handle_command(store, f"GUESS {sid} 41"), "NOTINLIST")
+        self.assertEqual(handle_command(store, f"GUESS {sid} 35"), "NEAR 35 42")
+        self.assertEqual(handle_command(store, f"GUESS {sid} 50"), "NOTINLIST")
+        self.assertEqual(handle_command(store, f"GUESS {sid} abc"), "ERROR Invalid input. Please enter a number.")
+        self.assertEqual(handle_command(store, f"GUESS {sid} 42"), "WIN 2")
+        # A won game frees its session
+        self.assertNotIn(sid, store.sessions)
+        self.assertEqual(handle_command(store, f"GUESS {sid} 42"), "ERROR unknown session")
+
+    # Test case: Testing the eviction of idle sessions
+    def test_evict_idle(self):
+        store = SessionStore(max_idle=60)
+        first = store.new()
+        second = store.new()
+        store.sessions[first].last_seen -= 120
+        self.assertEqual(store.evict_idle(), 1)
+        self.assertEqual(list(store.sessions), [second])
+
+    # Test case: Testing that sessions only hold the slotted game state
+    def test_session_slots(self):
+        session = GameSession(SessionStore().rng)
+        self.assertFalse(hasattr(session, "__dict__"))
+        self.assertEqual(len(session.index), 10)
+        # The numbers are stored one byte each
+        self.assertIsInstance(session.index.values, bytes)
+
+    # Test case: Testing many concurrent games over TCP
+    async def test_load_test(self):
+        stats = await run_load_test(clients=20, games_per_client=5, seed=1)
+        self.assertEqual(stats["sessions"], 100)
+        self.assertGreater(stats["sessions_per_second"], 0)
+        self.assertGreaterEqual(stats["guess_latency_p99_ms"], stats["guess_latency_p50_ms"])
+
+#  running the unit tests
+if __name__ == '__main__':
+    unittest.main()
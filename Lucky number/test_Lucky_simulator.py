@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from Lucky_number import LuckyNumberGame
+from Lucky_simulator import generate_games, play_games, simulate, spawn_generators, first_strategy, LIST_SIZE
+
+# Define a test class for the Monte Carlo simulator
+class TestLuckySimulator(unittest.TestCase):
+
+    # Test case: Testing the batched generation of lucky lists
+    def test_generate_games(self):
+        values, lucky = generate_games(np.random.default_rng(0), 10000)
+        # Each list holds LIST_SIZE distinct numbers followed by the lucky number
+        self.assertEqual(values.shape, (10000, LIST_SIZE + 1))
+        self.assertTrue(all(len(set(row[:LIST_SIZE])) == LIST_SIZE for row in values.tolist()))
+        self.assertTrue((values >= 0).all() and (values <= 100).all())
+        self.assertTrue((values[:, -1] == lucky).all())
+
+    # Test case: Testing that batched games follow the rules of LuckyNumberGame
+    def test_play_games_matches_game(self):
+        values, lucky = generate_games(np.random.default_rng(1), 500)
+        won, tries, guesses = play_games(values, lucky, first_strategy, np.random.default_rng(2))
+
+        for i in range(len(values)):
+            # Replay the game one guess at a time with the first untried number
+            game = LuckyNumberGame()
+            game.lucky_list = values[i].tolist()
+            game.lucky_number = int(lucky[i])
+            tried = set()
+            for guess_count in range(1, 101):
+                untried = [num for num in game.lucky_list if num not in tried] or game.lucky_list
+                guess = untried[0]
+                tried.add(guess)
+                if guess == game.lucky_number:
+                    game.tries_count += 1
+                    break
+                elif guess in range(game.lucky_number - 10, game.lucky_number + 11):
+                    game.tries_count += 1
+                    game.shorten_lucky_list(guess)
+            # Check that both implementations agree
+            self.assertTrue(won[i])
+            self.assertEqual(tries[i], game.tries_count)
+            self.assertEqual(guesses[i], guess_count)
+
+    # Test case: Testing the aggregate statistics
+    def test_simulate(self):
+        stats = simulate("random_untried", n_games=20000, seed=42, block_size=5000)
+        # The lucky number always stays in the list, so every game is won
+        self.assertEqual(stats["win_rate"], 1.0)
+        self.assertEqual(sum(stats["tries_histogram"].values()), 20000)
+        self.assertGreaterEqual(stats["mean_guesses"], stats["mean_tries"])
+        # The same seed gives the same results
+        self.assertEqual(simulate("random_untried", n_games=20000, seed=42, block_size=5000)["tries_histogram"],
+                         stats["tries_histogram"])
+
+    # Test case: Testing that results do not depend on the number of workers
+    def test_simulate_workers(self):
+        serial = simulate("random_untried", n_games=20000, seed=7, block_size=5000)
+        parallel = simulate("random_untried", n_games=20000, seed=7, block_size=5000, workers=2)
+        self.assertEqual(parallel["tries_histogram"], serial["tries_histogram"])
+        self.assertEqual(parallel["mean_guesses"], serial["mean_guesses"])
+
+    # Test case: Testing per-game random streams
+    def test_spawn_generators(self):
+        first_games = [LuckyNumberGame(rng) for rng in spawn_generators(3, 4)]
+        second_games = [LuckyNumberGame(rng) for rng in spawn_generators(3, 4)]
+        for game in first_games + second_games:
+            game.generate_lucky_list()
+            game.generate_lucky_number()
+        # The same seed deals the same games, and every stream deals a different game
+        self.assertEqual([g.lucky_list for g in first_games], [g.lucky_list for g in second_games])
+        self.assertEqual(len({tuple(g.lucky_list) for g in first_games}), 4)
+        self.assertTrue(all(len(set(g.lucky_list[:9])) == 9 for g in first_games))
+        # Resetting a game keeps its stream
+        rng = first_games[0].rng
+        first_games[0].reset_game()
+        self.assertIs(first_games[0].rng, rng)
+
+#  running the unit tests
+if __name__ == '__main__':
+    unittest.main()
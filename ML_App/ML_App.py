@@ -1,52 +1,1285 @@
+import io
+import os
+import sys
+import copy
+import json
+import time
+import shutil
+import argparse
+import contextlib
+import hashlib
+import tempfile
+import multiprocessing
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.preprocessing import StandardScaler
+import scipy.sparse
+from sklearn.base import clone, BaseEstimator, ClassifierMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection import (
+    train_test_split, ParameterGrid, RepeatedKFold, RepeatedStratifiedKFold
+)
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, FunctionTransformer
 from sklearn.linear_model import (
-    LinearRegression, LassoCV, Ridge, ElasticNet, LogisticRegression
+    LinearRegression, LassoCV, Ridge, ElasticNet, LogisticRegression,
+    SGDRegressor, SGDClassifier
 )
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVR, SVC
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neural_network import MLPRegressor, MLPClassifier
+from sklearn.svm import SVR, SVC, LinearSVR, LinearSVC
+from sklearn.kernel_approximation import Nystroem, RBFSampler
 from sklearn.metrics import (
     mean_absolute_error, mean_squared_error, r2_score,
-    accuracy_score, classification_report
+    accuracy_score, classification_report, confusion_matrix
 )
 from sklearn.metrics import ConfusionMatrixDisplay
 import joblib
+from joblib import Parallel, delayed
+from concurrent.futures import ProcessPoolExecutor
+from ML_Scoring import ARTIFACT_VERSION, adapt_input, save_linear
+
+# Fit a single candidate model and score it on the test set
+def fit_and_score(model, X_train, y_train, X_test, y_test, scorer):
+    """
+    Fit a model on the training set and score its predictions on the test set.
+    Defined at module level so it can be sent to worker processes.
+
+    Parameters:
+    - model: The machine learning model to be fitted.
+    - X_train, y_train: The training features and target.
+    - X_test, y_test: The testing features and target.
+    - scorer (callable): Metric called as scorer(y_true, y_pred).
+
+    Returns:
+    - model: The fitted model.
+    - score: The score of the model on the test set.
+    - timings (dict): Wall time, CPU time and memory delta of the fit and the
+      predict, measured in the process that ran them.
+    - y_pred (ndarray): The predictions on the test set.
+    """
+    X_train, X_test = adapt_input(model, X_train), adapt_input(model, X_test)
+    start = clock()
+    model.fit(X_train, y_train)
+    fit_timing = elapsed(start)
+    start = clock()
+    y_pred = model.predict(X_test)
+    predict_timing = elapsed(start)
+    return model, scorer(y_test, y_pred), {"fit": fit_timing, "predict": predict_timing}, y_pred
+
+# Fit a candidate model on one cross-validation fold
+def fit_and_score_fold(model, preprocessor, X, y, train_index, test_index, scorer):
+    """
+    Preprocess the features with a copy of the preprocessor fitted on the
+    training rows of the fold only, then fit and score a copy of the model
+    on the fold. Defined at module level so it can be sent to worker processes.
+
+    Parameters:
+    - model: The unfitted machine learning model.
+    - preprocessor: The unfitted preprocessing (see build_preprocessor).
+    - X, y: The raw features (DataFrame or array) and the target of the whole dataset.
+    - train_index, test_index: Row positions of the fold.
+    - scorer (callable): Metric called as scorer(y_true, y_pred).
+
+    Returns:
+    - score: The score of the model on the test rows of the fold.
+    - timings (dict): Wall time, CPU time and memory delta of the fit and the predict.
+    """
+    preprocessor = clone(preprocessor)
+    rows = X.iloc if isinstance(X, pd.DataFrame) else X
+    X_train = preprocessor.fit_transform(rows[train_index])
+    X_test = preprocessor.transform(rows[test_index])
+    model, score, timings, _ = fit_and_score(clone(model), X_train, y[train_index], X_test, y[test_index], scorer)
+    return score, timings
+
+# Convert features to the compute dtype; a module-level function so pipelines can be pickled
+def to_dtype(X, dtype="float64"):
+    """Return X as a NumPy array of the given dtype, without a copy if it already is one."""
+    return np.asarray(X, dtype=dtype)
+
+# Build the preprocessing of the feature columns
+def build_preprocessor(X, dtype="float64", sparse=None):
+    """
+    Build an unfitted ColumnTransformer for the feature columns of X.
+    Numeric columns are converted to dtype, imputed with their median and
+    standardized. Other columns (strings, categoricals) are one-hot encoded
+    into a sparse block of dtype; a missing value is a category of its own
+    and values not seen during the fit are ignored. Columns are selected by
+    position, so the fitted preprocessor applies to DataFrames and arrays.
+
+    Parameters:
+    - X (DataFrame): The raw feature columns.
+    - dtype (str): "float64" or "float32"; float32 halves the memory of the
+      prepared arrays.
+    - sparse (bool): True keeps the one-hot features sparse, False always
+      returns a dense array, None returns a sparse matrix only when it is
+      mostly zeros.
+
+    Returns:
+    - preprocessor (ColumnTransformer): The unfitted preprocessing.
+    """
+    numeric = [i for i, col in enumerate(X.columns)
+               if pd.api.types.is_numeric_dtype(X[col]) and not isinstance(X[col].dtype, pd.CategoricalDtype)]
+    categorical = [i for i in range(X.shape[1]) if i not in numeric]
+    sparse_threshold = {None: 0.3, True: 1.0, False: 0.0}[sparse]
+    return ColumnTransformer([
+        ("numeric", Pipeline([
+            ("dtype", FunctionTransformer(to_dtype, kw_args={"dtype": dtype}, feature_names_out="one-to-one")),
+            ("impute", SimpleImputer(strategy="median")),
+            ("scale", StandardScaler()),
+        ]), numeric),
+        ("categorical", OneHotEncoder(handle_unknown="ignore", dtype=dtype), categorical),
+    ], sparse_threshold=sparse_threshold)
+
+# Models whose predictions are a linear function of the preprocessed features
+LINEAR_MODELS = (LinearRegression, LassoCV, Ridge, ElasticNet, LogisticRegression,
+                 SGDRegressor, SGDClassifier, LinearSVR, LinearSVC)
+
+# Convert a NumPy scalar or a missing value for a JSON schema
+def to_json_value(value):
+    """Return value as a plain Python value, with missing values as None."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+# Export a linear model and its preprocessing as plain arrays
+def export_linear(artifact):
+    """
+    Export the artifact of a linear model so it can be scored with NumPy
+    alone (see ML_Scoring.predict_linear). The standardization is folded
+    into the weights of the numeric columns, which apply to raw values
+    after imputation; every one-hot encoded column gets one weight per
+    category.
+
+    Parameters:
+    - artifact (dict): Output of Evaluator.build_artifact.
+
+    Returns:
+    - meta (dict): The feature schema, categories, classes and model type.
+    - arrays (dict): The weights, the imputation values and the intercept.
+
+    Raises:
+    - ValueError: If the model or its preprocessing cannot be exported.
+    """
+    model, scaler, features = artifact["model"], artifact["scaler"], artifact["features"]
+    if not isinstance(model, LINEAR_MODELS):
+        raise ValueError(f"{model.__class__.__name__} is not a linear model; save it as a joblib file instead.")
+    if features is None:
+        raise ValueError("The artifact has no feature schema to export.")
+    coef = np.atleast_2d(np.asarray(model.coef_, dtype=np.float64))
+    intercept = np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)).copy()
+
+    # (numeric positions, fill values, means, scales, output slice) and one
+    # (position, categories, output slice) per one-hot encoded column
+    if scaler is None:
+        n = len(features)
+        numeric = (list(range(n)), np.full(n, np.nan), np.zeros(n), np.ones(n), slice(0, n))
+        categorical = []
+    elif isinstance(scaler, StandardScaler):
+        n = len(features)
+        numeric = (list(range(n)), np.full(n, np.nan), scaler.mean_ if scaler.with_mean else np.zeros(n),
+                   scaler.scale_ if scaler.with_std else np.ones(n), slice(0, n))
+        categorical = []
+    elif isinstance(scaler, ColumnTransformer):
+        pipeline, columns = scaler.named_transformers_["numeric"], scaler.transformers_[0][2]
+        if columns:
+            numeric = (list(columns), pipeline["impute"].statistics_, pipeline["scale"].mean_,
+                       pipeline["scale"].scale_, scaler.output_indices_["numeric"])
+        else:
+            numeric = ([], np.zeros(0), np.zeros(0), np.ones(0), slice(0, 0))
+        categorical = []
+        start = scaler.output_indices_["categorical"].start
+        encoder, columns = scaler.named_transformers_["categorical"], scaler.transformers_[1][2]
+        for position, categories in zip(columns, getattr(encoder, "categories_", [])):
+            categorical.append((position, categories, slice(start, start + len(categories))))
+            start += len(categories)
+    else:
+        raise ValueError(f"{scaler.__class__.__name__} preprocessing cannot be exported.")
+
+    positions, fill, mean, scale, block = numeric
+    numeric_weights = coef[:, block] / scale
+    intercept -= numeric_weights @ mean
+    arrays = {"intercept": intercept, "numeric_weights": numeric_weights,
+              "numeric_fill": np.asarray(fill, dtype=np.float64)}
+    for i, (position, categories, block) in enumerate(categorical):
+        arrays[f"categorical_weights_{i}"] = coef[:, block]
+    meta = {
+        "features": list(features),
+        "numeric": [features[i] for i in positions],
+        "categorical": [features[position] for position, _, _ in categorical],
+        "categories": [[to_json_value(value) for value in categories] for _, categories, _ in categorical],
+        "classes": [to_json_value(value) for value in getattr(model, "classes_", [])],
+        "estimator": model.__class__.__name__,
+        "target": artifact.get("target"),
+        "model_type": "classifier" if hasattr(model, "classes_") else "regressor",
+    }
+    return meta, arrays
+
+# Write an array to disk once and reopen it as a read-only memmap
+def memmap_array(array, folder, name):
+    """
+    Dump an array to folder and load it back memory-mapped, so worker
+    processes receive a reference to the file instead of a pickled copy.
+    Object arrays (e.g. string labels) and sparse matrices cannot be
+    memory-mapped as one file and are returned unchanged.
+
+    Parameters:
+    - array: The array (or pandas Series) to share.
+    - folder (str): Directory in which the memmap file is written.
+    - name (str): Base name of the memmap file.
+
+    Returns:
+    - The memory-mapped array, or the original array for object dtypes and sparse matrices.
+    """
+    if isinstance(array, np.memmap) or scipy.sparse.issparse(array):
+        return array
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        return array
+    path = os.path.join(folder, f"{name}.mmap")
+    joblib.dump(array, path)
+    return joblib.load(path, mmap_mode="r")
+
+# Keep the best scoring model of a sweep
+def pick_best(fitted):
+    """
+    Pick the best model from (fitted model, score) pairs. The first model wins
+    ties, so the result only depends on the order of the candidates.
+
+    Parameters:
+    - fitted (iterable): (fitted model, score, ...) tuples; higher scores are better.
+
+    Returns:
+    - best_model: The best performing model.
+    - best_score: The score of the best model.
+    """
+    best_score = -float("inf")
+    best_model = None
+
+    for model, score, *_ in fitted:
+        if score > best_score:
+            best_score = score
+            best_model = model
+
+    return best_model, best_score
+
+# Split rows into train and holdout by hashing their contents
+def hash_holdout(chunk, test_size=0.3):
+    """
+    Assign each row to the holdout set from a hash of its values, so the split
+    can be computed chunk by chunk and is the same on every pass over the file.
+    Numeric columns are hashed as float64 and the others as strings, so a row
+    keeps its side when a column is inferred with another dtype on a later
+    read (e.g. an int column that appended rows turn into floats).
+
+    Parameters:
+    - chunk (DataFrame): Rows of the dataset.
+    - test_size (float): Fraction of rows that go to the holdout set.
+
+    Returns:
+    - mask (ndarray): True for holdout rows.
+    """
+    canonical = pd.DataFrame({
+        i: column.astype(np.float64) if pd.api.types.is_numeric_dtype(column) else column.astype(str)
+        for i, (_, column) in enumerate(chunk.items())
+    })
+    hashes = pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+    return hashes % 10000 < test_size * 10000
+
+# Draw a subsample that keeps the distribution of the target
+def stratified_subsample(y, n_samples, bins=None, random_state=101):
+    """
+    Pick about n_samples row positions at random, in the same proportions
+    per class as y. A continuous target is stratified on bins of equal
+    frequency instead. Every class or bin keeps at least one row.
+
+    Parameters:
+    - y (array): The target.
+    - n_samples (int): Number of rows to keep.
+    - bins (int): Number of quantile bins of a continuous target, or None for class labels.
+    - random_state (int): Seed of the draw.
+
+    Returns:
+    - positions (ndarray): Sorted positions of the kept rows.
+    """
+    y = np.asarray(y)
+    if bins is None:
+        labels = np.unique(y, return_inverse=True)[1]
+    else:
+        labels = np.searchsorted(np.quantile(y, np.linspace(0, 1, bins + 1)[1:-1]), y)
+    # Shuffle, then group the positions by label; each group keeps its first rows
+    order = np.random.default_rng(random_state).permutation(len(y))
+    order = order[np.argsort(labels[order], kind="stable")]
+    counts = np.bincount(labels)
+    quotas = np.maximum(counts * n_samples // len(y), counts > 0)
+    starts = np.cumsum(counts) - counts
+    return np.sort(np.concatenate([order[start:start + quota] for start, quota in zip(starts, quotas)]))
+
+# Peak resident set size of the current process
+def peak_rss():
+    """
+    Return the peak resident set size of the current process in bytes,
+    or None on platforms without the resource module.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+# Current resident set size of the process
+def current_rss():
+    """
+    Return the current resident set size of the process in bytes, read from
+    /proc on Linux, or None where it is not available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+# Snapshot of the clocks and memory, to be passed to elapsed()
+def clock():
+    """
+    Return a (wall time, CPU time, resident set size) snapshot.
+    """
+    return time.perf_counter(), time.process_time(), current_rss()
+
+# Measure what happened since a clock() snapshot
+def elapsed(start):
+    """
+    Compute the wall time, CPU time and memory delta since a snapshot.
+
+    Parameters:
+    - start (tuple): Snapshot returned by clock().
+
+    Returns:
+    - timing (dict): "wall_time" and "cpu_time" in seconds, "memory_delta" in bytes
+      (None when the resident set size is not available).
+    """
+    wall, cpu, rss = clock()
+    return {
+        "wall_time": wall - start[0],
+        "cpu_time": cpu - start[1],
+        "memory_delta": None if rss is None or start[2] is None else rss - start[2],
+    }
+
+# Infer compact dtypes from a sample of the dataset
+def infer_dtypes(sample, max_category_ratio=0.5):
+    """
+    Decide how each column of a sample should be stored.
+
+    Parameters:
+    - sample (DataFrame): The first rows of the dataset, read with default dtypes.
+    - max_category_ratio (float): String columns whose number of distinct values
+      is at most this fraction of the sample rows are stored as categoricals.
+
+    Returns:
+    - dtypes (dict): Column name -> "integer", "float", "category" or "object".
+    """
+    dtypes = {}
+    for col in sample.columns:
+        values = sample[col]
+        if pd.api.types.is_bool_dtype(values):
+            dtypes[col] = "object"
+        elif pd.api.types.is_integer_dtype(values):
+            dtypes[col] = "integer"
+        elif pd.api.types.is_float_dtype(values):
+            dtypes[col] = "float"
+        elif values.nunique() <= max_category_ratio * max(values.notna().sum(), 1):
+            dtypes[col] = "category"
+        else:
+            dtypes[col] = "object"
+    return dtypes
+
+# Downcast the columns of one chunk according to the inferred dtypes
+def compact_chunk(chunk, dtypes):
+    """
+    Downcast the numeric columns of a chunk. Integers get the smallest integer
+    type holding the chunk's values and floats become float32 only when no
+    precision is lost, so the result is always exact; pd.concat later upcasts
+    chunks that needed a wider type.
+
+    Parameters:
+    - chunk (DataFrame): A chunk read by pd.read_csv.
+    - dtypes (dict): Output of infer_dtypes.
+
+    Returns:
+    - chunk (DataFrame): The compacted chunk.
+    """
+    for col, kind in dtypes.items():
+        values = chunk[col]
+        if kind == "integer" and pd.api.types.is_integer_dtype(values):
+            chunk[col] = pd.to_numeric(values, downcast="integer")
+        elif kind == "float" and pd.api.types.is_float_dtype(values):
+            compact = values.astype(np.float32)
+            if np.array_equal(compact.to_numpy(np.float64), values.to_numpy(np.float64), equal_nan=True):
+                chunk[col] = compact
+    return chunk
+
+# Hash the contents of a file
+def file_digest(file_path, block_size=1 << 20):
+    """
+    Compute the SHA-256 digest of a file, reading it block by block.
+
+    Parameters:
+    - file_path (str): Path to the file.
+    - block_size (int): Bytes read at a time.
+
+    Returns:
+    - digest (str): Hexadecimal digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    # A memmap dataset is a directory: hash its files in name order
+    paths = [os.path.join(file_path, name) for name in sorted(os.listdir(file_path))] if os.path.isdir(file_path) else [file_path]
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(block_size), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+# Dataset formats recognised by Evaluator.load_data, by file extension
+DATASET_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".npyds": "memmap",
+}
+
+# Find the format of a dataset from its extension
+def dataset_format(file_path):
+    """
+    Return "csv", "parquet", "feather" (Arrow IPC) or "memmap" from the
+    extension of file_path. Unknown extensions are read as CSV.
+    """
+    extension = os.path.splitext(file_path.rstrip("/"))[1].lower()
+    return DATASET_FORMATS.get(extension, "csv")
+
+# Read a memmap dataset written by convert_dataset
+def read_memmap_dataset(folder, columns=None):
+    """
+    Open the columns of a memmap dataset as read-only memory-mapped arrays
+    and wrap them in a DataFrame without copying them.
+
+    Parameters:
+    - folder (str): The .npyds directory.
+    - columns (list): Columns to open, or None for all of them.
+
+    Returns:
+    - df (DataFrame): One memory-mapped column per requested column.
+    """
+    with open(os.path.join(folder, "schema.json")) as file:
+        schema = json.load(file)
+    names = schema["columns"] if columns is None else list(columns)
+    missing = [name for name in names if name not in schema["columns"]]
+    if missing:
+        raise ValueError(f"Columns {missing} are not in the dataset.")
+    arrays = {name: np.load(os.path.join(folder, f"{schema['columns'].index(name)}.npy"), mmap_mode="r")
+              for name in names}
+    return pd.DataFrame(arrays, copy=False)
+
+# Convert a CSV file to a columnar format once
+def convert_dataset(csv_path, output_path):
+    """
+    Convert a CSV file to the format given by the extension of output_path:
+    .parquet, .feather/.arrow (Arrow IPC, uncompressed so it can be
+    memory-mapped) or .npyds. Parquet and Arrow need the optional pyarrow
+    package. A .npyds memmap dataset is a directory holding one .npy file
+    per column and a schema.json; it only stores numeric columns, which are
+    then loaded without parsing or copying.
+
+    Parameters:
+    - csv_path (str): Path to the CSV file.
+    - output_path (str): Path of the converted dataset.
+
+    Returns:
+    - output_path (str): Path of the converted dataset.
+    """
+    df = pd.read_csv(csv_path)
+    kind = dataset_format(output_path)
+    if kind == "parquet":
+        df.to_parquet(output_path, index=False)
+    elif kind == "feather":
+        df.to_feather(output_path, compression="uncompressed")
+    elif kind == "memmap":
+        non_numeric = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        if non_numeric:
+            raise ValueError(f"Columns {non_numeric} are not numeric; use .parquet or .feather for this dataset.")
+        os.makedirs(output_path, exist_ok=True)
+        for position, col in enumerate(df.columns):
+            # File names are positions, so any column name is allowed
+            np.save(os.path.join(output_path, f"{position}.npy"), np.ascontiguousarray(df[col].to_numpy()))
+        with open(os.path.join(output_path, "schema.json"), "w") as file:
+            json.dump({"columns": list(df.columns), "rows": len(df)}, file)
+    else:
+        raise ValueError(f"Unknown output format for '{output_path}'. Use .parquet, .feather, .arrow or .npyds.")
+    return output_path
+
+# Squared Euclidean distances between the rows of two float arrays
+def squared_distances(A, B, B_norms=None):
+    """Return the (len(A), len(B)) matrix of squared distances, clipped at 0 against rounding."""
+    B_norms = (B * B).sum(axis=1) if B_norms is None else B_norms
+    distances = (A * A).sum(axis=1)[:, None] - 2 * (A @ B.T) + B_norms
+    return np.maximum(distances, 0, out=distances)
+
+# Define a base class for nearest-neighbour classifiers backed by an index
+class IndexedNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Majority vote of the n_neighbors nearest training rows, like
+    KNeighborsClassifier, with the neighbours found by an index built at fit
+    time (see IVFNeighborsClassifier and HNSWNeighborsClassifier). Subclasses
+    implement _build(X) and _query(X, k) -> (squared distances, row indices),
+    where a missing neighbour has index -1.
+    """
+
+    # Index the training rows
+    def fit(self, X, y):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        self.n_features_in_ = X.shape[1]
+        self._build(X)
+        return self
+
+    # Find the nearest training rows of each query
+    def kneighbors(self, X, n_neighbors=None, return_distance=True):
+        """
+        Return the distances and indices of the nearest training rows, closest
+        first, as KNeighborsClassifier.kneighbors does. The neighbours are
+        approximate: the recall depends on the search parameters of the index.
+        """
+        k = self.n_neighbors if n_neighbors is None else n_neighbors
+        distances, indices = self._query(np.ascontiguousarray(X, dtype=np.float32), k)
+        order = np.argsort(distances, axis=1, kind="stable")
+        distances = np.sqrt(np.take_along_axis(distances, order, axis=1))
+        indices = np.take_along_axis(indices, order, axis=1)
+        return (distances, indices) if return_distance else indices
+
+    # Share of the neighbours in each class
+    def predict_proba(self, X):
+        indices = self.kneighbors(X, return_distance=False)
+        found = indices >= 0
+        labels = self._y[np.where(found, indices, 0)]
+        n_classes = len(self.classes_)
+        rows = np.repeat(np.arange(len(indices)), indices.shape[1])
+        counts = np.bincount(rows * n_classes + labels.ravel(), weights=found.ravel(),
+                             minlength=len(indices) * n_classes).reshape(len(indices), n_classes)
+        return counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+
+    # Majority class of the neighbours; ties go to the first class, as in KNeighborsClassifier
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+# Define an inverted-file (IVF) neighbour index in NumPy
+class IVFNeighborsClassifier(IndexedNeighborsClassifier):
+    def __init__(self, n_neighbors=5, n_lists=None, n_probe=8, random_state=101):
+        """
+        Nearest-neighbour classifier over an inverted-file index: k-means
+        splits the training rows into n_lists lists, and a query is compared
+        only with the rows of the n_probe lists whose centroids are closest.
+        n_probe trades recall for speed: n_probe = n_lists is an exact search.
+
+        Parameters:
+        - n_neighbors (int): Number of neighbours voting.
+        - n_lists (int): Number of lists; None uses the square root of the training rows.
+        - n_probe (int): Lists searched per query.
+        - random_state (int): Seed of the k-means.
+        """
+        self.n_neighbors = n_neighbors
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.random_state = random_state
+
+    def _build(self, X):
+        n_lists = min(self.n_lists or max(int(np.sqrt(len(X))), 1), len(X))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, n_init=1, batch_size=4096, random_state=self.random_state).fit(X)
+        # Rows are stored list by list, so each list is one contiguous block
+        order = np.argsort(kmeans.labels_, kind="stable")
+        self.centroids_ = kmeans.cluster_centers_.astype(np.float32)
+        self._rows = order
+        self._points = X[order]
+        self._norms = (self._points * self._points).sum(axis=1)
+        self._offsets = np.searchsorted(kmeans.labels_[order], np.arange(n_lists + 1))
+
+    def _query(self, X, k):
+        n_lists = len(self.centroids_)
+        n_probe = min(self.n_probe, n_lists)
+        probes = np.argpartition(squared_distances(X, self.centroids_), n_probe - 1, axis=1)[:, :n_probe]
+        # Group the queries by probed list
+        flat = probes.ravel()
+        by_list = np.argsort(flat, kind="stable")
+        bounds = np.searchsorted(flat[by_list], np.arange(n_lists + 1))
+
+        best_distances = np.full((len(X), k), np.inf, dtype=np.float32)
+        best_indices = np.full((len(X), k), -1, dtype=np.int64)
+        for lst in range(n_lists):
+            start, end = self._offsets[lst], self._offsets[lst + 1]
+            queries = by_list[bounds[lst]:bounds[lst + 1]] // n_probe
+            if start == end or not len(queries):
+                continue
+            # Merge the rows of this list into the k best candidates of each query
+            distances = np.hstack([best_distances[queries],
+                                   squared_distances(X[queries], self._points[start:end], self._norms[start:end])])
+            indices = np.hstack([best_indices[queries], np.broadcast_to(np.arange(start, end), (len(queries), end - start))])
+            keep = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            best_distances[queries] = np.take_along_axis(distances, keep, axis=1)
+            best_indices[queries] = np.take_along_axis(indices, keep, axis=1)
+        return best_distances, np.where(best_indices >= 0, self._rows[best_indices], -1)
+
+# Define an HNSW neighbour index backed by hnswlib
+class HNSWNeighborsClassifier(IndexedNeighborsClassifier):
+    def __init__(self, n_neighbors=5, ef=50, M=16, ef_construction=200, n_jobs=1, random_state=101):
+        """
+        Nearest-neighbour classifier over a hierarchical navigable small world
+        graph built with the optional hnswlib package. ef, the size of the
+        candidate list of a search, trades recall for speed.
+
+        Parameters:
+        - n_neighbors (int): Number of neighbours voting.
+        - ef (int): Search breadth; raised to n_neighbors if smaller.
+        - M (int): Links per node of the graph.
+        - ef_construction (int): Search breadth while building the graph.
+        - n_jobs (int): Threads building the graph; only 1 gives a reproducible graph.
+        - random_state (int): Seed of the graph construction.
+        """
+        self.n_neighbors = n_neighbors
+        self.ef = ef
+        self.M = M
+        self.ef_construction = ef_construction
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _build(self, X):
+        import hnswlib
+        self._index = hnswlib.Index(space="l2", dim=X.shape[1])
+        self._index.init_index(max_elements=len(X), ef_construction=self.ef_construction, M=self.M,
+                               random_seed=self.random_state)
+        self._index.add_items(X, num_threads=self.n_jobs)
+
+    def _query(self, X, k):
+        n_found = min(k, self._index.get_current_count())
+        self._index.set_ef(max(self.ef, n_found))
+        indices, distances = self._index.knn_query(X, k=n_found)
+        if n_found < k:
+            missing = ((0, 0), (0, k - n_found))
+            indices = np.pad(indices.astype(np.int64), missing, constant_values=-1)
+            distances = np.pad(distances, missing, constant_values=np.inf)
+        return distances.astype(np.float32), indices.astype(np.int64)
+
+# Define a class for on-disk caching of prepared data
+class PreprocessingCache:
+    ARRAYS = ("X_train", "X_test", "y_train", "y_test")
+    VERSION = 3
+
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        """
+        Initialize a content-addressed cache of scaled train/test arrays.
+        Each entry is a directory holding one .npy file per array (.npz for
+        sparse matrices), the fitted preprocessing and a meta.json file whose modification time records the last
+        use, so the least recently used entries are evicted first once the
+        cache grows beyond max_bytes.
+
+        Parameters:
+        - cache_dir (str): Directory holding the cache entries.
+        - max_bytes (int): Size cap of the cache in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Build the cache key of a dataset and its preprocessing parameters
+    def make_key(self, file_path, target_col, **params):
+        """
+        Build a key from the file contents, the target column and the split
+        parameters, so an edited file or a different split never hits a stale entry.
+
+        Returns:
+        - key (str): Hexadecimal cache key.
+        """
+        description = json.dumps({
+            "version": self.VERSION,
+            "file": file_digest(file_path),
+            "target": target_col,
+            "params": params,
+        }, sort_keys=True)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    # Read an entry from the cache
+    def get(self, key):
+        """
+        Load a cache entry. Numeric arrays are memory-mapped rather than read.
+
+        Parameters:
+        - key (str): Cache key built by make_key.
+
+        Returns:
+        - entry (dict): The cached arrays and objects, or None on a miss.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        meta_path = os.path.join(entry_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as file:
+            meta = json.load(file)
+        entry = {"dependent_value": meta["dependent_value"], "features": meta["features"]}
+        for name in self.ARRAYS:
+            path = os.path.join(entry_dir, f"{name}.npy")
+            if meta["sparse_arrays"].get(name):
+                entry[name] = scipy.sparse.load_npz(os.path.join(entry_dir, f"{name}.npz"))
+            elif meta["object_arrays"].get(name):
+                entry[name] = np.load(path, allow_pickle=True)
+            else:
+                entry[name] = np.load(path, mmap_mode="r")
+        entry["scaler"] = joblib.load(os.path.join(entry_dir, "scaler.joblib"))
+        # Mark the entry as recently used
+        os.utime(meta_path)
+        return entry
+
+    # Write an entry to the cache
+    def put(self, key, entry):
+        """
+        Store a cache entry, then evict old entries if the cache is too big.
+        The entry is written to a temporary directory and renamed into place,
+        so concurrent readers never see a partial entry.
+
+        Parameters:
+        - key (str): Cache key built by make_key.
+        - entry (dict): The arrays, the fitted scaler, the dependent value type
+          and the feature names.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        object_arrays = {}
+        sparse_arrays = {}
+        for name in self.ARRAYS:
+            sparse_arrays[name] = scipy.sparse.issparse(entry[name])
+            if sparse_arrays[name]:
+                scipy.sparse.save_npz(os.path.join(tmp_dir, f"{name}.npz"), entry[name], compressed=False)
+                continue
+            array = np.asarray(entry[name])
+            object_arrays[name] = bool(array.dtype.hasobject)
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array, allow_pickle=array.dtype.hasobject)
+        joblib.dump(entry["scaler"], os.path.join(tmp_dir, "scaler.joblib"))
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as file:
+            json.dump({"dependent_value": entry["dependent_value"], "features": entry["features"],
+                       "object_arrays": object_arrays, "sparse_arrays": sparse_arrays}, file)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict(keep=key)
+
+    # Remove least recently used entries until the cache fits its size cap
+    def evict(self, keep=None):
+        """
+        Delete the least recently used entries while the cache is larger than max_bytes.
+
+        Parameters:
+        - keep (str): Key of an entry that is never evicted (the one just written).
+        """
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self.cache_dir, key, "meta.json")
+            if key.startswith(".") or not os.path.exists(meta_path):
+                continue
+            entry_dir = os.path.join(self.cache_dir, key)
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+            entries.append((os.path.getmtime(meta_path), size, key))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            total -= size
+
+# Define a class for recording stage timings
+class Instrumentation:
+    PROFILERS = (None, "cprofile", "pyinstrument")
+
+    def __init__(self, profiler=None):
+        """
+        Initialize the instrumentation of an Evaluator. Every stage and every
+        candidate fit/predict is recorded with its wall time, CPU time and
+        memory delta. An Evaluator without instrumentation skips all of this.
+
+        Parameters:
+        - profiler (str): Also profile the stages with "cprofile" or
+          "pyinstrument" (optional dependency), or None.
+        """
+        if profiler not in self.PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}'. Choose one of {self.PROFILERS}.")
+        self.records = []
+        self.hooks = []
+        self.depth = 0
+        self.profiler = None
+        if profiler == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+        elif profiler == "pyinstrument":
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+
+    # Register a function called with every new record
+    def add_hook(self, hook):
+        """
+        Register a hook, called as hook(record) each time a record is added.
+
+        Parameters:
+        - hook (callable): Receives the record dict.
+        """
+        self.hooks.append(hook)
+
+    # Add a record and notify the hooks
+    def record(self, name, timing, **details):
+        """
+        Add a record for a stage measured elsewhere (e.g. in a worker process).
+
+        Parameters:
+        - name (str): Name of the stage.
+        - timing (dict): Output of elapsed().
+        - details: Extra fields stored in the record.
+
+        Returns:
+        - record (dict): The stored record.
+        """
+        record = {"stage": name, "depth": self.depth, **timing, **details}
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+        return record
+
+    # Measure a block of code
+    @contextlib.contextmanager
+    def stage(self, name, **details):
+        """
+        Context manager measuring the enclosed block as one stage. Nested
+        stages get a greater depth; the profiler runs while the outermost
+        stage is open.
+
+        Parameters:
+        - name (str): Name of the stage.
+        - details: Extra fields stored in the record.
+        """
+        if self.depth == 0 and self.profiler is not None:
+            self._start_profiler()
+        self.depth += 1
+        start = clock()
+        try:
+            yield
+        finally:
+            timing = elapsed(start)
+            self.depth -= 1
+            if self.depth == 0 and self.profiler is not None:
+                self._stop_profiler()
+            self.record(name, timing, **details)
+
+    def _start_profiler(self):
+        if hasattr(self.profiler, "enable"):
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def _stop_profiler(self):
+        if hasattr(self.profiler, "disable"):
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+
+    # Export the records as JSON
+    def to_json(self, file_path=None):
+        """
+        Serialize the records to JSON.
+
+        Parameters:
+        - file_path (str): If given, the JSON is also written to this file.
+
+        Returns:
+        - text (str): The JSON document.
+        """
+        text = json.dumps(self.records, indent=2, default=str)
+        if file_path is not None:
+            with open(file_path, "w") as file:
+                file.write(text)
+        return text
+
+    # Write the profiler output
+    def dump_profile(self, file_path):
+        """
+        Write the profile collected during the stages: cProfile stats (readable
+        with pstats or snakeviz) or a pyinstrument HTML report.
+
+        Parameters:
+        - file_path (str): Output file.
+        """
+        if self.profiler is None:
+            raise ValueError("No profiler was enabled.")
+        if hasattr(self.profiler, "dump_stats"):
+            self.profiler.dump_stats(file_path)
+        else:
+            with open(file_path, "w") as file:
+                file.write(self.profiler.output_html())
+
+# Run a function in a child process and send back its result
+def send_result(sender, function, args):
+    """Target of the child processes of ResourceGovernor.run; exceptions are sent back too."""
+    try:
+        sender.send((True, function(*args)))
+    except BaseException as error:
+        sender.send((False, error))
+    finally:
+        sender.close()
+
+# Define a class for the resource limits of the candidate fits
+class ResourceGovernor:
+    # Effective floating point operations per second assumed by the time estimates
+    FLOPS = 1e9
+
+    def __init__(self, memory_limit=None, time_limit=None, min_rows=1000):
+        """
+        Initialize a governor that plans every candidate fit before it
+        starts. The memory and time of the fit are estimated from the numbers
+        of rows and features; a candidate over a limit is fitted on a
+        stratified subsample of the training rows small enough to fit, or
+        skipped if that would leave fewer than min_rows rows. With a time
+        limit, every fit also runs in a child process that is killed once
+        the limit is reached; a child killed by the system for lack of
+        memory does not take the Evaluator down either.
+
+        Parameters:
+        - memory_limit (int): Bytes a candidate may allocate on top of the loaded data, or None.
+        - time_limit (float): Seconds a candidate may take to fit and predict, or None.
+        - min_rows (int): Smallest subsample worth fitting.
+        """
+        self.memory_limit = memory_limit
+        self.time_limit = time_limit
+        self.min_rows = min_rows
+
+    # Estimate the cost of fitting and scoring a candidate
+    def estimate(self, model, n_rows, n_features, n_test):
+        """
+        Rough cost model of the candidate families, meant to rank sizes
+        against the limits rather than to predict exact numbers.
+
+        Parameters:
+        - model: The unfitted candidate.
+        - n_rows (int): Training rows.
+        - n_features (int): Features after preprocessing.
+        - n_test (int): Rows scored after the fit.
+
+        Returns:
+        - estimate (dict): "memory_bytes" and "seconds".
+        """
+        data = 8 * n_rows * n_features
+        if isinstance(model, Pipeline) and "kernel" in model.named_steps:
+            components = model.named_steps["kernel"].n_components
+            memory = 2 * data + 16 * n_rows * components
+            flops = 20 * (n_rows + n_test) * components * (n_features + 10)
+        elif isinstance(model, (SVR, SVC)):
+            # libsvm caches kernel rows up to cache_size megabytes
+            memory = data + min(8 * n_rows ** 2, model.cache_size * 2 ** 20)
+            flops = (n_rows ** 2 + n_rows * n_test) * n_features * 5
+        elif isinstance(model, (KNeighborsClassifier, IndexedNeighborsClassifier)):
+            # Brute-force queries compare every test row with every training
+            # row, in chunks of at most 1 GiB (sklearn's working_memory)
+            brute = getattr(model, "algorithm", "brute") == "brute" or (
+                model.algorithm == "auto" and n_features > 15)
+            memory = 3 * data + (min(8 * n_rows * n_test, 2 ** 30) if brute else 16 * n_test * model.n_neighbors)
+            flops = 2 * n_rows * n_test * n_features
+        elif isinstance(model, LassoCV):
+            memory = 3 * data
+            flops = 5 * 100 * 10 * n_rows * n_features
+        elif isinstance(model, LogisticRegression):
+            memory = 3 * data
+            flops = 100 * 4 * n_rows * n_features
+        else:
+            memory = 3 * data
+            flops = n_rows * n_features * (n_features + 20)
+        return {"memory_bytes": int(memory), "seconds": flops / self.FLOPS}
+
+    # Choose how many training rows a candidate is fitted on
+    def plan(self, model, n_rows, n_features, n_test):
+        """
+        Parameters:
+        - model: The unfitted candidate.
+        - n_rows (int): Training rows available.
+        - n_features (int): Features after preprocessing.
+        - n_test (int): Rows scored after the fit.
+
+        Returns:
+        - n_fit (int): Rows to fit on: n_rows, fewer for a subsample, or 0 to skip the candidate.
+        - estimate (dict): Estimated cost of fitting n_fit rows (of n_rows when skipped).
+        """
+        def fits(n):
+            estimate = self.estimate(model, n, n_features, n_test)
+            return ((self.memory_limit is None or estimate["memory_bytes"] <= self.memory_limit)
+                    and (self.time_limit is None or estimate["seconds"] <= self.time_limit))
+
+        if fits(n_rows):
+            return n_rows, self.estimate(model, n_rows, n_features, n_test)
+        low = min(self.min_rows, n_rows)
+        if not fits(low):
+            return 0, self.estimate(model, n_rows, n_features, n_test)
+        # The estimates grow with the rows, so bisect the largest size that fits
+        high = n_rows
+        while high - low > 1:
+            middle = (low + high) // 2
+            low, high = (middle, high) if fits(middle) else (low, middle)
+        return low, self.estimate(model, low, n_features, n_test)
+
+    # Run a fit within the time limit
+    def run(self, function, *args):
+        """
+        Call function(*args), in a child process killed after time_limit
+        seconds when a time limit is set. The child is forked where possible,
+        so it inherits the arrays instead of receiving a pickled copy.
+
+        Returns:
+        - result: The return value of the function.
+
+        Raises:
+        - TimeoutError: If the time limit was reached.
+        - MemoryError: If the child process died, e.g. killed for lack of memory.
+        """
+        if self.time_limit is None:
+            return function(*args)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=send_result, args=(sender, function, args), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(self.time_limit):
+                raise TimeoutError(f"Killed after the time limit of {self.time_limit} seconds.")
+            try:
+                succeeded, result = receiver.recv()
+            except EOFError:
+                process.join()
+                raise MemoryError(f"The child process died with exit code {process.exitcode}.")
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            receiver.close()
+        if not succeeded:
+            raise result
+        return result
+
+# Shared no-op stage used when instrumentation is disabled
+NO_STAGE = contextlib.nullcontext()
 
 # Define a class for model evaluation
 class Evaluator:
-    def __init__(self, model_type, file_path):
+    DTYPES = ("float64", "float32")
+
+    KNN_BACKENDS = ("auto", "brute", "kd_tree", "ball_tree", "ivf", "hnsw")
+    KERNEL_METHODS = ("nystroem", "rbf_sampler")
+    KERNEL_SOLVERS = ("linear_svm", "sgd")
+
+    def __init__(self, model_type, file_path, instrumentation=None, dtype="float64", sparse=None,
+                 knn_backend="auto", knn_options=None, kernel_approximation=None, kernel_row_threshold=20000,
+                 kernel_method="nystroem", kernel_components=300, kernel_solver="linear_svm", governor=None):
         """
         Initialize the Evaluator class.
 
         Parameters:
         - model_type (str): Type of the ML model (regressor or classifier).
         - file_path (str): Path to the CSV file containing the dataset.
+        - instrumentation (Instrumentation): Records the timings of every stage, or None.
+        - dtype (str): Compute precision, "float64" or "float32". It applies
+          to the features, from set_target through preprocessing to every
+          candidate model; the target keeps its own dtype.
+        - sparse (bool): Keep one-hot features sparse (True), always densify
+          them (False) or decide from their density (None). Models that do not
+          accept sparse input receive a dense copy.
+        - knn_backend (str): Neighbour search of the KNN candidate: a
+          KNeighborsClassifier algorithm ("auto", "brute", "kd_tree",
+          "ball_tree") or an approximate index ("ivf", "hnsw").
+        - knn_options (dict): Parameters of the backend, e.g. {"leaf_size": 60}
+          for the trees, {"n_probe": 4} for "ivf" or {"ef": 20} for "hnsw".
+        - kernel_approximation (bool): Replace SVR/SVC with an approximate RBF
+          kernel feeding a linear model (True), keep the exact kernels (False),
+          or switch above kernel_row_threshold training rows (None).
+        - kernel_row_threshold (int): Training rows above which the approximation is used.
+        - kernel_method (str): Kernel feature map, "nystroem" or "rbf_sampler"
+          (random Fourier features).
+        - kernel_components (int): Dimension of the approximate kernel features.
+        - kernel_solver (str): Linear model on the kernel features,
+          "linear_svm" (LinearSVR/LinearSVC) or "sgd" (SGD with the SVM losses).
+        - governor (ResourceGovernor): Memory and time limits of the candidate
+          fits in select_best_model, or None for no limits.
         """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}'. Choose one of {self.DTYPES}.")
+        if knn_backend not in self.KNN_BACKENDS:
+            raise ValueError(f"Unknown KNN backend '{knn_backend}'. Choose one of {self.KNN_BACKENDS}.")
+        if kernel_method not in self.KERNEL_METHODS:
+            raise ValueError(f"Unknown kernel method '{kernel_method}'. Choose one of {self.KERNEL_METHODS}.")
+        if kernel_solver not in self.KERNEL_SOLVERS:
+            raise ValueError(f"Unknown kernel solver '{kernel_solver}'. Choose one of {self.KERNEL_SOLVERS}.")
         self.model_type = model_type
         self.file_path = file_path
+        self.dtype = dtype
+        self.sparse = sparse
+        self.knn_backend = knn_backend
+        self.knn_options = knn_options or {}
+        self.kernel_approximation = kernel_approximation
+        self.kernel_row_threshold = kernel_row_threshold
+        self.kernel_method = kernel_method
+        self.kernel_components = kernel_components
+        self.kernel_solver = kernel_solver
+        self.kernel_report = None
         self.df = None
         self.target_col = None
         self.X = None
         self.y = None
+        self.feature_names = None
         self.X_train = None
         self.X_test = None
         self.y_train = None
         self.y_test = None
         self.scaler = None
         self.dependent_value = None
+        self.load_report = None
+        self.race_history = None
+        self.cv_results = None
+        self.results = {}
+        self.refresh_report = None
+        self.governor = governor
+        self.governor_report = None
+        self.instrumentation = instrumentation
 
-    # Load data from a CSV file
-    def load_data(self):
+    # Measure a stage if instrumentation is enabled
+    def stage(self, name, **details):
         """
-        Load the dataset from a CSV file specified by file_path.
+        Return a context manager recording the enclosed block as a stage, or a
+        shared no-op context when instrumentation is disabled.
+
+        Parameters:
+        - name (str): Name of the stage.
+        - details: Extra fields stored in the record.
         """
-        try:
-            self.df = pd.read_csv(self.file_path)
-        except FileNotFoundError:
-            print("File not found. Please provide a valid CSV file.")
-            exit(1)
+        if self.instrumentation is None:
+            return NO_STAGE
+        return self.instrumentation.stage(name, **details)
+
+    # Load data from a CSV, Parquet, Arrow or memmap dataset
+    def load_data(self, chunksize=None, memory_budget=None, columns=None):
+        """
+        Load the dataset specified by file_path. The format follows the
+        extension (see convert_dataset): CSV, Parquet, Feather/Arrow IPC
+        (memory-mapped) or a .npyds memmap dataset, whose columns are used
+        in place without copies.
+
+        Parameters:
+        - chunksize (int): If given, stream the file in chunks of this many rows
+          and store it with compact dtypes (see load_data_in_chunks). CSV only.
+        - memory_budget (int): Maximum bytes held while streaming the file,
+          about twice the loaded DataFrame (see load_data_in_chunks). CSV only.
+        - columns (list): Read only these columns (the features and the
+          target), or None for all of them.
+        """
+        kind = dataset_format(self.file_path)
+        if kind != "csv" and (chunksize is not None or memory_budget is not None):
+            raise ValueError("Chunked loading is only supported for CSV files.")
+        with self.stage("load_data", format=kind):
+            try:
+                if kind == "parquet":
+                    self.df = pd.read_parquet(self.file_path, columns=columns)
+                elif kind == "feather":
+                    from pyarrow import feather
+                    self.df = feather.read_table(self.file_path, columns=columns, memory_map=True).to_pandas()
+                elif kind == "memmap":
+                    self.df = read_memmap_dataset(self.file_path, columns)
+                elif chunksize is None and memory_budget is None:
+                    self.df = pd.read_csv(self.file_path, usecols=columns)
+                else:
+                    self.df = self.load_data_in_chunks(chunksize, memory_budget, columns=columns)
+            except FileNotFoundError:
+                print("File not found. Please provide a valid CSV file.", file=sys.stderr)
+                raise
+
+    # Stream the CSV file in chunks with compact dtypes
+    def load_data_in_chunks(self, chunksize=None, memory_budget=None, sample_rows=10000, columns=None):
+        """
+        Read the CSV file chunk by chunk. Dtypes are inferred from a sample:
+        integers and floats are downcast without losing precision and
+        low-cardinality string columns become categoricals. A summary of the
+        memory used and saved is stored in self.load_report; the savings are
+        estimated from the size per row of the sample read with default
+        dtypes. The final pd.concat holds the chunks and the concatenated
+        DataFrame at the same time, so the peak is about twice the loaded
+        size ("concat_peak_bytes"); memory_budget is checked against it.
+
+        Parameters:
+        - chunksize (int): Rows per chunk. Derived from memory_budget when None.
+        - memory_budget (int): Maximum bytes held while loading, i.e. the
+          chunks plus their concatenation (about twice the loaded DataFrame).
+        - sample_rows (int): Number of rows used to infer the dtypes.
+        - columns (list): Columns to read, or None for every column. The
+          other columns are never parsed and do not count toward the budget.
+
+        Returns:
+        - df (DataFrame): The loaded dataset.
+        """
+        sample = pd.read_csv(self.file_path, nrows=sample_rows, usecols=columns)
+        dtypes = infer_dtypes(sample)
+        default_row_bytes = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+
+        if chunksize is None:
+            chunksize = sample_rows
+            if memory_budget is not None:
+                # Keep a single chunk parsed with default dtypes well under the budget
+                chunksize = max(int(memory_budget / 4 / max(default_row_bytes, 1)), 1)
+
+        categories = [col for col, kind in dtypes.items() if kind == "category"]
+        chunks = []
+        used_bytes = 0
+        reader = pd.read_csv(self.file_path, chunksize=chunksize, usecols=columns,
+                             dtype={col: "category" for col in categories})
+        for chunk in reader:
+            chunk = compact_chunk(chunk, dtypes)
+            used_bytes += chunk.memory_usage(deep=True, index=False).sum()
+            # Concatenating copies the chunks, so they need room twice
+            if memory_budget is not None and 2 * used_bytes > memory_budget:
+                reader.close()
+                raise MemoryError(f"Dataset does not fit in the memory budget of {memory_budget} bytes "
+                                  f"(the chunks and their concatenation need at least {2 * used_bytes} bytes).")
+            chunks.append(chunk)
+
+        # Chunks may have seen different category values, so align them before concatenating
+        for col in categories:
+            all_categories = pd.api.types.union_categoricals([chunk[col] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(all_categories)
+
+        df = pd.concat(chunks, ignore_index=True) if chunks else sample.iloc[:0]
+        compact_bytes = int(df.memory_usage(deep=True, index=False).sum())
+        default_bytes = int(default_row_bytes * len(df))
+        self.load_report = {
+            "rows": len(df),
+            "chunks": len(chunks),
+            "chunksize": chunksize,
+            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+            "compact_bytes": compact_bytes,
+            "default_bytes_estimate": default_bytes,
+            "saved_bytes_estimate": default_bytes - compact_bytes,
+            "concat_peak_bytes": int(used_bytes) + compact_bytes,
+            "peak_rss_bytes": peak_rss(),
+        }
+        print(f"Loaded {len(df)} rows in {len(chunks)} chunks: {compact_bytes} bytes "
+              f"(about {default_bytes - compact_bytes} bytes saved compared with default dtypes).", file=sys.stderr)
+        return df
 
     # Get user input for model selection and target column
     def get_user_input(self):
@@ -55,31 +1288,138 @@ class Evaluator:
         the name of the dependent target column.
         """
         print(f"What ML model would you like to use? (regressor or classifier): ")
-        self.target_col = input("Enter the name of the dependent target: ")
+        self.set_target(input("Enter the name of the dependent target: "))
+
+    # Select the target column without prompting
+    def set_target(self, target_col):
+        """
+        Split the loaded dataset into features and the dependent target.
+
+        Parameters:
+        - target_col (str): Name of the dependent target column.
+        """
+        self.target_col = target_col
         if self.target_col not in self.df.columns:
             error_message = f"'{self.target_col}' is not a valid target column. Please choose a column from the dataset."
-            print(error_message)
+            print(error_message, file=sys.stderr)
             raise ValueError(error_message)  
         self.X = self.df.drop(self.target_col, axis=1)
+        if self.dtype == "float32":
+            # Downcast the float features once, so every later copy is half the
+            # size; the target keeps its precision for the metrics
+            floats = [col for col in self.X.columns if self.X[col].dtype == np.float64]
+            if floats:
+                self.X[floats] = self.X[floats].astype(np.float32)
         self.y = self.df[self.target_col]
+        self.feature_names = list(self.X.columns)
+
+    # Check the dataset before any model is trained
+    def validate_data(self):
+        """
+        Check that the features and the target can be used by the candidate
+        models, so a bad dataset fails before the expensive fits rather than
+        after them.
+
+        Raises:
+        - ValueError: With every problem found.
+        """
+        problems = []
+        if len(self.df) == 0:
+            problems.append("the dataset has no rows")
+        if self.X.shape[1] == 0:
+            problems.append("there are no feature columns")
+        empty = [col for col in self.X.columns if self.X[col].isna().all()]
+        if empty:
+            problems.append(f"feature columns {empty} have no values")
+        if self.y.isna().any():
+            problems.append(f"the target '{self.target_col}' has {int(self.y.isna().sum())} missing values")
+        self.validate_dependent_value()
+        if self.model_type == "regressor" and self.dependent_value == "categorical":
+            problems.append(f"the target '{self.target_col}' is categorical and cannot be predicted by a regressor")
+        if self.model_type == "classifier" and self.y.nunique() < 2:
+            problems.append(f"the target '{self.target_col}' has fewer than two classes")
+        if problems:
+            error_message = "Data is not ready for machine learning: " + "; ".join(problems) + "."
+            print(error_message, file=sys.stderr)
+            raise ValueError(error_message)
 
     # Prepare the data for model training and testing
-    def prepare_data(self):
+    def prepare_data(self, test_size=0.3, random_state=101):
         """
-        Split the dataset into training and testing sets and perform
-        standardization on the features.
+        Validate the dataset, split it into training and testing sets and
+        preprocess the features with a pipeline fitted on the training set:
+        numeric columns are imputed and standardized, categorical columns are
+        one-hot encoded (see build_preprocessor), in the precision and layout
+        chosen with dtype and sparse. The fitted pipeline is stored in
+        self.scaler and saved with the model.
+
+        Parameters:
+        - test_size (float): Fraction of rows used for testing.
+        - random_state (int): Seed of the train/test split.
         """
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(self.X, self.y, test_size=0.3, random_state=101)
-        self.scaler = StandardScaler()
-        self.X_train = self.scaler.fit_transform(self.X_train)
-        self.X_test = self.scaler.transform(self.X_test)
+        with self.stage("prepare_data"):
+            self.validate_data()
+            self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(self.X, self.y, test_size=test_size, random_state=random_state)
+            self.scaler = build_preprocessor(self.X, self.dtype, self.sparse)
+            self.X_train = self.scaler.fit_transform(self.X_train)
+            self.X_test = self.scaler.transform(self.X_test)
+
+    # Load prepared data from the cache, or prepare it and store it there
+    def prepare_data_cached(self, target_col, cache, test_size=0.3, random_state=101, **load_options):
+        """
+        Cached replacement for load_data, set_target, prepare_data and
+        validate_dependent_value. On a cache hit the CSV file is not parsed at
+        all: the scaled arrays are memory-mapped from disk and the fitted
+        scaler is loaded. self.df, self.X and self.y stay None in that case.
+
+        Parameters:
+        - target_col (str): Name of the dependent target column.
+        - cache (PreprocessingCache): The cache to read from and write to.
+        - test_size (float): Fraction of rows used for testing.
+        - random_state (int): Seed of the train/test split.
+        - load_options: Passed to load_data on a cache miss.
+
+        Returns:
+        - hit (bool): True if the prepared data came from the cache.
+        """
+        with self.stage("cache_lookup"):
+            # A projection or a compute mode changes the arrays, so they are part of the key
+            options = {"columns": load_options.get("columns"), "dtype": self.dtype, "sparse": self.sparse}
+            defaults = {"columns": None, "dtype": "float64", "sparse": None}
+            options = {name: value for name, value in options.items() if value != defaults[name]}
+            # The model type decides how the target is read and could stratify the split; prepare_data
+            # does not stratify, which is recorded so a stratified split never reads these arrays
+            key = cache.make_key(self.file_path, target_col, model_type=self.model_type, stratify=False,
+                                 test_size=test_size, random_state=random_state, **options)
+            entry = cache.get(key)
+        if entry is not None:
+            self.target_col = target_col
+            self.X_train, self.X_test = entry["X_train"], entry["X_test"]
+            self.y_train, self.y_test = entry["y_train"], entry["y_test"]
+            self.scaler = entry["scaler"]
+            self.dependent_value = entry["dependent_value"]
+            self.feature_names = entry["features"]
+            return True
+
+        self.load_data(**load_options)
+        self.set_target(target_col)
+        self.prepare_data(test_size, random_state)
+        self.validate_dependent_value()
+        with self.stage("cache_store"):
+            cache.put(key, {
+                "X_train": self.X_train, "X_test": self.X_test,
+                "y_train": self.y_train, "y_test": self.y_test,
+                "scaler": self.scaler, "dependent_value": self.dependent_value,
+                "features": self.feature_names,
+            })
+        return False
 
     # Determine if the dependent variable is categorical or continuous
     def validate_dependent_value(self):
         """
         Determine if the dependent variable is categorical or continuous based on its dtype.
         """
-        if self.y.dtype == "object":
+        if not pd.api.types.is_numeric_dtype(self.y) or isinstance(self.y.dtype, pd.CategoricalDtype):
             self.dependent_value = "categorical"
         else:
             self.dependent_value = "continuous"
@@ -88,36 +1428,117 @@ class Evaluator:
     def evaluate_model(self, model):
         """
         Evaluate a machine learning model using appropriate metrics
-        based on the type of dependent variable.
+        based on the model type. A candidate already fitted
+        by select_best_model or race_best_model is reported from
+        self.results; any other model is fitted and predicted once and
+        added to the store.
 
         Parameters:
         - model: The machine learning model to be evaluated.
         """
-        print(f"{model} Model:")
-        model.fit(self.X_train, self.y_train)
-        y_pred = model.predict(self.X_test)
-        if self.dependent_value == "continuous":
-            mae = mean_absolute_error(self.y_test, y_pred)
-            rmse = np.sqrt(mean_squared_error(self.y_test, y_pred))
-            r2 = r2_score(self.y_test, y_pred)
-            print(f"MAE: {mae}")
-            print(f"RMSE: {rmse}")
-            print(f"R2 Score: {r2}")
-        else:
-            print(f"Classification Report:")
-            print(classification_report(self.y_test, y_pred))
-            print(f"Confusion Matrix:")
-            confusion_matrix_plot = ConfusionMatrixDisplay.from_estimator(model, self.X_test, self.y_test)
+        with self.stage("evaluate_model", model=repr(model)):
+            print(f"{model} Model:")
+            result = self.stored_result(model)
+            if result is None:
+                _, score, timings, y_pred = fit_and_score(model, self.X_train, self.y_train,
+                                                          self.X_test, self.y_test, self.scorer())
+                result = self.store_result(repr(model), model, score, timings, y_pred)
+            y_pred = result["predictions"]
+            # The stored metrics follow the model type
+            if self.model_type == "regressor":
+                print(f"MAE: {result['metrics']['mae']}")
+                print(f"RMSE: {result['metrics']['rmse']}")
+                print(f"R2 Score: {result['metrics']['r2']}")
+            else:
+                print(f"Classification Report:")
+                print(classification_report(self.y_test, y_pred))
+                print(f"Confusion Matrix:")
+                confusion_matrix_plot = ConfusionMatrixDisplay.from_predictions(self.y_test, y_pred)
 
-    # Find the best regressor model
-    def find_best_regressor_model(self):
+    # Score of the candidates: R2 for regressors, accuracy for classifiers
+    def scorer(self):
+        """Return the metric used to compare the candidates, called as scorer(y_true, y_pred)."""
+        return r2_score if self.model_type == "regressor" else accuracy_score
+
+    # Keep the outcome of a fitted candidate
+    def store_result(self, name, model, score, timings, y_pred):
         """
-        Find the best regressor model among a set of regression models
-        based on R-squared score.
+        Add a fitted candidate to self.results, with its test set
+        predictions, timings and metrics, so reporting never refits it.
+
+        Parameters:
+        - name (str): Display name of the candidate.
+        - model: The fitted model.
+        - score (float): Score of the model on the test set.
+        - timings (dict): Fit and predict timings from fit_and_score.
+        - y_pred (ndarray): Predictions on the test set.
 
         Returns:
-        - best_model: The best performing regression model.
-        - best_score: The R-squared score of the best model.
+        - result (dict): The stored entry.
+        """
+        self.results[name] = {
+            "model": model,
+            "score": score,
+            "timings": timings,
+            "predictions": y_pred,
+            "metrics": self.metrics_from_predictions(y_pred),
+        }
+        return self.results[name]
+
+    # Find the stored result of a fitted model
+    def stored_result(self, model):
+        """
+        Return the entry of self.results holding this very model object, or
+        None if it was not fitted by a candidate search.
+        """
+        return next((result for result in self.results.values() if result["model"] is model), None)
+
+    # Compute the metrics of a fitted model without printing them
+    def compute_metrics(self, model):
+        """
+        Score a fitted model on the test set. Stored candidates are read from
+        self.results instead of being predicted again.
+
+        Parameters:
+        - model: A fitted machine learning model.
+
+        Returns:
+        - metrics (dict): MAE, RMSE and R2 for regressors; accuracy, the
+          classification report and the confusion matrix for classifiers.
+        """
+        result = self.stored_result(model)
+        if result is not None:
+            return result["metrics"]
+        return self.metrics_from_predictions(model.predict(adapt_input(model, self.X_test)))
+
+    # Compute the metrics of test set predictions
+    def metrics_from_predictions(self, y_pred):
+        """
+        Parameters:
+        - y_pred (ndarray): Predictions on the test set.
+
+        Returns:
+        - metrics (dict): See compute_metrics.
+        """
+        if self.model_type == "regressor":
+            return {
+                "mae": mean_absolute_error(self.y_test, y_pred),
+                "rmse": float(np.sqrt(mean_squared_error(self.y_test, y_pred))),
+                "r2": r2_score(self.y_test, y_pred),
+            }
+        return {
+            "accuracy": accuracy_score(self.y_test, y_pred),
+            "classification_report": classification_report(self.y_test, y_pred, output_dict=True),
+            "confusion_matrix": confusion_matrix(self.y_test, y_pred).tolist(),
+        }
+
+    # Candidate regression models
+    def get_regressor_models(self):
+        """
+        Build the candidate regression models compared by find_best_regressor_model.
+
+        Returns:
+        - models (dict): Unfitted models keyed by display name.
         """
         models = {
             "Linear Regression": LinearRegression(),
@@ -126,87 +1547,1230 @@ class Evaluator:
             "ElasticNet": ElasticNet(),
             "Support Vector Regression": SVR(),
         }
+        if self.use_kernel_approximation():
+            del models["Support Vector Regression"]
+            models["Support Vector Regression (approximate)"] = self.make_approximate_svm()
+        return models
+
+    # Candidate classification models
+    def get_classifier_models(self):
+        """
+        Build the candidate classification models compared by find_best_classifier_model.
+
+        Returns:
+        - models (dict): Unfitted models keyed by display name.
+        """
+        models = {
+            "Logistic Regression": LogisticRegression(),
+            "KNN": self.make_knn(),
+            "SVC": SVC(),
+        }
+        if self.use_kernel_approximation():
+            del models["SVC"]
+            models["SVC (approximate)"] = self.make_approximate_svm()
+        return models
+
+    # Decide whether the kernel candidates are approximated
+    def use_kernel_approximation(self):
+        """
+        Return True if SVR/SVC are replaced by their approximation: always or
+        never when kernel_approximation is set, otherwise above
+        kernel_row_threshold training rows.
+        """
+        if self.kernel_approximation is not None:
+            return self.kernel_approximation
+        X = self.X_train if self.X_train is not None else self.X
+        return X is not None and X.shape[0] > self.kernel_row_threshold
+
+    # Build the approximate RBF kernel machine replacing SVR/SVC
+    def make_approximate_svm(self):
+        """
+        Build a pipeline mapping the features to an approximate RBF kernel
+        space, followed by a linear model. Its cost grows linearly with the
+        rows, where the exact SVR/SVC grow quadratically or worse. gamma
+        matches the exact models' default gamma="scale".
+
+        Returns:
+        - model (Pipeline): "kernel" and "model" steps.
+        """
+        gamma = None
+        if self.X_train is not None:
+            X = self.X_train
+            variance = X.multiply(X).mean() - X.mean() ** 2 if scipy.sparse.issparse(X) else X.var()
+            gamma = 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+        if self.kernel_method == "nystroem":
+            kernel = Nystroem(gamma=gamma, n_components=self.kernel_components, random_state=101)
+        else:
+            kernel = RBFSampler(gamma=gamma if gamma is not None else "scale", n_components=self.kernel_components,
+                                random_state=101)
+        # Same losses as SVR (epsilon-insensitive, epsilon=0.1) and SVC (hinge)
+        regressor = self.model_type == "regressor"
+        if self.kernel_solver == "linear_svm":
+            model = LinearSVR(epsilon=0.1, max_iter=5000, random_state=101) if regressor else LinearSVC(random_state=101)
+        elif regressor:
+            model = SGDRegressor(loss="epsilon_insensitive", epsilon=0.1, learning_rate="adaptive", random_state=101)
+        else:
+            model = SGDClassifier(loss="hinge", random_state=101)
+        return Pipeline([("kernel", kernel), ("model", model)])
+
+    # Measure the accuracy lost by the kernel approximation
+    def compare_kernel_approximation(self, n_samples=2000, n_test=2000):
+        """
+        Fit the exact SVR/SVC and its approximation on the first n_samples
+        training rows (the split is shuffled) and score both on the first
+        n_test test rows. Without a prepared split (cross-validation), the
+        rows are drawn from the whole dataset and preprocessed here. The
+        result is stored in self.kernel_report.
+
+        Parameters:
+        - n_samples (int): Training rows of the subsample.
+        - n_test (int): Test rows of the subsample.
+
+        Returns:
+        - report (dict): Scores, score loss and fit times of both models.
+        """
+        exact = SVR() if self.model_type == "regressor" else SVC()
+        scorer = self.scorer()
+        if self.X_train is not None:
+            X_train, y_train = self.X_train[:n_samples], np.asarray(self.y_train)[:n_samples]
+            X_test, y_test = self.X_test[:n_test], np.asarray(self.y_test)[:n_test]
+        else:
+            # Cross-validation runs without a prepared split: split and preprocess a subsample
+            n_samples = min(n_samples, self.X.shape[0] // 2)
+            n_test = min(n_test, self.X.shape[0] - n_samples)
+            X_train, X_test, y_train, y_test = train_test_split(
+                self.X, self.y.to_numpy(), train_size=n_samples, test_size=n_test, random_state=101)
+            preprocessor = build_preprocessor(self.X, self.dtype, self.sparse)
+            X_train, X_test = preprocessor.fit_transform(X_train), preprocessor.transform(X_test)
+        with self.stage("kernel_approximation_check", n_samples=X_train.shape[0]):
+            _, exact_score, exact_timings, _ = fit_and_score(exact, X_train, y_train, X_test, y_test, scorer)
+            _, approximate_score, approximate_timings, _ = fit_and_score(
+                self.make_approximate_svm(), X_train, y_train, X_test, y_test, scorer)
+        self.kernel_report = {
+            "method": self.kernel_method,
+            "solver": self.kernel_solver,
+            "n_components": self.kernel_components,
+            "n_samples": X_train.shape[0],
+            "exact_score": exact_score,
+            "approximate_score": approximate_score,
+            "score_loss": exact_score - approximate_score,
+            "exact_fit_seconds": exact_timings["fit"]["wall_time"],
+            "approximate_fit_seconds": approximate_timings["fit"]["wall_time"],
+        }
+        return self.kernel_report
+
+    # Build the KNN candidate with the configured neighbour search
+    def make_knn(self, backend=None, **options):
+        """
+        Build a KNN classifier using the given neighbour search backend.
+
+        Parameters:
+        - backend (str): One of KNN_BACKENDS; None uses self.knn_backend and self.knn_options.
+        - options: Backend parameters.
+
+        Returns:
+        - model: The unfitted KNN classifier.
+        """
+        if backend is None:
+            backend, options = self.knn_backend, {**self.knn_options, **options}
+        if backend == "ivf":
+            return IVFNeighborsClassifier(**options)
+        if backend == "hnsw":
+            return HNSWNeighborsClassifier(**options)
+        return KNeighborsClassifier(algorithm=backend, **options)
+
+    # Compare the neighbour search backends of the KNN candidate
+    def compare_knn_backends(self, backends=None, n_queries=None):
+        """
+        Fit a KNN classifier with each backend on the training set and measure
+        it on the test set: fit time, query throughput, accuracy and recall of
+        the neighbours against an exact brute-force search.
+
+        Parameters:
+        - backends (dict): Backend options keyed by backend name, e.g.
+          {"kd_tree": {}, "ivf": {"n_probe": 4}}. Defaults to every backend
+          with default options (hnsw only if hnswlib is installed).
+        - n_queries (int): Measure on the first n_queries test rows only.
+
+        Returns:
+        - report (list): One dict per backend.
+        """
+        if backends is None:
+            backends = {backend: {} for backend in self.KNN_BACKENDS if backend != "hnsw"}
+            with contextlib.suppress(ImportError):
+                import hnswlib
+                backends["hnsw"] = {}
+        X_train = adapt_input(KNeighborsClassifier(), self.X_train)
+        X_test = adapt_input(KNeighborsClassifier(), self.X_test)[:n_queries]
+        y_test = np.asarray(self.y_test)[:n_queries]
+        exact = KNeighborsClassifier(algorithm="brute").fit(X_train, self.y_train)
+        report = []
+        for backend, options in backends.items():
+            model = self.make_knn(backend, **options)
+            with self.stage(f"knn_backend:{backend}", **options):
+                start = time.perf_counter()
+                model.fit(X_train, self.y_train)
+                fit_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                y_pred = model.predict(X_test)
+                query_seconds = time.perf_counter() - start
+            # A neighbour counts as found if it is no farther than the true k-th
+            # neighbour, so ties between equidistant rows are not misses; the
+            # tolerance absorbs the rounding of float32 indexes
+            k = model.n_neighbors
+            found, _ = model.kneighbors(X_test)
+            expected, _ = exact.kneighbors(X_test, n_neighbors=k)
+            recall = np.mean(found <= expected[:, -1:] * (1 + 1e-4) + 2e-3)
+            report.append({
+                "backend": backend,
+                "options": options,
+                "fit_seconds": fit_seconds,
+                "queries_per_second": len(X_test) / query_seconds if query_seconds > 0 else float("inf"),
+                "accuracy": accuracy_score(y_test, y_pred),
+                "recall": float(recall),
+            })
+        return report
+
+    # Hyperparameter grids explored by the model race
+    def get_param_grids(self):
+        """
+        Build the hyperparameter grids of the candidate models, used by
+        race_best_model. Every grid contains the default values, so the
+        default models always take part in the race.
+
+        Returns:
+        - grids (dict): Parameter grids keyed by candidate display name.
+        """
+        return {
+            "Ridge": {"alpha": [0.1, 1.0, 10.0]},
+            "ElasticNet": {"alpha": [0.1, 1.0], "l1_ratio": [0.2, 0.5, 0.8]},
+            "Support Vector Regression": {"C": [0.1, 1.0, 10.0], "epsilon": [0.1, 0.5]},
+            "Logistic Regression": {"C": [0.1, 1.0, 10.0]},
+            "KNN": {"n_neighbors": [3, 5, 11]},
+            "SVC": {"C": [0.1, 1.0, 10.0]},
+            "Support Vector Regression (approximate)": {"model__C": [0.1, 1.0, 10.0]},
+            "SVC (approximate)": {"model__C": [0.1, 1.0, 10.0]},
+        }
+
+    # Collect the train and test arrays, memory-mapped for worker processes if needed
+    def share_arrays(self, folder=None):
+        """
+        Return the train and test arrays. If a folder is given they are written
+        there once and memory-mapped, so worker processes read the same file
+        instead of receiving a pickled copy per task.
+
+        Parameters:
+        - folder (str): Directory for the memmap files, or None to use the arrays as they are.
+
+        Returns:
+        - arrays (list): X_train, y_train, X_test and y_test.
+        """
+        arrays = [self.X_train, self.y_train, self.X_test, self.y_test]
+        if folder is None:
+            return arrays
+        return [memmap_array(array, folder, name)
+                for array, name in zip(arrays, ["X_train", "y_train", "X_test", "y_test"])]
+
+    # Fit and score a list of candidate models
+    def fit_candidates(self, models, arrays, scorer, n_jobs=1, n_samples=None):
+        """
+        Fit and score candidate models, either one after another or
+        concurrently on a process pool.
+
+        Parameters:
+        - models (dict): Unfitted models keyed by display name.
+        - arrays (list): X_train, y_train, X_test and y_test from share_arrays.
+        - scorer (callable): Metric called as scorer(y_true, y_pred).
+        - n_jobs (int): Number of worker processes. 1 fits the models serially,
+          -1 uses all cores.
+        - n_samples (int): Train on the first n_samples training rows only.
+
+        Returns:
+        - fitted (list): (fitted model, score, timings, predictions) tuples in the order of models.
+        """
+        X_train, y_train, X_test, y_test = arrays
+        if n_samples is not None:
+            X_train, y_train = X_train[:n_samples], y_train[:n_samples]
+        if n_jobs == 1:
+            fitted = [fit_and_score(model, X_train, y_train, X_test, y_test, scorer) for model in models.values()]
+        else:
+            fitted = Parallel(n_jobs=n_jobs, backend="loky")(
+                delayed(fit_and_score)(model, X_train, y_train, X_test, y_test, scorer) for model in models.values()
+            )
+        if self.instrumentation is not None:
+            for name, (model, score, timings, _) in zip(models, fitted):
+                self.instrumentation.record(f"fit:{name}", timings["fit"], n_samples=X_train.shape[0])
+                self.instrumentation.record(f"predict:{name}", timings["predict"], score=score,
+                                            rows_per_second=X_test.shape[0] / max(timings["predict"]["wall_time"], 1e-9))
+        return fitted
 
-        best_score = -float("inf")
-        best_model = None
+    # Fit every candidate model and keep the best one
+    def select_best_model(self, models, scorer, n_jobs=1):
+        """
+        Fit and score every candidate model on the full training set. Every
+        candidate is kept in self.results with its predictions and metrics.
+        With a governor, the candidates are fitted one at a time within its
+        limits instead (see fit_governed).
+
+        Parameters:
+        - models (dict): Unfitted models keyed by display name.
+        - scorer (callable): Metric called as scorer(y_true, y_pred); higher is better.
+        - n_jobs (int): Number of worker processes. 1 fits the models serially,
+          -1 uses all cores.
+
+        Returns:
+        - best_model: The best performing model.
+        - best_score: The score of the best model.
+        """
+        with self.stage("select_best_model", n_jobs=n_jobs):
+            if self.governor is not None:
+                fitted = self.fit_governed(models, scorer)
+                if not fitted:
+                    raise ValueError("No candidate model fits within the resource limits.")
+                models, fitted = list(fitted), list(fitted.values())
+            elif n_jobs == 1:
+                fitted = self.fit_candidates(models, self.share_arrays(), scorer)
+            else:
+                with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as folder:
+                    fitted = self.fit_candidates(models, self.share_arrays(folder), scorer, n_jobs)
+        self.results = {}
+        for name, (model, score, timings, y_pred) in zip(models, fitted):
+            self.store_result(name, model, score, timings, y_pred)
 
+        # Candidates are compared in the same order as the serial path, so ties
+        # are resolved identically
+        return pick_best(fitted)
+
+    # Fit the candidate models within the limits of the governor
+    def fit_governed(self, models, scorer):
+        """
+        Plan every candidate with self.governor before fitting it: fit it on
+        the whole training set, on a stratified subsample that fits the
+        limits, or skip it. Fits that exceed the time limit are killed. The
+        test set is never subsampled, so the scores stay comparable. What
+        happened to each candidate is stored in self.governor_report.
+
+        Parameters:
+        - models (dict): Unfitted models keyed by display name.
+        - scorer (callable): Metric called as scorer(y_true, y_pred).
+
+        Returns:
+        - fitted (dict): (fitted model, score, timings, predictions) tuples
+          keyed by the names of the candidates that were fitted.
+        """
+        X_train, y_train, X_test, y_test = self.share_arrays()
+        y_train = np.asarray(y_train)
+        n_rows, n_features = X_train.shape
+        bins = 10 if self.model_type == "regressor" else None
+        self.governor_report = {}
+        fitted = {}
         for name, model in models.items():
-            model.fit(self.X_train, self.y_train)
-            y_pred = model.predict(self.X_test)
-            score = r2_score(self.y_test, y_pred)
-            if score > best_score:
-                best_score = score
-                best_model = model  
+            n_fit, estimate = self.governor.plan(model, n_rows, n_features, X_test.shape[0])
+            record = {"n_rows": n_fit, "estimated_memory_bytes": estimate["memory_bytes"],
+                      "estimated_seconds": estimate["seconds"]}
+            self.governor_report[name] = record
+            if n_fit == 0:
+                record["action"] = "skipped"
+                continue
+            if n_fit == n_rows:
+                record["action"] = "fitted"
+                X_fit, y_fit = X_train, y_train
+            else:
+                rows = stratified_subsample(y_train, n_fit, bins)
+                record.update(action="subsampled", n_rows=len(rows))
+                X_fit, y_fit = X_train[rows], y_train[rows]
+            try:
+                fitted[name] = self.governor.run(fit_and_score, model, X_fit, y_fit, X_test, y_test, scorer)
+            except TimeoutError as error:
+                record.update(action="timed out", error=str(error))
+                continue
+            except Exception as error:
+                record.update(action="failed", error=f"{type(error).__name__}: {error}")
+                continue
+            timings = fitted[name][2]
+            record["seconds"] = timings["fit"]["wall_time"] + timings["predict"]["wall_time"]
+            if self.instrumentation is not None:
+                self.instrumentation.record(f"fit:{name}", timings["fit"], n_samples=X_fit.shape[0])
+                self.instrumentation.record(f"predict:{name}", timings["predict"], score=fitted[name][1])
+        return fitted
 
-        return best_model, best_score
+    # Race the candidate models with successive halving
+    def race_best_model(self, models, grids, scorer, factor=3, min_samples=100, n_jobs=1):
+        """
+        Successive halving over every candidate model and hyperparameter
+        setting. All settings are first trained on a small subset of the
+        training rows; only the best 1/factor of them go on to the next round,
+        which uses factor times more rows, until the last round trains the
+        remaining settings on the full training set. The train split is
+        already shuffled, so every subset is its first rows. The rounds are
+        stored in self.race_history and the candidates of the last round in
+        self.results.
+
+        Parameters:
+        - models (dict): Unfitted models keyed by display name.
+        - grids (dict): Parameter grids keyed by display name (see get_param_grids).
+        - scorer (callable): Metric called as scorer(y_true, y_pred); higher is better.
+        - factor (int): Fraction of settings dropped and growth of the subset per round.
+        - min_samples (int): Smallest number of training rows used in a round.
+        - n_jobs (int): Number of worker processes used for each round.
+
+        Returns:
+        - best_model: The best performing model, trained on the full training set.
+        - best_score: The score of the best model.
+        """
+        configs = {
+            f"{name} {params}" if params else name: clone(model).set_params(**params)
+            for name, model in models.items()
+            for params in ParameterGrid(grids.get(name, {}))
+        }
+        n_total = self.X_train.shape[0]
+        n_rounds = 1 + int(np.ceil(np.log(len(configs)) / np.log(factor)))
+        self.race_history = []
+
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as folder:
+            arrays = self.share_arrays(folder if n_jobs != 1 else None)
+            for round_index in range(n_rounds):
+                n_samples = max(n_total // factor ** (n_rounds - 1 - round_index), min(min_samples, n_total))
+                with self.stage(f"race_round:{round_index}", n_samples=n_samples, n_configs=len(configs)):
+                    fitted = self.fit_candidates(configs, arrays, scorer, n_jobs, n_samples)
+                self.race_history.append({
+                    "n_samples": n_samples,
+                    "scores": [(name, score) for name, (model, score, *_) in zip(configs, fitted)],
+                })
+                if round_index == n_rounds - 1:
+                    break
+                # Keep the best 1/factor settings; sorted is stable, so ties keep candidate order
+                n_keep = max(int(np.ceil(len(configs) / factor)), 1)
+                ranked = sorted(range(len(fitted)), key=lambda i: -fitted[i][1])[:n_keep]
+                names = list(configs)
+                configs = {names[i]: clone(configs[names[i]]) for i in sorted(ranked)}
+
+        self.results = {}
+        for name, (model, score, timings, y_pred) in zip(configs, fitted):
+            self.store_result(name, model, score, timings, y_pred)
+        return pick_best(fitted)
+
+    # Split the rows into cross-validation folds shared by all candidates
+    def make_folds(self, n_splits=5, n_repeats=1, random_state=101):
+        """
+        Compute the (train, test) row positions of a repeated k-fold split
+        once, so every candidate is scored on exactly the same folds. Folds
+        are stratified for classifiers.
+
+        Parameters:
+        - n_splits (int): Number of folds.
+        - n_repeats (int): Number of times the k-fold split is repeated with a new shuffle.
+        - random_state (int): Seed of the shuffles.
+
+        Returns:
+        - folds (list): (train_index, test_index) pairs.
+        """
+        if self.model_type == "classifier":
+            splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+        else:
+            splitter = RepeatedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+        return list(splitter.split(self.X, self.y))
+
+    # Select the best model by its mean cross-validated score
+    def cross_validate_best_model(self, models, scorer, n_splits=5, n_repeats=1, n_jobs=1):
+        """
+        Score every candidate on the same k-fold (or repeated k-fold) split
+        and refit the candidate with the best mean score on all rows. Each
+        fold fits its own preprocessing on its training rows, so no
+        statistics of the test rows leak into the fit. All (model, fold) jobs run in one
+        parallel batch. The scores are stored in self.cv_results, and
+        self.scaler is replaced by the preprocessing fitted on all rows; a
+        split made by prepare_data is transformed again with it, so
+        evaluate_model and save_best_model see one feature space.
+
+        Parameters:
+        - models (dict): Unfitted models keyed by display name.
+        - scorer (callable): Metric called as scorer(y_true, y_pred); higher is better.
+        - n_splits (int): Number of folds.
+        - n_repeats (int): Number of times the k-fold split is repeated.
+        - n_jobs (int): Number of worker processes. 1 runs the jobs serially,
+          -1 uses all cores.
+
+        Returns:
+        - best_model: The best model, refit on all rows.
+        - best_score: The mean cross-validated score of the best model.
+        """
+        if self.X is None:
+            raise ValueError("Cross-validation needs the loaded dataset; call load_data first.")
+        self.validate_data()
+        preprocessor = build_preprocessor(self.X, self.dtype, self.sparse)
+        folds = self.make_folds(n_splits, n_repeats)
+        jobs = [(name, fold) for name in models for fold in range(len(folds))]
+
+        with self.stage("cross_validate", n_folds=len(folds), n_jobs=n_jobs):
+            with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as folder:
+                # Numeric features are shared as one array; mixed columns stay a DataFrame
+                categorical = any(name == "categorical" and columns for name, _, columns in preprocessor.transformers)
+                X, y = (self.X if categorical else self.X.to_numpy(self.dtype)), self.y.to_numpy()
+                if n_jobs == 1:
+                    results = [fit_and_score_fold(models[name], preprocessor, X, y, *folds[fold], scorer)
+                               for name, fold in jobs]
+                else:
+                    if not categorical:
+                        X = memmap_array(X, folder, "X")
+                    y = memmap_array(y, folder, "y")
+                    results = Parallel(n_jobs=n_jobs, backend="loky")(
+                        delayed(fit_and_score_fold)(models[name], preprocessor, X, y, *folds[fold], scorer)
+                        for name, fold in jobs
+                    )
+
+        if self.instrumentation is not None:
+            for (name, fold), (score, timings) in zip(jobs, results):
+                self.instrumentation.record(f"fit:{name}", timings["fit"], fold=fold, n_samples=len(folds[fold][0]))
+                self.instrumentation.record(f"predict:{name}", timings["predict"], fold=fold, score=score)
+
+        self.cv_results = {}
+        # The refitted winner has no test set predictions to store
+        self.results = {}
+        for name in models:
+            scores = [score for (job_name, fold), (score, timings) in zip(jobs, results) if job_name == name]
+            self.cv_results[name] = {"scores": scores, "mean_score": float(np.mean(scores)),
+                                     "std_score": float(np.std(scores))}
+
+        # The first candidate wins ties, as in select_best_model
+        best_name, best = max(self.cv_results.items(), key=lambda item: item[1]["mean_score"])
+        with self.stage("refit", model=best_name):
+            self.scaler = clone(preprocessor)
+            best_model = clone(models[best_name])
+            best_model.fit(adapt_input(best_model, self.scaler.fit_transform(self.X)), self.y)
+            if isinstance(self.y_train, pd.Series):
+                # Keep a prepared train/test split in the feature space of the new preprocessing
+                self.X_train = self.scaler.transform(self.X.loc[self.y_train.index])
+                self.X_test = self.scaler.transform(self.X.loc[self.y_test.index])
+        return best_model, best["mean_score"]
+
+    # Find the best regressor model
+    def find_best_regressor_model(self, n_jobs=1, race=False, cv=None, cv_repeats=1):
+        """
+        Find the best regressor model among a set of regression models
+        based on R-squared score.
+
+        Parameters:
+        - n_jobs (int): Number of worker processes used to fit the candidates.
+        - race (bool): Race the candidates and their hyperparameter grids with
+          successive halving instead of fully fitting each default model.
+        - cv (int): Select by the mean score over this many cross-validation
+          folds instead of the single train/test split.
+        - cv_repeats (int): Number of times the cross-validation is repeated.
+
+        Above kernel_row_threshold training rows the kernel candidate is
+        approximated, and its score loss on a subsample is stored in
+        self.kernel_report.
+
+        Returns:
+        - best_model: The best performing regression model.
+        - best_score: The R-squared score of the best model.
+        """
+        if self.use_kernel_approximation() and self.kernel_approximation is None:
+            # The switch was automatic: report what it costs in accuracy
+            self.compare_kernel_approximation()
+        if cv is not None:
+            return self.cross_validate_best_model(self.get_regressor_models(), r2_score, cv, cv_repeats, n_jobs)
+        if race:
+            return self.race_best_model(self.get_regressor_models(), self.get_param_grids(), r2_score, n_jobs=n_jobs)
+        return self.select_best_model(self.get_regressor_models(), r2_score, n_jobs)
     
     # Find the best classifier model
-    def find_best_classifier_model(self):
+    def find_best_classifier_model(self, n_jobs=1, race=False, cv=None, cv_repeats=1):
         """
         Find the best classifier model among a set of classification models
         based on accuracy score.
 
+        Parameters:
+        - n_jobs (int): Number of worker processes used to fit the candidates.
+        - race (bool): Race the candidates and their hyperparameter grids with
+          successive halving instead of fully fitting each default model.
+        - cv (int): Select by the mean score over this many cross-validation
+          folds instead of the single train/test split.
+        - cv_repeats (int): Number of times the cross-validation is repeated.
+
+        Above kernel_row_threshold training rows the kernel candidate is
+        approximated, and its score loss on a subsample is stored in
+        self.kernel_report.
+
         Returns:
         - best_model: The best performing classification model.
         - best_score: The accuracy score of the best model.
         """
-        models = {
-            "Logistic Regression": LogisticRegression(),
-            "KNN": KNeighborsClassifier(),
-            "SVC": SVC(),
+        if self.use_kernel_approximation() and self.kernel_approximation is None:
+            # The switch was automatic: report what it costs in accuracy
+            self.compare_kernel_approximation()
+        if cv is not None:
+            return self.cross_validate_best_model(self.get_classifier_models(), accuracy_score, cv, cv_repeats, n_jobs)
+        if race:
+            return self.race_best_model(self.get_classifier_models(), self.get_param_grids(), accuracy_score, n_jobs=n_jobs)
+        return self.select_best_model(self.get_classifier_models(), accuracy_score, n_jobs)
+
+    # Candidate models that can be trained batch by batch
+    def get_incremental_models(self):
+        """
+        Build the candidate models supporting partial_fit, used by fit_incremental.
+        The passive-aggressive variants are SGD models with the "pa1" learning rate,
+        which replaces sklearn's deprecated PassiveAggressive estimators.
+
+        Returns:
+        - models (dict): Unfitted models keyed by display name.
+        """
+        if self.model_type == "regressor":
+            return {
+                "SGD Regression": SGDRegressor(random_state=101),
+                "Passive Aggressive": SGDRegressor(loss="epsilon_insensitive", penalty=None,
+                                                   learning_rate="pa1", eta0=1.0, random_state=101),
+                "MLP Regression": MLPRegressor(random_state=101),
+            }
+        return {
+            "SGD Classifier": SGDClassifier(random_state=101),
+            "Passive Aggressive": SGDClassifier(loss="hinge", penalty=None,
+                                                learning_rate="pa1", eta0=1.0, random_state=101),
+            "Naive Bayes": GaussianNB(),
+            "MLP Classifier": MLPClassifier(random_state=101),
         }
 
-        best_score = -float("inf")
-        best_model = None
+    # Train the incremental models on a dataset streamed in mini-batches
+    def fit_incremental(self, target_col=None, batch_size=10000, test_size=0.3, n_epochs=1):
+        """
+        Out-of-core alternative to prepare_data and find_best_*_model for
+        datasets that do not fit in memory. The file is read in mini-batches
+        several times: once to fit the scaler with partial_fit, n_epochs times
+        to train the models with partial_fit, and once to score them on a
+        hash-based holdout set.
 
-        for name, model in models.items():
-            model.fit(self.X_train, self.y_train)
-            y_pred = model.predict(self.X_test)
-            score = accuracy_score(self.y_test, y_pred)
-            if score > best_score:
-                best_score = score
-                best_model = model  
+        Parameters:
+        - target_col (str): Name of the dependent target. Defaults to self.target_col.
+        - batch_size (int): Rows per mini-batch.
+        - test_size (float): Fraction of rows held out for scoring.
+        - n_epochs (int): Number of training passes over the file.
+
+        Returns:
+        - best_model: The best performing model.
+        - best_score: The R-squared or accuracy score of the best model.
+        """
+        self.target_col = target_col or self.target_col
+        columns = pd.read_csv(self.file_path, nrows=0).columns
+        if self.target_col not in columns:
+            raise ValueError(f"'{self.target_col}' is not a valid target column. Please choose a column from the dataset.")
+        is_regressor = self.model_type == "regressor"
+        self.feature_names = [col for col in columns if col != self.target_col]
+
+        def batches():
+            for chunk in pd.read_csv(self.file_path, chunksize=batch_size):
+                holdout = hash_holdout(chunk, test_size)
+                X = chunk.drop(self.target_col, axis=1).to_numpy(self.dtype)
+                y = chunk[self.target_col].to_numpy()
+                yield X[~holdout], y[~holdout], X[holdout], y[holdout]
+
+        # First pass: feature statistics and the set of classes
+        with self.stage("incremental_scaler"):
+            self.scaler = StandardScaler()
+            classes = set()
+            n_train = n_test = 0
+            for X_train, y_train, X_test, y_test in batches():
+                n_train += len(X_train)
+                n_test += len(X_test)
+                if len(X_train):
+                    self.scaler.partial_fit(X_train)
+                if not is_regressor:
+                    classes.update(y_train)
+                    classes.update(y_test)
+        if not n_train or not n_test:
+            raise ValueError(f"The hash split of {n_train + n_test} rows with test_size={test_size} left "
+                             f"{n_train} training and {n_test} holdout rows; both need at least one row.")
+        classes = np.array(sorted(classes))
+
+        # Training passes
+        models = self.get_incremental_models()
+        for epoch in range(n_epochs):
+            with self.stage(f"incremental_epoch:{epoch}"):
+                for X_train, y_train, X_test, y_test in batches():
+                    if not len(X_train):
+                        continue
+                    X_train = self.scaler.transform(X_train)
+                    for model in models.values():
+                        if is_regressor:
+                            model.partial_fit(X_train, y_train)
+                        else:
+                            model.partial_fit(X_train, y_train, classes=classes)
+
+        # Scoring pass on the holdout rows
+        with self.stage("incremental_score"):
+            y_true = []
+            y_preds = {name: [] for name in models}
+            for X_train, y_train, X_test, y_test in batches():
+                if not len(X_test):
+                    continue
+                X_test = self.scaler.transform(X_test)
+                y_true.append(y_test)
+                for name, model in models.items():
+                    y_preds[name].append(model.predict(X_test))
+            y_true = np.concatenate(y_true)
+
+        scorer = r2_score if is_regressor else accuracy_score
+        self.dependent_value = "continuous" if is_regressor else "categorical"
+        return pick_best(
+            (model, scorer(y_true, np.concatenate(y_preds[name])))
+            for name, model in models.items()
+        )
+
+    # Read the rows appended to the dataset since a refresh state was saved
+    def read_appended(self, state):
+        """
+        Read the complete rows after the offset recorded in a refresh state,
+        provided the file still starts with the bytes read before (same
+        SHA-256 checksum); otherwise read every row. Only lines ending with a
+        newline are read, as a last line may still be being written.
+
+        Parameters:
+        - state (dict): The refresh state of the previous run, or None.
+
+        Returns:
+        - rows (DataFrame): The appended rows, or every row.
+        - position (dict): "offset", "rows" and "digest" of the file up to the last row read.
+        - appended (bool): True if only the appended rows were read.
+        """
+        digest = hashlib.sha256()
+        with open(self.file_path, "rb") as file:
+            appended = state is not None and os.fstat(file.fileno()).st_size >= state["offset"]
+            if appended:
+                # Checksum the prefix seen by the previous run, then go on hashing the new rows
+                remaining = state["offset"]
+                while remaining:
+                    block = file.read(min(remaining, 1 << 20))
+                    if not block:
+                        break
+                    digest.update(block)
+                    remaining -= len(block)
+                appended = digest.hexdigest() == state["digest"]
+            if not appended:
+                file.seek(0)
+                digest = hashlib.sha256()
+            data = file.read()
+        data = data[:data.rfind(b"\n") + 1]
+        digest.update(data)
+
+        if not appended:
+            rows = pd.read_csv(io.BytesIO(data))
+        elif data:
+            rows = pd.read_csv(io.BytesIO(data), header=None, names=state["columns"])
+        else:
+            rows = pd.DataFrame({col: [] for col in state["columns"]})
+        position = {
+            "offset": (state["offset"] if appended else 0) + len(data),
+            "rows": (state["rows"] if appended else 0) + len(rows),
+            "digest": digest.hexdigest(),
+        }
+        return rows, position, appended
 
+    # Re-evaluate the candidates on the rows appended since the last refresh
+    def refresh(self, state_path, target_col=None, batch_size=10000, test_size=0.3, drift_threshold=0.25):
+        """
+        Incremental re-evaluation of a CSV file that grows by appended rows.
+        The state saved to state_path (with joblib) by the previous run
+        records how far the file was read (byte offset, row count and a
+        checksum of those bytes), the scaler, the models and the holdout set.
+        Only the appended rows are read:
+        - the scaler statistics and the partial_fit models
+          (get_incremental_models) are updated with the new training rows;
+        - the new holdout rows (see hash_holdout) are added to the holdout
+          set, on which every model is scored again;
+        - the other candidates (get_*_models) are refitted on all training
+          rows only when the drift since their last fit exceeds
+          drift_threshold. The drift is the largest shift of a feature mean,
+          in standard deviations of the feature at that fit. Candidates with
+          a warm_start parameter start from their previous solution.
+        The first run, a different target, an edited file or a new class
+        rebuild the state from the whole file. As in fit_incremental, the
+        features must be numeric. The run is described in self.refresh_report.
+
+        Parameters:
+        - state_path (str): File of the refresh state; created if missing.
+        - target_col (str): Name of the dependent target. Defaults to self.target_col.
+        - batch_size (int): Rows per partial_fit call.
+        - test_size (float): Fraction of rows held out for scoring.
+        - drift_threshold (float): Drift above which the other candidates are refitted.
+
+        Returns:
+        - best_model: The best performing model.
+        - best_score: The R-squared or accuracy score of the best model on the holdout set.
+        """
+        self.target_col = target_col or self.target_col
+        is_regressor = self.model_type == "regressor"
+        state = joblib.load(state_path) if os.path.exists(state_path) else None
+        if state is not None and (state["target"], state["model_type"]) != (self.target_col, self.model_type):
+            state = None
+
+        with self.stage("refresh_read"):
+            rows, position, appended = self.read_appended(state)
+            if appended and not is_regressor and not set(rows[self.target_col]) <= set(state["classes"]):
+                # The partial_fit models cannot learn a class they were created without
+                rows, position, appended = self.read_appended(None)
+        if self.target_col not in rows.columns:
+            raise ValueError(f"'{self.target_col}' is not a valid target column. Please choose a column from the dataset.")
+        if not appended:
+            features = [col for col in rows.columns if col != self.target_col]
+            state = {
+                "target": self.target_col,
+                "model_type": self.model_type,
+                "columns": list(rows.columns),
+                "features": features,
+                "classes": None if is_regressor else np.array(sorted(set(rows[self.target_col]))),
+                "scaler": StandardScaler(),
+                "models": self.get_incremental_models(),
+                # Candidates refitted on drift, with the scaler they were fitted with
+                "candidates": {},
+                "candidate_scaler": None,
+                "since_fit": StandardScaler(),
+                "X_holdout": np.zeros((0, len(features)), dtype=self.dtype),
+                "y_holdout": rows[self.target_col].to_numpy()[:0],
+            }
+        self.feature_names = state["features"]
+
+        # Update the scaler, the partial_fit models and the holdout set
+        holdout = hash_holdout(rows, test_size)
+        X = rows[self.feature_names].to_numpy(self.dtype)
+        y = rows[self.target_col].to_numpy()
+        X_train, y_train = X[~holdout], y[~holdout]
+        with self.stage("refresh_update", new_rows=len(rows)):
+            if len(X_train):
+                state["scaler"].partial_fit(X_train)
+                state["since_fit"].partial_fit(X_train)
+                for start in range(0, len(X_train), batch_size):
+                    X_batch = state["scaler"].transform(X_train[start:start + batch_size])
+                    y_batch = y_train[start:start + batch_size]
+                    for model in state["models"].values():
+                        if is_regressor:
+                            model.partial_fit(X_batch, y_batch)
+                        else:
+                            model.partial_fit(X_batch, y_batch, classes=state["classes"])
+            state["X_holdout"] = np.concatenate([state["X_holdout"], X[holdout]])
+            state["y_holdout"] = np.concatenate([state["y_holdout"], y[holdout]])
+        self.y_test = state["y_holdout"]
+
+        # Refit the other candidates if the new rows drifted since their last fit
+        reference = state["candidate_scaler"]
+        if reference is None:
+            drift = float("inf")
+        elif len(X_train):
+            drift = float(np.max(np.abs(state["since_fit"].mean_ - reference.mean_) / reference.scale_))
+        else:
+            drift = 0.0
+        retrained = drift > drift_threshold
+        fitted = []
+        if retrained:
+            with self.stage("refresh_retrain", rows=position["rows"]):
+                data = pd.read_csv(self.file_path, nrows=position["rows"])
+                train = ~hash_holdout(data, test_size)
+                scaler = copy.deepcopy(state["scaler"])
+                self.X_train = scaler.transform(data.loc[train, self.feature_names].to_numpy(self.dtype))
+                self.y_train = data.loc[train, self.target_col].to_numpy()
+                self.X_test = scaler.transform(state["X_holdout"])
+                models = self.get_regressor_models() if is_regressor else self.get_classifier_models()
+                for name, model in models.items():
+                    previous = state["candidates"].get(name)
+                    if previous is not None and "warm_start" in model.get_params():
+                        models[name] = previous.set_params(warm_start=True)
+                fitted = self.fit_candidates(models, [self.X_train, self.y_train, self.X_test, self.y_test],
+                                             self.scorer())
+            state["candidates"] = dict(zip(models, (model for model, *_ in fitted)))
+            state["candidate_scaler"] = scaler
+            state["since_fit"] = StandardScaler()
+
+        # Score every model on the whole holdout set
+        scorer = self.scorer()
+        self.results = {}
+        with self.stage("refresh_score", holdout_rows=len(self.y_test)):
+            self.X_test = state["scaler"].transform(state["X_holdout"])
+            for name, model in state["models"].items():
+                start = clock()
+                y_pred = model.predict(self.X_test)
+                self.store_result(name, model, scorer(self.y_test, y_pred), {"predict": elapsed(start)}, y_pred)
+            if retrained:
+                for name, (model, score, timings, y_pred) in zip(state["candidates"], fitted):
+                    self.store_result(name, model, score, timings, y_pred)
+            else:
+                X_test = state["candidate_scaler"].transform(state["X_holdout"])
+                for name, model in state["candidates"].items():
+                    start = clock()
+                    y_pred = model.predict(adapt_input(model, X_test))
+                    self.store_result(name, model, scorer(self.y_test, y_pred), {"predict": elapsed(start)}, y_pred)
+
+        state.update(position)
+        joblib.dump(state, state_path)
+        best_model, best_score = pick_best((result["model"], result["score"]) for result in self.results.values())
+        # The saved artifact must carry the scaler the best model was fitted with
+        self.scaler = state["candidate_scaler"] if best_model in state["candidates"].values() else state["scaler"]
+        self.dependent_value = "continuous" if is_regressor else "categorical"
+        self.refresh_report = {
+            "mode": "append" if appended else "rebuild",
+            "new_rows": len(rows),
+            "rows": position["rows"],
+            "offset": position["offset"],
+            "drift": drift,
+            "retrained": retrained,
+            "leaderboard": sorted(((name, result["score"]) for name, result in self.results.items()),
+                                  key=lambda item: -item[1]),
+        }
         return best_model, best_score
 
+    # Bundle the best model with everything needed to score raw rows
+    def build_artifact(self, best_model):
+        """
+        Bundle the fitted model with the fitted preprocessing (stored under
+        "scaler": the pipeline of build_preprocessor, or the StandardScaler of
+        fit_incremental) and the feature schema, so the saved file can be
+        applied to raw rows (see ML_Server.py).
+
+        Parameters:
+        - best_model: The best performing machine learning model.
+
+        Returns:
+        - artifact (dict): The model, scaler, feature names, target and model type.
+        """
+        return {
+            "format": "ml_app_model",
+            "version": ARTIFACT_VERSION,
+            "model": best_model,
+            "scaler": self.scaler,
+            "features": self.feature_names,
+            "schema": {name: str(dtype) for name, dtype in self.X.dtypes.items()} if self.X is not None else None,
+            "target": self.target_col,
+            "model_type": self.model_type,
+        }
+
     # Save the best model to a file
-    def save_best_model(self, best_model):
+    def save_best_model(self, best_model, file_name=None):
         """
-        Save the best model to a file using joblib.
+        Save the best model, bundled with its scaler and feature schema, to a
+        file using joblib. The file is not compressed, so its arrays can be
+        memory-mapped when it is loaded for scoring. A file name ending with
+        .npz saves the exported coefficients of a linear model instead (see
+        export_linear), which ML_Scoring applies with NumPy alone.
 
         Parameters:
         - best_model: The best performing machine learning model.
+        - file_name (str): Save to this file without prompting. When None, the
+          user is asked whether and where to save the model.
         """
-        save_model = input("Do you want to save the best model? (y/n) ")
-        if save_model.lower() == 'y':
+        if file_name is None:
+            save_model = input("Do you want to save the best model? (y/n) ")
+            if save_model.lower() != 'y':
+                print("Model not saved.")
+                return
             file_name = input("Enter the file name: ")
-            joblib.dump(best_model, file_name)
+            self.write_artifact(best_model, file_name)
             print("Model saved successfully!")
         else:
-            print("Model not saved.")
+            self.write_artifact(best_model, file_name)
 
-# Main script execution
-if __name__ == "__main__":
+    # Write the artifact in the format given by the file name
+    def write_artifact(self, best_model, file_name):
+        """
+        Parameters:
+        - best_model: The best performing machine learning model.
+        - file_name (str): A .npz file for an exported linear model, any other name for joblib.
+        """
+        artifact = self.build_artifact(best_model)
+        if file_name.endswith(".npz"):
+            save_linear(file_name, *export_linear(artifact))
+        else:
+            joblib.dump(artifact, file_name)
+
+# Evaluate a dataset without any prompt
+def evaluate(file_path, target_col, model_type, output_path=None, n_jobs=1, race=False,
+             chunksize=None, memory_budget=None, incremental=False, cache_dir=None,
+             cache_size=1 << 30, instrument=False, cv=None, cv_repeats=1, features=None,
+             dtype="float64", sparse=None, knn_backend="auto", knn_options=None,
+             kernel_approximation=None, kernel_row_threshold=20000, refresh_state=None, drift_threshold=0.25,
+             memory_limit=None, time_limit=None):
+    """
+    Run the whole evaluation of one dataset non-interactively.
+
+    Parameters:
+    - file_path (str): Path to the CSV file containing the dataset.
+    - target_col (str): Name of the dependent target column.
+    - model_type (str): "regressor" or "classifier".
+    - output_path (str): Save the best model to this file, or None.
+    - n_jobs (int): Number of worker processes used to fit the candidates.
+    - race (bool): Race the candidates with successive halving.
+    - chunksize (int): Stream the CSV file in chunks of this many rows.
+    - memory_budget (int): Maximum bytes held while streaming the CSV file,
+      about twice the loaded DataFrame.
+    - incremental (bool): Train the partial_fit models out of core instead.
+    - cache_dir (str): Directory of a PreprocessingCache, or None.
+    - cache_size (int): Size cap of the cache in bytes.
+    - instrument (bool): Include the stage timings in the result.
+    - cv (int): Select the best model by k-fold cross-validation with this
+      many folds and refit it on all rows. The cache is not used, as the
+      folds need the whole unscaled dataset.
+    - cv_repeats (int): Number of times the cross-validation is repeated.
+    - features (list): Feature columns to use; only they and target_col are
+      read from the file. None uses every column.
+    - dtype (str): Compute precision, "float64" or "float32".
+    - sparse (bool): Layout of the one-hot features (see Evaluator).
+    - knn_backend (str): Neighbour search of the KNN candidate (see Evaluator).
+    - knn_options (dict): Parameters of the KNN backend.
+    - kernel_approximation (bool): Approximate SVR/SVC always (True), never
+      (False) or above kernel_row_threshold training rows (None).
+    - kernel_row_threshold (int): Training rows above which SVR/SVC are approximated.
+    - refresh_state (str): Re-evaluate incrementally with the refresh state
+      kept in this file, reading only the rows appended since the last run
+      (see Evaluator.refresh).
+    - drift_threshold (float): Drift above which a refresh refits the
+      candidates without partial_fit.
+    - memory_limit (int): Bytes a candidate fit may allocate; larger fits are
+      subsampled or skipped (see ResourceGovernor).
+    - time_limit (float): Seconds a candidate fit may take before it is
+      subsampled beforehand or killed. The limits apply to the plain sweep
+      only; combined with race, cv, incremental or refresh_state they raise
+      a ValueError.
+
+    Returns:
+    - result (dict): The best model, its score and metrics, and the run details.
+    """
+    if model_type not in ("regressor", "classifier"):
+        raise ValueError(f"'{model_type}' is not a valid model type. Choose regressor or classifier.")
+    if memory_limit is not None or time_limit is not None:
+        # Only the plain sweep (select_best_model) fits its candidates through the governor
+        unsupported = [name for name, value in [("race", race), ("cv", cv is not None), ("incremental", incremental),
+                                                ("refresh_state", refresh_state is not None)] if value]
+        if unsupported:
+            raise ValueError(f"memory_limit and time_limit cannot be combined with {', '.join(unsupported)}.")
+    start = time.perf_counter()
+    evaluator = Evaluator(model_type, file_path, instrumentation=Instrumentation() if instrument else None,
+                          dtype=dtype, sparse=sparse, knn_backend=knn_backend, knn_options=knn_options,
+                          kernel_approximation=kernel_approximation, kernel_row_threshold=kernel_row_threshold,
+                          governor=ResourceGovernor(memory_limit, time_limit)
+                          if memory_limit is not None or time_limit is not None else None)
+    metrics = None
+
+    if incremental:
+        best_model, best_score = evaluator.fit_incremental(target_col, batch_size=chunksize or 10000)
+    elif refresh_state is not None:
+        best_model, best_score = evaluator.refresh(refresh_state, target_col, batch_size=chunksize or 10000,
+                                                   drift_threshold=drift_threshold)
+        metrics = evaluator.compute_metrics(best_model)
+    else:
+        columns = None if features is None else [*features, target_col]
+        load_options = {"chunksize": chunksize, "memory_budget": memory_budget, "columns": columns}
+        if cache_dir is not None and cv is None:
+            evaluator.prepare_data_cached(target_col, PreprocessingCache(cache_dir, cache_size), **load_options)
+        else:
+            evaluator.load_data(**load_options)
+            evaluator.set_target(target_col)
+            evaluator.prepare_data()
+            evaluator.validate_dependent_value()
+        if evaluator.dependent_value == "categorical" and model_type == "regressor":
+            raise ValueError(f"'{target_col}' is categorical and cannot be predicted by a regressor.")
+
+        if model_type == "regressor":
+            best_model, best_score = evaluator.find_best_regressor_model(n_jobs, race, cv, cv_repeats)
+        else:
+            best_model, best_score = evaluator.find_best_classifier_model(n_jobs, race, cv, cv_repeats)
+        # After a cross-validated selection the model has seen the test rows,
+        # so the per-fold scores are reported instead of test set metrics
+        metrics = evaluator.cv_results if cv is not None else evaluator.compute_metrics(best_model)
+
+    if output_path is not None:
+        evaluator.save_best_model(best_model, output_path)
+
+    result = {
+        "file_path": file_path,
+        "target_col": target_col,
+        "model_type": model_type,
+        "best_model": best_model.__class__.__name__,
+        "best_params": best_model.get_params(),
+        "best_score": best_score,
+        "metrics": metrics,
+        "output_path": output_path,
+        "kernel_approximation": evaluator.kernel_report,
+        "refresh": evaluator.refresh_report,
+        "governor": evaluator.governor_report,
+        "seconds": time.perf_counter() - start,
+    }
+    if instrument:
+        result["stages"] = evaluator.instrumentation.records
+    return result
+
+# Evaluate one manifest entry, reporting errors instead of raising them
+def evaluate_job(job):
+    """
+    Run evaluate for one job of a manifest.
+
+    Parameters:
+    - job (dict): Keyword arguments of evaluate.
+
+    Returns:
+    - result (dict): The result of evaluate with "status": "ok", or the job
+      with "status": "error" and the error message.
+    """
+    try:
+        return {"status": "ok", **evaluate(**job)}
+    except Exception as error:
+        return {"status": "error", **job, "error": f"{type(error).__name__}: {error}"}
+
+# Evaluate many datasets concurrently
+def evaluate_many(jobs, max_workers=None):
+    """
+    Evaluate many dataset/target pairs on a process pool. A failing job does
+    not stop the others.
+
+    Parameters:
+    - jobs (list): Keyword arguments of evaluate, one dict per job.
+    - max_workers (int): Number of worker processes (default: number of CPUs).
+
+    Returns:
+    - results (list): One result per job, in the order of jobs.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(evaluate_job, jobs))
+
+# Read a manifest of evaluation jobs
+def load_manifest(manifest_path):
+    """
+    Read a JSON list of jobs, or a CSV file with one job per row. Columns or
+    keys are the keyword arguments of evaluate (file_path, target_col,
+    model_type, output_path, ...). Relative paths are resolved from the
+    directory of the manifest.
+
+    Parameters:
+    - manifest_path (str): Path to the .json or .csv manifest.
+
+    Returns:
+    - jobs (list): One dict of keyword arguments per job.
+    """
+    if manifest_path.endswith(".json"):
+        with open(manifest_path) as file:
+            jobs = json.load(file)
+    else:
+        jobs = pd.read_csv(manifest_path).to_dict(orient="records")
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    for job in jobs:
+        for key in list(job):
+            if isinstance(job[key], float) and np.isnan(job[key]):
+                del job[key]
+        for key in ("file_path", "output_path", "cache_dir", "refresh_state"):
+            if job.get(key) is not None:
+                job[key] = os.path.join(base, job[key])
+    return jobs
+
+# Parse the command line arguments
+def parse_args(argv=None):
+    """
+    Parse the command line. Without --data or --manifest the script runs interactively.
+
+    Parameters:
+    - argv (list): Arguments to parse (default: sys.argv).
+
+    Returns:
+    - args (Namespace): The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Find the best regressor or classifier for a CSV dataset.")
+    parser.add_argument("--data", help="Path to the CSV, Parquet, Feather/Arrow or .npyds dataset.")
+    parser.add_argument("--target", help="Name of the dependent target column.")
+    parser.add_argument("--task", choices=["regressor", "classifier"], help="Type of the ML model.")
+    parser.add_argument("--output", help="Save the best model to this file (.npz exports a linear model for NumPy-only scoring).")
+    parser.add_argument("--manifest", help="JSON or CSV file listing many jobs.")
+    parser.add_argument("--workers", type=int, help="Processes used to run the manifest jobs.")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Processes used to fit the candidates of a job.")
+    parser.add_argument("--race", action="store_true", help="Race the candidates with successive halving.")
+    parser.add_argument("--chunksize", type=int, help="Stream the CSV file in chunks of this many rows.")
+    parser.add_argument("--memory-budget", type=int, help="Maximum bytes held while streaming the CSV file (about twice the loaded data).")
+    parser.add_argument("--incremental", action="store_true", help="Train partial_fit models out of core.")
+    parser.add_argument("--cache-dir", help="Directory of the preprocessing cache.")
+    parser.add_argument("--cache-size", type=int, default=1 << 30, help="Size cap of the cache in bytes.")
+    parser.add_argument("--instrument", action="store_true", help="Include stage timings in the results.")
+    parser.add_argument("--cv", type=int, help="Select the best model by k-fold cross-validation with this many folds.")
+    parser.add_argument("--cv-repeats", type=int, default=1, help="Number of times the cross-validation is repeated.")
+    parser.add_argument("--features", type=lambda value: value.split(","), help="Comma-separated feature columns to read.")
+    parser.add_argument("--dtype", choices=Evaluator.DTYPES, default="float64", help="Compute precision.")
+    parser.add_argument("--layout", choices=["auto", "sparse", "dense"], default="auto",
+                        help="Keep one-hot features sparse, densify them, or decide from their density.")
+    parser.add_argument("--knn-backend", choices=Evaluator.KNN_BACKENDS, default="auto",
+                        help="Neighbour search of the KNN candidate.")
+    parser.add_argument("--knn-options", type=json.loads, help='JSON parameters of the KNN backend, e.g. \'{"n_probe": 4}\'.')
+    parser.add_argument("--kernel-approximation", choices=["auto", "always", "never"], default="auto",
+                        help="Replace SVR/SVC with an approximate kernel (auto: above --kernel-row-threshold rows).")
+    parser.add_argument("--kernel-row-threshold", type=int, default=20000,
+                        help="Training rows above which SVR/SVC are approximated.")
+    parser.add_argument("--refresh-state", help="Re-evaluate only the rows appended since the run that saved this state file.")
+    parser.add_argument("--drift-threshold", type=float, default=0.25,
+                        help="Feature mean shift, in standard deviations, above which a refresh refits every candidate.")
+    parser.add_argument("--memory-limit", type=int,
+                        help="Bytes a candidate fit may allocate; larger fits are subsampled or skipped.")
+    parser.add_argument("--time-limit", type=float,
+                        help="Seconds a candidate fit may take; longer fits are subsampled or killed.")
+    parser.add_argument("--convert", help="Convert --data from CSV to this .parquet, .feather, .arrow or .npyds path and exit.")
+    args = parser.parse_args(argv)
+    if args.convert is not None and args.data is None:
+        parser.error("--convert requires --data")
+    if args.data is not None and args.convert is None and (args.target is None or args.task is None):
+        parser.error("--data requires --target and --task")
+    if ((args.memory_limit is not None or args.time_limit is not None)
+            and (args.race or args.cv is not None or args.incremental or args.refresh_state is not None)):
+        parser.error("--memory-limit and --time-limit cannot be combined with --race, --cv, --incremental or --refresh-state")
+    return args
+
+# Run the interactive prompts
+def run_interactive():
+    """
+    Ask for the model type, the dataset and the target, then evaluate the
+    candidate models and offer to save the best one.
+    """
     model_type = input("What ML model would you like to use? (regressor or classifier): ")
     file_path = input("Enter the path and/or filename of the .csv file: ")
 
     model_evaluator = Evaluator(model_type, file_path)
-    model_evaluator.load_data()
+    try:
+        model_evaluator.load_data()
+    except FileNotFoundError:
+        exit(1)
     model_evaluator.get_user_input()
-    model_evaluator.prepare_data()
-    model_evaluator.validate_dependent_value()
+    try:
+        # The data is validated here, before any model is trained
+        model_evaluator.prepare_data()
+    except ValueError:
+        exit(1)
 
     if model_type == "regressor":
         best_model, best_score = model_evaluator.find_best_regressor_model()
     else:
         best_model, best_score = model_evaluator.find_best_classifier_model()
 
-    if model_evaluator.dependent_value == "categorical" and model_type == "regressor":
-        print("Data is not ready for machine learning. Missing data in columns:", model_evaluator.df.columns[model_evaluator.df.isnull().any()])
-    else:
-        model_evaluator.evaluate_model(best_model)
+    model_evaluator.evaluate_model(best_model)
+
+    print(f"The Best Model for this data is:", best_model.__class__.__name__)
+    print(f"The best performing score is:", best_score)
 
-        print(f"The Best Model for this data is:", best_model.__class__.__name__)
-        print(f"The best performing score is:", best_score)
+    model_evaluator.save_best_model(best_model)
 
-        model_evaluator.save_best_model(best_model)
+# Main script execution
+if __name__ == "__main__":
+    args = parse_args()
+    options = {
+        "n_jobs": args.n_jobs, "race": args.race, "chunksize": args.chunksize,
+        "memory_budget": args.memory_budget, "incremental": args.incremental,
+        "cache_dir": args.cache_dir, "cache_size": args.cache_size, "instrument": args.instrument,
+        "cv": args.cv, "cv_repeats": args.cv_repeats, "features": args.features,
+        "dtype": args.dtype, "sparse": {"auto": None, "sparse": True, "dense": False}[args.layout],
+        "knn_backend": args.knn_backend, "knn_options": args.knn_options,
+        "kernel_approximation": {"auto": None, "always": True, "never": False}[args.kernel_approximation],
+        "kernel_row_threshold": args.kernel_row_threshold,
+        "refresh_state": args.refresh_state, "drift_threshold": args.drift_threshold,
+        "memory_limit": args.memory_limit, "time_limit": args.time_limit,
+    }
+    if args.convert is not None:
+        print(convert_dataset(args.data, args.convert))
+    elif args.manifest is not None:
+        jobs = [{**options, **job} for job in load_manifest(args.manifest)]
+        results = evaluate_many(jobs, args.workers)
+        print(json.dumps(results, indent=2, default=str))
+        sys.exit(1 if any(result["status"] == "error" for result in results) else 0)
+    elif args.data is not None:
+        result = evaluate(args.data, args.target, args.task, args.output, **options)
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        run_interactive()
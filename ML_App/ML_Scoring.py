@@ -0,0 +1,153 @@
+import sys
+import json
+import numpy as np
+
+# Only NumPy is imported at module load. joblib, scikit-learn and SciPy are
+# imported when an artifact needs them, so a process scoring a linear model
+# exported to .npz starts without them.
+
+# Version written into saved artifacts; newer files are refused
+ARTIFACT_VERSION = 2
+
+# Check that an artifact can be read by this module
+def check_version(meta, file_path):
+    """
+    Parameters:
+    - meta (dict): The artifact, or the metadata of an exported linear model.
+    - file_path (str): Path of the artifact, for the error message.
+    """
+    if meta.get("version", 1) > ARTIFACT_VERSION:
+        raise ValueError(f"{file_path} has artifact version {meta['version']}; "
+                         f"this version of ML_Scoring reads up to version {ARTIFACT_VERSION}.")
+
+# Load a model saved by Evaluator.save_best_model
+def load_artifact(file_path, mmap_mode="r"):
+    """
+    Load a saved model once. A .npz file holds the exported coefficients of
+    a linear model and is scored with NumPy alone. Any other file is a
+    joblib artifact whose arrays are memory-mapped; files written before the
+    scaler was bundled with the model contain the bare estimator and are
+    wrapped so they can still be served, without scaling.
+
+    Parameters:
+    - file_path (str): Path to the .npz or joblib file.
+    - mmap_mode (str): Memory-map mode of the joblib arrays, or None to read them.
+
+    Returns:
+    - artifact (dict): The model, scaler and feature names, or the exported
+      coefficients and their schema.
+    """
+    if str(file_path).endswith(".npz"):
+        with np.load(file_path, allow_pickle=False) as data:
+            artifact = json.loads(str(data["meta"]))
+            artifact["arrays"] = {name: data[name] for name in data.files if name != "meta"}
+        check_version(artifact, file_path)
+        return artifact
+    import joblib
+    artifact = joblib.load(file_path, mmap_mode=mmap_mode)
+    if not isinstance(artifact, dict):
+        return {"model": artifact, "scaler": None, "features": None}
+    check_version(artifact, file_path)
+    return artifact
+
+# Write the exported coefficients of a linear model
+def save_linear(file_path, meta, arrays):
+    """
+    Save an exported linear model as an uncompressed .npz file: its
+    metadata as a JSON string and its coefficients as arrays.
+
+    Parameters:
+    - file_path (str): Path of the file; it must end with .npz.
+    - meta (dict): Schema of the export (see ML_App.export_linear).
+    - arrays (dict): The coefficient arrays.
+    """
+    if not str(file_path).endswith(".npz"):
+        raise ValueError(f"Exported linear models are saved as .npz files, not {file_path}.")
+    meta = {"format": "ml_app_linear", "version": ARTIFACT_VERSION, **meta}
+    np.savez(file_path, meta=np.array(json.dumps(meta)), **arrays)
+
+# Give a model its input in a layout it supports
+def adapt_input(model, X):
+    """
+    Fall back to a dense array for models that do not accept sparse input,
+    and make dense arrays C-contiguous. Models that do not support float32
+    cast it to float64 themselves.
+
+    Parameters:
+    - model: The machine learning model about to be fitted or applied.
+    - X: The preprocessed features.
+
+    Returns:
+    - X: The features in a layout accepted by the model.
+    """
+    # A sparse matrix can only exist once scipy.sparse is loaded, so the
+    # check does not import SciPy
+    sparse = sys.modules.get("scipy.sparse")
+    if sparse is not None and sparse.issparse(X):
+        from sklearn.utils import get_tags
+        if get_tags(model).input_tags.sparse:
+            return X
+        X = X.toarray()
+    if isinstance(X, np.ndarray) and not X.flags.c_contiguous:
+        X = np.ascontiguousarray(X)
+    return X
+
+# Apply an exported linear model to raw rows
+def predict_linear(artifact, rows):
+    """
+    Score raw rows with the exported coefficients, using NumPy only.
+    Missing numeric values are imputed with the fitted medians; the
+    standardization is folded into the numeric weights. Categories not seen
+    during the fit add nothing, like the one-hot encoder.
+
+    Parameters:
+    - artifact (dict): An exported linear model from load_artifact.
+    - rows (DataFrame or dict): Raw feature columns by name; extra columns are ignored.
+
+    Returns:
+    - predictions (ndarray): One prediction per row.
+    """
+    arrays = artifact["arrays"]
+    n_rows = len(rows[artifact["features"][0]])
+    decision = np.tile(arrays["intercept"], (n_rows, 1))
+    if artifact["numeric"]:
+        X = np.column_stack([np.asarray(rows[name], dtype=np.float64) for name in artifact["numeric"]])
+        missing = np.isnan(X)
+        if missing.any():
+            X = np.where(missing, arrays["numeric_fill"], X)
+        decision += X @ arrays["numeric_weights"].T
+    for i, (name, categories) in enumerate(zip(artifact["categorical"], artifact["categories"])):
+        # Missing values are stored as None and looked up as None
+        positions = {category: j for j, category in enumerate(categories)}
+        codes = np.fromiter((positions.get(None if value != value else value, -1)
+                             for value in np.asarray(rows[name], dtype=object)), dtype=np.intp, count=n_rows)
+        weights = arrays[f"categorical_weights_{i}"].T
+        decision += np.where((codes >= 0)[:, None], weights[codes], 0.0)
+
+    if artifact["model_type"] == "regressor":
+        return decision[:, 0] if decision.shape[1] == 1 else decision
+    classes = np.asarray(artifact["classes"])
+    if decision.shape[1] == 1:
+        return classes[(decision[:, 0] > 0).astype(np.intp)]
+    return classes[decision.argmax(axis=1)]
+
+# Apply the scaler and the model of an artifact to raw rows
+def predict_rows(artifact, rows):
+    """
+    Score raw rows in one vectorized call.
+
+    Parameters:
+    - artifact (dict): Output of load_artifact.
+    - rows (DataFrame): Raw feature rows; extra columns are ignored. An
+      exported linear model also accepts a dict of columns.
+
+    Returns:
+    - predictions (ndarray): One prediction per row.
+    """
+    if artifact.get("format") == "ml_app_linear":
+        return predict_linear(artifact, rows)
+    if artifact["features"] is not None:
+        rows = rows[artifact["features"]]
+    if artifact["scaler"] is not None:
+        rows = adapt_input(artifact["model"], artifact["scaler"].transform(rows))
+    return artifact["model"].predict(rows)
@@ -0,0 +1,338 @@
+import io
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from ML_Scoring import load_artifact, predict_rows
+
+# Parse a request body or a group of input lines into rows
+def parse_rows(lines, input_format, header=None):
+    """
+    Parse CSV or NDJSON lines into a DataFrame.
+
+    Parameters:
+    - lines (list): Text lines without the CSV header.
+    - input_format (str): "csv" or "ndjson".
+    - header (str): The CSV header line.
+
+    Returns:
+    - rows (DataFrame): The parsed rows.
+    """
+    if input_format == "ndjson":
+        return pd.DataFrame([json.loads(line) for line in lines])
+    return pd.read_csv(io.StringIO("\n".join([header] + list(lines))))
+
+# Score a single input line
+def score_line(artifact, line, input_format, header=None):
+    """
+    Parameters:
+    - artifact (dict): Output of load_artifact.
+    - line (str): One CSV or NDJSON row.
+    - input_format (str): "csv" or "ndjson".
+    - header (str): The CSV header line.
+
+    Returns:
+    - record (str): The JSON prediction, or a JSON {"error": ...} object if the row cannot be scored.
+    """
+    try:
+        return json.dumps(predict_rows(artifact, parse_rows([line], input_format, header))[0].item())
+    except Exception as error:
+        return json.dumps({"error": str(error)})
+
+# Take items from a queue until a batch is full or the wait is over
+def gather(source, first, max_items, max_wait, size=len):
+    """
+    Collect a micro-batch: the first item plus whatever arrives within
+    max_wait seconds, up to max_items in total.
+
+    Parameters:
+    - source (Queue): The queue to read from.
+    - first: The item that opened the batch.
+    - max_items (int): Maximum batch size, counted with size().
+    - max_wait (float): Seconds to wait for more items.
+    - size (callable): Size of an item.
+
+    Returns:
+    - batch (list): The collected items.
+    - closed (bool): True if the end-of-input marker (None) was read.
+    """
+    batch = [first]
+    total = size(first)
+    deadline = time.perf_counter() + max_wait
+    while total < max_items:
+        timeout = deadline - time.perf_counter()
+        if timeout <= 0:
+            break
+        try:
+            item = source.get(timeout=timeout)
+        except queue.Empty:
+            break
+        if item is None:
+            return batch, True
+        batch.append(item)
+        total += size(item)
+    return batch, False
+
+# Define a class for throughput and latency statistics
+class ServingStats:
+    def __init__(self, window=100000):
+        """
+        Initialize the statistics of a scoring process.
+
+        Parameters:
+        - window (int): Number of most recent latencies kept for the percentiles.
+        """
+        self.start = time.perf_counter()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.lock = threading.Lock()
+
+    # Record a served request
+    def record(self, n_rows, latency):
+        """
+        Parameters:
+        - n_rows (int): Rows in the request.
+        - latency (float): Seconds between receiving the request and answering it.
+        """
+        with self.lock:
+            self.requests += 1
+            self.rows += n_rows
+            self.latencies.append(latency)
+
+    # Summarize the statistics
+    def summary(self):
+        """
+        Returns:
+        - summary (dict): Counts, rows per second and latency percentiles in milliseconds.
+        """
+        with self.lock:
+            latencies = np.array(self.latencies)
+            elapsed = time.perf_counter() - self.start
+            summary = {
+                "requests": self.requests,
+                "rows": self.rows,
+                "batches": self.batches,
+                "rows_per_second": self.rows / elapsed if elapsed > 0 else 0.0,
+            }
+        for percentile in (50, 90, 99):
+            value = np.percentile(latencies, percentile) * 1000 if len(latencies) else None
+            summary[f"latency_p{percentile}_ms"] = value
+        return summary
+
+# Define a class for micro-batching concurrent scoring requests
+class MicroBatcher:
+    def __init__(self, artifact, max_batch_rows=1024, max_wait=0.005, stats=None):
+        """
+        Initialize a batcher that merges the rows of concurrent requests into
+        a single vectorized predict call, run by one background thread. If
+        the call fails, the requests of the batch are scored one by one, so
+        a bad request does not fail the others.
+
+        Parameters:
+        - artifact (dict): Output of load_artifact.
+        - max_batch_rows (int): Maximum rows per predict call.
+        - max_wait (float): Seconds to wait for more requests before predicting.
+        - stats (ServingStats): Statistics to update, or None.
+        """
+        self.artifact = artifact
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait
+        self.stats = stats or ServingStats()
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # Score rows, waiting for the batch they end up in
+    def predict(self, rows):
+        """
+        Parameters:
+        - rows (DataFrame): Raw feature rows.
+
+        Returns:
+        - predictions (ndarray): One prediction per row.
+        """
+        request = {"rows": rows, "done": threading.Event(), "result": None, "error": None,
+                   "received": time.perf_counter()}
+        self.requests.put(request)
+        request["done"].wait()
+        if request["error"] is not None:
+            raise request["error"]
+        return request["result"]
+
+    # Stop the background thread
+    def close(self):
+        self.requests.put(None)
+        self.thread.join()
+
+    def _run(self):
+        closed = False
+        while not closed:
+            first = self.requests.get()
+            if first is None:
+                break
+            batch, closed = gather(self.requests, first, self.max_batch_rows, self.max_wait,
+                                   size=lambda request: len(request["rows"]))
+            try:
+                predictions = predict_rows(self.artifact, pd.concat([request["rows"] for request in batch]))
+                offsets = np.cumsum([len(request["rows"]) for request in batch])[:-1]
+                for request, result in zip(batch, np.split(predictions, offsets)):
+                    request["result"] = result
+            except Exception:
+                # Score the requests one by one so only the bad ones fail
+                for request in batch:
+                    try:
+                        request["result"] = predict_rows(self.artifact, request["rows"])
+                    except Exception as error:
+                        request["error"] = error
+            self.stats.batches += 1
+            for request in batch:
+                self.stats.record(len(request["rows"]), time.perf_counter() - request["received"])
+                request["done"].set()
+
+# Score rows read from a text stream
+def serve_stream(artifact, lines, output, input_format="csv", max_batch_rows=1024, max_wait=0.005, stats=None):
+    """
+    Score CSV or NDJSON rows from an input stream and write one JSON
+    prediction per line. A reader thread feeds the lines to a queue, and rows
+    are scored in micro-batches of up to max_batch_rows. If a batch fails, its
+    rows are scored one by one and each bad row gets an {"error": ...} line.
+
+    Parameters:
+    - artifact (dict): Output of load_artifact.
+    - lines (iterable): Input lines, e.g. sys.stdin. CSV input starts with a header.
+    - output: Writable text stream for the predictions.
+    - input_format (str): "csv" or "ndjson".
+    - max_batch_rows (int): Maximum rows per predict call.
+    - max_wait (float): Seconds to wait for more rows before predicting.
+    - stats (ServingStats): Statistics to update, or None.
+
+    Returns:
+    - stats (ServingStats): The statistics of the run.
+    """
+    stats = stats or ServingStats()
+    lines = iter(lines)
+    header = next(lines, "").strip() if input_format == "csv" else None
+    source = queue.Queue()
+
+    def read():
+        for line in lines:
+            if line.strip():
+                source.put((line.strip(), time.perf_counter()))
+        source.put(None)
+
+    threading.Thread(target=read, daemon=True).start()
+    closed = False
+    while not closed:
+        first = source.get()
+        if first is None:
+            break
+        batch, closed = gather(source, first, max_batch_rows, max_wait, size=lambda item: 1)
+        lines_batch = [line for line, _ in batch]
+        try:
+            predictions = predict_rows(artifact, parse_rows(lines_batch, input_format, header))
+            records = [json.dumps(prediction.item()) for prediction in predictions]
+        except Exception:
+            # Score the rows one by one so only the bad ones get an error record
+            records = [score_line(artifact, line, input_format, header) for line in lines_batch]
+        for record in records:
+            output.write(record + "\n")
+        output.flush()
+        stats.batches += 1
+        for _, received in batch:
+            stats.record(1, time.perf_counter() - received)
+    return stats
+
+# Build an HTTP server scoring POST /predict requests
+def make_http_server(artifact, host="127.0.0.1", port=8000, max_batch_rows=1024, max_wait=0.005):
+    """
+    Build a threaded HTTP server. POST /predict takes a CSV body (with header)
+    or an NDJSON body (Content-Type: application/x-ndjson) and answers with
+    one JSON prediction per line. GET /stats returns the throughput and
+    latency percentiles. Requests are micro-batched by a MicroBatcher.
+
+    Parameters:
+    - artifact (dict): Output of load_artifact.
+    - host (str): Interface to listen on.
+    - port (int): Port to listen on (0 picks a free port).
+    - max_batch_rows (int): Maximum rows per predict call.
+    - max_wait (float): Seconds to wait for more requests before predicting.
+
+    Returns:
+    - server (ThreadingHTTPServer): The server, with its batcher as server.batcher.
+    """
+    batcher = MicroBatcher(artifact, max_batch_rows, max_wait)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/stats":
+                self.send_error(404)
+                return
+            self._reply(200, json.dumps(batcher.stats.summary()), "application/json")
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            input_format = "ndjson" if "ndjson" in self.headers.get("Content-Type", "") else "csv"
+            lines = [line for line in body.splitlines() if line.strip()]
+            try:
+                if input_format == "csv":
+                    rows = parse_rows(lines[1:], "csv", lines[0])
+                else:
+                    rows = parse_rows(lines, "ndjson")
+                predictions = batcher.predict(rows)
+            except Exception as error:
+                self._reply(400, json.dumps({"error": str(error)}), "application/json")
+                return
+            self._reply(200, "".join(json.dumps(p.item()) + "\n" for p in predictions), "application/x-ndjson")
+
+        def _reply(self, status, text, content_type):
+            data = text.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.batcher = batcher
+    return server
+
+# Main script execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score rows with a model saved by ML_App.py.")
+    parser.add_argument("model", help="Model file written by save_best_model (joblib, or .npz for an exported linear model).")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv", help="Input format on stdin.")
+    parser.add_argument("--port", type=int, help="Serve HTTP on this local port instead of reading stdin.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface for the HTTP server.")
+    parser.add_argument("--max-batch-rows", type=int, default=1024, help="Maximum rows per predict call.")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Milliseconds to wait for a fuller batch.")
+    args = parser.parse_args()
+
+    artifact = load_artifact(args.model)
+    if args.port is None:
+        stats = serve_stream(artifact, sys.stdin, sys.stdout, args.format,
+                             args.max_batch_rows, args.max_wait_ms / 1000)
+        print(json.dumps(stats.summary()), file=sys.stderr)
+    else:
+        server = make_http_server(artifact, args.host, args.port, args.max_batch_rows, args.max_wait_ms / 1000)
+        print(f"Serving on http://{args.host}:{server.server_address[1]}/predict", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.batcher.close()
+            print(json.dumps(server.batcher.stats.summary()), file=sys.stderr)
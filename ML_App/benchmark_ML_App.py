@@ -0,0 +1,344 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+import io
+import subprocess
+import pandas as pd
+from sklearn.datasets import make_regression, make_classification
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ML_App import Evaluator, adapt_input
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# Bundled datasets: (file name, target column, model type)
+DATASETS = [
+    ("Advertising.csv", "sales", "regressor"),
+    ("hearing_test.csv", "test_result", "classifier"),
+    ("insurance.csv", "charges", "regressor"),
+    ("gene_expression.csv", "Cancer Present", "classifier"),
+]
+
+# Candidates whose fit or predict cost grows faster than linearly with the rows
+KERNEL_MODELS = ("Support Vector Regression", "SVC", "KNN")
+
+# Time a function and record its peak memory
+def measure(function, repeat=1):
+    """
+    Run a function and measure it. Time is the fastest of repeat untraced
+    runs; memory is the peak traced by tracemalloc during one extra run
+    (NumPy reports its buffers to tracemalloc), so the tracing overhead is
+    not counted in the time.
+
+    Parameters:
+    - function (callable): The stage to measure, called without arguments.
+    - repeat (int): Number of timed runs.
+
+    Returns:
+    - result: The return value of the last timed run.
+    - record (dict): "seconds" and "peak_bytes" of the stage.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, {"seconds": seconds, "peak_bytes": peak_bytes}
+
+# Write a synthetic dataset to a CSV file
+def make_synthetic_csv(folder, model_type, n_rows, n_features=10):
+    """
+    Generate a synthetic regression or classification dataset.
+
+    Parameters:
+    - folder (str): Directory for the CSV file.
+    - model_type (str): "regressor" or "classifier".
+    - n_rows (int): Number of rows.
+    - n_features (int): Number of feature columns.
+
+    Returns:
+    - file_path (str): Path to the CSV file.
+    - target_col (str): Name of the target column.
+    """
+    if model_type == "regressor":
+        X, y = make_regression(n_samples=n_rows, n_features=n_features, noise=10.0, random_state=101)
+    else:
+        X, y = make_classification(n_samples=n_rows, n_features=n_features, random_state=101)
+    df = pd.DataFrame(X, columns=[f"x{i}" for i in range(n_features)])
+    df["target"] = y
+    file_path = os.path.join(folder, f"synthetic_{model_type}_{n_rows}.csv")
+    df.to_csv(file_path, index=False)
+    return file_path, "target"
+
+# Benchmark every stage of the evaluation pipeline on one dataset
+def benchmark_dataset(file_path, target_col, model_type, repeat=1, kernel_row_limit=50000,
+                      dtype="float64", sparse=None):
+    """
+    Time load_data, prepare_data, the fit and predict of every candidate and
+    evaluate_model. A failing stage is recorded with its error and ends the
+    benchmark of the dataset; a failure outside the measured stages (e.g. an
+    unknown target column) is recorded as the "setup" stage.
+
+    Parameters:
+    - file_path (str): Path to the CSV file.
+    - target_col (str): Name of the target column.
+    - model_type (str): "regressor" or "classifier".
+    - repeat (int): Number of timed runs per stage.
+    - kernel_row_limit (int): Skip the kernel and neighbour candidates above this
+      number of training rows, where a single fit can take hours.
+    - dtype (str): Compute precision of the Evaluator.
+    - sparse (bool): Layout of the one-hot features (see Evaluator).
+
+    Returns:
+    - stages (dict): Stage name -> measurement record.
+    """
+    stages = {}
+    evaluator = Evaluator(model_type, file_path, dtype=dtype, sparse=sparse)
+
+    def run(name, function):
+        try:
+            result, stages[name] = measure(function, repeat)
+        except Exception as error:
+            stages[name] = {"error": f"{type(error).__name__}: {error}"}
+            raise
+        return result
+
+    try:
+        run("load_data", evaluator.load_data)
+        evaluator.set_target(target_col)
+        run("prepare_data", evaluator.prepare_data)
+        evaluator.validate_dependent_value()
+
+        if model_type == "regressor":
+            models = evaluator.get_regressor_models()
+        else:
+            models = evaluator.get_classifier_models()
+        for name, model in models.items():
+            if name in KERNEL_MODELS and evaluator.X_train.shape[0] > kernel_row_limit:
+                stages[f"fit:{name}"] = {"skipped": f"more than {kernel_row_limit} training rows"}
+                continue
+            # Same layout fallback as Evaluator.fit_candidates, outside the timed stages
+            X_train, X_test = adapt_input(model, evaluator.X_train), adapt_input(model, evaluator.X_test)
+            run(f"fit:{name}", lambda: model.fit(X_train, evaluator.y_train))
+            run(f"predict:{name}", lambda: model.predict(X_test))
+
+        # The results store is emptied before every run, so evaluate_model
+        # fits the first candidate again and prints its report each time
+        model = next(iter(models.values()))
+
+        def evaluate_model():
+            evaluator.results.clear()
+            evaluator.evaluate_model(model)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            run("evaluate_model", evaluate_model)
+    except Exception as error:
+        # A failed measured stage already holds its error; record any other failure
+        if not any("error" in record for record in stages.values()):
+            stages["setup"] = {"error": f"{type(error).__name__}: {error}"}
+    return stages
+
+# Scripts timed in a fresh interpreter by benchmark_cold_start, called with
+# the joblib path, the .npz path and the rows as JSON
+COLD_START_SCRIPTS = {
+    # What ML_Server.py paid before it used ML_Scoring
+    "cold_start:import ML_App": "import ML_App",
+    "cold_start:score joblib": (
+        "import pandas as pd\nimport ML_Scoring\n"
+        "ML_Scoring.predict_rows(ML_Scoring.load_artifact(sys.argv[1]), pd.DataFrame(json.loads(sys.argv[3])))"
+    ),
+    "cold_start:score npz": (
+        "import ML_Scoring\n"
+        "ML_Scoring.predict_rows(ML_Scoring.load_artifact(sys.argv[2]), json.loads(sys.argv[3]))"
+    ),
+}
+
+# Time how long a new process takes to load a saved model and score rows
+def benchmark_cold_start(file_path, target_col, model_type, folder, repeat=1):
+    """
+    Save the linear candidate of a dataset (Linear Regression or Logistic
+    Regression) as a joblib artifact and as an exported .npz, then time
+    fresh Python processes from start-up to their first predictions
+    (COLD_START_SCRIPTS).
+
+    Parameters:
+    - file_path (str): Path to the CSV file.
+    - target_col (str): Name of the target column.
+    - model_type (str): "regressor" or "classifier".
+    - folder (str): Directory for the saved models.
+    - repeat (int): Number of timed processes per script; the fastest counts.
+
+    Returns:
+    - stages (dict): Script name -> "seconds" and "peak_bytes" (peak resident
+      memory of the process, read from /proc, so Linux only).
+    """
+    evaluator = Evaluator(model_type, file_path)
+    evaluator.load_data()
+    evaluator.set_target(target_col)
+    evaluator.prepare_data()
+    name = "Linear Regression" if model_type == "regressor" else "Logistic Regression"
+    models = evaluator.get_regressor_models() if model_type == "regressor" else evaluator.get_classifier_models()
+    model = models[name].fit(adapt_input(models[name], evaluator.X_train), evaluator.y_train)
+    paths = [os.path.join(folder, "cold_start.joblib"), os.path.join(folder, "cold_start.npz")]
+    for path in paths:
+        evaluator.save_best_model(model, path)
+    rows = json.dumps(evaluator.df[evaluator.feature_names].head(10).to_dict(orient="list"), default=str)
+
+    stages = {}
+    for stage, script in COLD_START_SCRIPTS.items():
+        # Every process prints its peak resident memory last; unlike ru_maxrss,
+        # VmHWM is not inherited from this process
+        code = (f"import sys, json\n{script}\n"
+                "print([line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0])")
+        seconds = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", code, *paths, rows], check=True, capture_output=True,
+                                    text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+            seconds = min(seconds, time.perf_counter() - start)
+        # VmHWM is in KiB
+        stages[stage] = {"seconds": seconds, "peak_bytes": int(output.split()[-1]) * 1024}
+    return stages
+
+# Compare the neighbour search backends of the KNN candidate on one dataset
+def benchmark_knn(file_path, target_col, backends, n_queries=10000, dtype="float64"):
+    """
+    Measure every KNN backend with Evaluator.compare_knn_backends.
+
+    Parameters:
+    - file_path (str): Path to the CSV file of a classification dataset.
+    - target_col (str): Name of the target column.
+    - backends (dict): Backend options keyed by backend name.
+    - n_queries (int): Test rows queried per backend.
+    - dtype (str): Compute precision of the Evaluator.
+
+    Returns:
+    - report (list): One dict per backend.
+    """
+    evaluator = Evaluator("classifier", file_path, dtype=dtype)
+    evaluator.load_data()
+    evaluator.set_target(target_col)
+    evaluator.prepare_data()
+    return evaluator.compare_knn_backends(backends, n_queries)
+
+# Compare measurements with a stored baseline
+def find_regressions(results, baseline, tolerance=0.25, min_seconds=0.005):
+    """
+    List the stages that got slower or used more memory than in the baseline.
+
+    Parameters:
+    - results (dict): Dataset name -> stage name -> measurement record.
+    - baseline (dict): Results of an earlier run, in the same layout.
+    - tolerance (float): Allowed relative increase.
+    - min_seconds (float): Time differences below this are treated as noise.
+
+    Returns:
+    - regressions (list): Human readable descriptions of the regressions.
+    """
+    regressions = []
+    for dataset, stages in results.items():
+        for stage, record in stages.items():
+            previous = baseline.get(dataset, {}).get(stage)
+            if not previous or "seconds" not in record or "seconds" not in previous:
+                continue
+            if (record["seconds"] > previous["seconds"] * (1 + tolerance)
+                    and record["seconds"] - previous["seconds"] > min_seconds):
+                regressions.append(f"{dataset} {stage}: {previous['seconds']:.4f}s -> {record['seconds']:.4f}s")
+            if record["peak_bytes"] > previous["peak_bytes"] * (1 + tolerance):
+                regressions.append(f"{dataset} {stage}: {previous['peak_bytes']} -> {record['peak_bytes']} bytes")
+    return regressions
+
+# Print the measurements as a table
+def print_results(results):
+    """
+    Print one line per dataset and stage.
+
+    Parameters:
+    - results (dict): Dataset name -> stage name -> measurement record.
+    """
+    for dataset, stages in results.items():
+        print(dataset)
+        for stage, record in stages.items():
+            if "seconds" in record:
+                print(f"  {stage:<40} {record['seconds'] * 1000:>10.2f} ms {record['peak_bytes'] / 2 ** 20:>10.2f} MiB")
+            else:
+                print(f"  {stage:<40} {record.get('error') or record.get('skipped')}")
+
+# Main script execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ML_App evaluation pipeline.")
+    parser.add_argument("--rows", type=int, nargs="*", default=[10000, 100000, 1000000],
+                        help="Row counts of the synthetic datasets.")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage.")
+    parser.add_argument("--kernel-row-limit", type=int, default=50000,
+                        help="Skip SVR/SVC/KNN above this number of training rows.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown.")
+    parser.add_argument("--dtype", nargs="*", choices=Evaluator.DTYPES, default=["float64"],
+                        help="Compute precisions to measure; e.g. --dtype float64 float32 compares them.")
+    parser.add_argument("--layout", choices=["auto", "sparse", "dense"], default="auto",
+                        help="Layout of the one-hot features.")
+    parser.add_argument("--knn-backends", nargs="*", choices=Evaluator.KNN_BACKENDS,
+                        help="Also compare these KNN backends on the synthetic classification datasets.")
+    parser.add_argument("--knn-options", type=json.loads, default={},
+                        help='JSON options per backend, e.g. \'{"ivf": {"n_probe": 4}}\'.')
+    args = parser.parse_args()
+    sparse = {"auto": None, "sparse": True, "dense": False}[args.layout]
+
+    # Default modes keep the plain dataset names, so older baselines still apply
+    def label(name, dtype):
+        mode = [dtype] if dtype != "float64" else []
+        mode += [args.layout] if args.layout != "auto" else []
+        return f"{name} [{', '.join(mode)}]" if mode else name
+
+    # Confusion matrix plots must not open a window
+    import matplotlib
+    matplotlib.use("Agg")
+
+    results = {}
+    for file_name, target_col, model_type in DATASETS:
+        for dtype in args.dtype:
+            results[label(file_name, dtype)] = benchmark_dataset(os.path.join(ROOT, file_name), target_col, model_type,
+                                                                 args.repeat, args.kernel_row_limit, dtype, sparse)
+    with tempfile.TemporaryDirectory() as folder:
+        for file_name, target_col, model_type in DATASETS:
+            results[f"{file_name} [cold start]"] = benchmark_cold_start(os.path.join(ROOT, file_name), target_col,
+                                                                      model_type, folder, args.repeat)
+        for n_rows in args.rows:
+            for model_type in ("regressor", "classifier"):
+                file_path, target_col = make_synthetic_csv(folder, model_type, n_rows)
+                for dtype in args.dtype:
+                    results[label(os.path.basename(file_path), dtype)] = benchmark_dataset(
+                        file_path, target_col, model_type, args.repeat, args.kernel_row_limit, dtype, sparse)
+                if model_type == "classifier" and args.knn_backends:
+                    backends = {backend: args.knn_options.get(backend, {}) for backend in args.knn_backends}
+                    print(f"KNN backends on {os.path.basename(file_path)}")
+                    for row in benchmark_knn(file_path, target_col, backends, dtype=args.dtype[0]):
+                        print(f"  {row['backend']:<10} {row['queries_per_second']:>12,.0f} queries/s "
+                              f"accuracy {row['accuracy']:.4f} recall {row['recall']:.4f} fit {row['fit_seconds']:.2f}s")
+    print_results(results)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            regressions = find_regressions(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        sys.exit(1 if regressions else 0)
@@ -1,7 +1,19 @@
 import unittest
+import io
+import os
+import json
+import tempfile
+import time
 from unittest.mock import patch
+import numpy as np
 import pandas as pd
-from ML_App import Evaluator
+import scipy.sparse
+from ML_App import (
+    Evaluator, PreprocessingCache, Instrumentation, evaluate, evaluate_many, load_manifest, convert_dataset,
+    adapt_input, ResourceGovernor, stratified_subsample
+)
+from sklearn.linear_model import Ridge
+from sklearn.naive_bayes import GaussianNB
 
 class TestEvaluator(unittest.TestCase):
     @patch('builtins.input', side_effect=["sales", "Advertising.csv", "regressor"])
@@ -133,5 +145,586 @@ class TestEvaluator(unittest.TestCase):
         self.assertIsNotNone(best_model)
         self.assertIsNotNone(best_score)
 
+    @patch('builtins.input', side_effect=["test_result", "hearing_test.csv", "classifier"])
+    def test_parallel_sweep_matches_serial(self, mock_input):
+        # Test that the process pool sweep picks the same model as the serial sweep
+
+        # Instantiate the Evaluator and prepare data
+        evaluator = Evaluator("classifier", "hearing_test.csv")
+        evaluator.load_data()
+        evaluator.get_user_input()
+        evaluator.prepare_data()
+
+        # Run the sweep serially and on two worker processes
+        serial_model, serial_score = evaluator.find_best_classifier_model()
+        parallel_model, parallel_score = evaluator.find_best_classifier_model(n_jobs=2)
+
+        # Assertions to check the expected output
+        self.assertEqual(type(parallel_model), type(serial_model))
+        self.assertEqual(parallel_score, serial_score)
+
+    @patch('builtins.input', side_effect=["test_result", "hearing_test.csv", "classifier"])
+    def test_results_store(self, mock_input):
+        # Test that the candidates are fitted once and reported from the results store
+
+        # Instantiate the Evaluator and prepare data
+        evaluator = Evaluator("classifier", "hearing_test.csv")
+        evaluator.load_data()
+        evaluator.get_user_input()
+        evaluator.prepare_data()
+        best_model, best_score = evaluator.find_best_classifier_model()
+
+        # Every candidate is stored with its predictions, timings and metrics
+        self.assertEqual(list(evaluator.results), list(evaluator.get_classifier_models()))
+        result = evaluator.stored_result(best_model)
+        self.assertEqual(result["score"], best_score)
+        self.assertEqual(len(result["predictions"]), len(evaluator.y_test))
+        self.assertIn("wall_time", result["timings"]["fit"])
+        self.assertEqual(result["metrics"]["accuracy"], best_score)
+        self.assertIs(evaluator.compute_metrics(best_model), result["metrics"])
+
+        # Reporting the best model neither fits nor predicts it again
+        with patch.object(best_model, "fit") as fit, patch.object(best_model, "predict") as predict, \
+                patch("ML_App.ConfusionMatrixDisplay.from_predictions") as plot:
+            evaluator.evaluate_model(best_model)
+        fit.assert_not_called()
+        predict.assert_not_called()
+        plot.assert_called_once()
+
+    def test_load_data_in_chunks(self):
+        # Test for streaming the CSV file with compact dtypes
+
+        # Load the same file in chunks and with the default reader
+        evaluator = Evaluator("regressor", "insurance.csv")
+        evaluator.load_data(chunksize=300)
+        default_df = pd.read_csv("insurance.csv")
+
+        # Low-cardinality strings become categoricals and integers are downcast
+        self.assertIsInstance(evaluator.df["region"].dtype, pd.CategoricalDtype)
+        self.assertEqual(evaluator.df["age"].dtype, "int8")
+        self.assertEqual(evaluator.load_report["rows"], len(default_df))
+        self.assertLess(evaluator.load_report["compact_bytes"], evaluator.load_report["default_bytes_estimate"])
+
+        # The values are unchanged
+        pd.testing.assert_frame_equal(evaluator.df.astype(object), default_df.astype(object))
+
+    def test_diagnostics_on_stderr(self):
+        # Test that the non-interactive paths keep stdout free for the JSON output
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout, \
+                patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            evaluate("insurance.csv", "charges", "regressor", chunksize=300)
+            with self.assertRaises(ValueError):
+                evaluate("insurance.csv", "missing", "regressor")
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIn("Loaded 1338 rows", stderr.getvalue())
+        self.assertIn("'missing' is not a valid target column", stderr.getvalue())
+
+    def test_load_data_memory_budget(self):
+        # Test that a dataset larger than the memory budget is rejected
+        evaluator = Evaluator("regressor", "insurance.csv")
+        with self.assertRaises(MemoryError):
+            evaluator.load_data(memory_budget=10000)
+
+        # Columns left out of a projection are not read and do not count toward the budget
+        with self.assertRaises(MemoryError):
+            Evaluator("regressor", "insurance.csv").load_data(memory_budget=30000)
+        evaluator.load_data(memory_budget=30000, columns=["age", "charges"])
+        self.assertEqual(list(evaluator.df.columns), ["age", "charges"])
+        # The budget covers the chunks and their concatenation
+        report = evaluator.load_report
+        self.assertEqual(report["concat_peak_bytes"], 2 * report["compact_bytes"])
+        self.assertLess(report["concat_peak_bytes"], 30000)
+
+    def test_fit_incremental(self):
+        # Test for training the partial_fit models on mini-batches
+
+        # Instantiate the Evaluator without loading the whole file
+        evaluator = Evaluator("classifier", "hearing_test.csv")
+        best_model, best_score = evaluator.fit_incremental("test_result", batch_size=500)
+
+        # Assertions to check the expected output
+        self.assertTrue(hasattr(best_model, "partial_fit"))
+        self.assertGreater(best_score, 0.8)
+        self.assertEqual(evaluator.target_col, "test_result")
+        self.assertIsNotNone(evaluator.scaler)
+
+    def test_fit_incremental_empty_holdout(self):
+        # Test that a split without holdout rows is rejected before any training pass
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "small.csv")
+            pd.read_csv("hearing_test.csv").head(5).to_csv(path, index=False)
+            evaluator = Evaluator("classifier", path)
+            with self.assertRaises(ValueError):
+                evaluator.fit_incremental("test_result", test_size=0.0)
+
+    def test_fit_incremental_invalid_target(self):
+        # Test that an unknown target column is rejected before reading the data
+        evaluator = Evaluator("regressor", "Advertising.csv")
+        with self.assertRaises(ValueError):
+            evaluator.fit_incremental("price")
+
+    def test_refresh(self):
+        # Test the incremental re-evaluation of a CSV file growing by appended rows
+        df = pd.read_csv("hearing_test.csv")
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "hearing.csv")
+            state_path = os.path.join(folder, "state.joblib")
+            df.iloc[:3000].to_csv(path, index=False)
+
+            # The first run reads every row and fits every candidate
+            evaluator = Evaluator("classifier", path)
+            evaluator.refresh(state_path, "test_result")
+            report = evaluator.refresh_report
+            self.assertEqual((report["mode"], report["rows"], report["retrained"]), ("rebuild", 3000, True))
+            self.assertIn("SGD Classifier", evaluator.results)
+            self.assertIn("Logistic Regression", evaluator.results)
+
+            # Appended rows from the same distribution only update the partial_fit models
+            df.iloc[3000:4000].to_csv(path, mode="a", header=False, index=False)
+            evaluator = Evaluator("classifier", path)
+            best_model, best_score = evaluator.refresh(state_path, "test_result")
+            report = evaluator.refresh_report
+            self.assertEqual((report["mode"], report["new_rows"], report["rows"]), ("append", 1000, 4000))
+            self.assertFalse(report["retrained"])
+            self.assertEqual(len(evaluator.y_test), len(evaluator.results[report["leaderboard"][0][0]]["predictions"]))
+            self.assertEqual(best_score, report["leaderboard"][0][1])
+
+            # Shifted rows cross the drift threshold and refit the other candidates
+            shifted = df.iloc[4000:].copy()
+            shifted["age"] += 20
+            shifted.to_csv(path, mode="a", header=False, index=False)
+            evaluator = Evaluator("classifier", path)
+            evaluator.refresh(state_path, "test_result")
+            self.assertGreater(evaluator.refresh_report["drift"], 0.25)
+            self.assertTrue(evaluator.refresh_report["retrained"])
+
+            # A line still being written is left for the next run
+            with open(path, "a") as file:
+                file.write("40,30")
+            evaluator = Evaluator("classifier", path)
+            evaluator.refresh(state_path, "test_result")
+            self.assertEqual(evaluator.refresh_report["new_rows"], 0)
+
+            # An edited file is read again from the start
+            df.iloc[:500].to_csv(path, index=False)
+            evaluator = Evaluator("classifier", path)
+            evaluator.refresh(state_path, "test_result")
+            self.assertEqual((evaluator.refresh_report["mode"], evaluator.refresh_report["rows"]), ("rebuild", 500))
+
+    def test_refresh_dtype_change(self):
+        # Test that rows keep their side of the holdout split when appended rows change a column's dtype
+        df = pd.read_csv("hearing_test.csv")
+        df["age"] = df["age"].astype(int)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "hearing.csv")
+            state_path = os.path.join(folder, "state.joblib")
+            df.iloc[:3000].to_csv(path, index=False)
+            Evaluator("classifier", path).refresh(state_path, "test_result")
+
+            # Fractional ages make the retrain read the age column as floats
+            shifted = df.iloc[3000:].copy()
+            shifted["age"] = shifted["age"] + 20.5
+            shifted.to_csv(path, mode="a", header=False, index=False)
+            evaluator = Evaluator("classifier", path)
+            evaluator.refresh(state_path, "test_result")
+            self.assertTrue(evaluator.refresh_report["retrained"])
+            self.assertEqual(len(evaluator.y_train) + len(evaluator.y_test), len(df))
+
+    def test_prepare_data_cached(self):
+        # Test that a warm run reuses the cached arrays without parsing the CSV
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PreprocessingCache(cache_dir)
+
+            # Cold run prepares the data and stores it
+            cold = Evaluator("regressor", "Advertising.csv")
+            self.assertFalse(cold.prepare_data_cached("sales", cache))
+
+            # Warm run loads the stored arrays without touching load_data
+            warm = Evaluator("regressor", "Advertising.csv")
+            with patch.object(Evaluator, "load_data") as mock_load:
+                self.assertTrue(warm.prepare_data_cached("sales", cache))
+                mock_load.assert_not_called()
+
+            # Assertions to check the expected output
+            self.assertIsNone(warm.df)
+            self.assertTrue((warm.X_train == cold.X_train).all())
+            self.assertTrue((warm.y_test == cold.y_test.to_numpy()).all())
+            self.assertEqual(warm.dependent_value, "continuous")
+            best_model, best_score = warm.find_best_regressor_model()
+            self.assertEqual(best_score, cold.find_best_regressor_model()[1])
+
+            # Another model type on the same file and target does not share the entry
+            self.assertFalse(Evaluator("classifier", "Advertising.csv").prepare_data_cached("sales", cache))
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_cache_eviction(self):
+        # Test that the least recently used entry is evicted beyond the size cap
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PreprocessingCache(cache_dir, max_bytes=1)
+
+            # Each new entry evicts the previous one
+            Evaluator("regressor", "Advertising.csv").prepare_data_cached("sales", cache)
+            Evaluator("regressor", "Advertising.csv").prepare_data_cached("TV", cache)
+
+            # Assertions to check the expected output
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            self.assertIsNotNone(cache.get(cache.make_key("Advertising.csv", "TV", model_type="regressor", stratify=False,
+                                                          test_size=0.3, random_state=101)))
+
+    @patch('builtins.input', side_effect=["test_result", "hearing_test.csv", "classifier"])
+    def test_race_best_model(self, mock_input):
+        # Test for racing the candidates with successive halving
+
+        # Instantiate the Evaluator and prepare data
+        evaluator = Evaluator("classifier", "hearing_test.csv")
+        evaluator.load_data()
+        evaluator.get_user_input()
+        evaluator.prepare_data()
+
+        # Race the candidates and their hyperparameter grids
+        best_model, best_score = evaluator.find_best_classifier_model(race=True)
+
+        # Each round trains fewer settings on more rows, ending on the full training set
+        rounds = evaluator.race_history
+        self.assertGreater(len(rounds), 1)
+        self.assertEqual(rounds[-1]["n_samples"], len(evaluator.X_train))
+        for previous, current in zip(rounds, rounds[1:]):
+            self.assertLess(len(current["scores"]), len(previous["scores"]))
+            self.assertGreaterEqual(current["n_samples"], previous["n_samples"])
+
+        # The race picks the same winner as the full sweep on this data
+        self.assertEqual(type(best_model), type(evaluator.find_best_classifier_model()[0]))
+        self.assertGreater(best_score, 0.9)
+
+    @patch('builtins.input', side_effect=["sales"])
+    def test_cross_validate_best_model(self, mock_input):
+        # Test for selecting the best model by repeated k-fold cross-validation
+
+        # Instantiate the Evaluator and load data
+        evaluator = Evaluator("regressor", "Advertising.csv")
+        evaluator.load_data()
+        evaluator.get_user_input()
+
+        # Score every candidate on the same 5 folds repeated twice
+        best_model, best_score = evaluator.find_best_regressor_model(cv=5, cv_repeats=2)
+        serial_results = evaluator.cv_results
+
+        # Assertions to check the expected output
+        self.assertEqual(set(serial_results), set(evaluator.get_regressor_models()))
+        for result in serial_results.values():
+            self.assertEqual(len(result["scores"]), 10)
+            self.assertAlmostEqual(result["mean_score"], sum(result["scores"]) / 10)
+        self.assertEqual(best_score, max(result["mean_score"] for result in serial_results.values()))
+        # The best model and its preprocessing are refit on all rows
+        self.assertEqual(evaluator.scaler.named_transformers_["numeric"]["scale"].n_samples_seen_, len(evaluator.df))
+        self.assertEqual(len(best_model.predict(evaluator.scaler.transform(evaluator.X))), len(evaluator.df))
+
+        # Parallel (model, fold) jobs give the same scores
+        evaluator.find_best_regressor_model(n_jobs=2, cv=5, cv_repeats=2)
+        self.assertEqual(evaluator.cv_results, serial_results)
+
+    def test_cross_validate_then_evaluate(self):
+        # Test that the prepared split follows the preprocessing refit by cross-validation
+        evaluator = Evaluator("regressor", "insurance.csv")
+        evaluator.load_data()
+        evaluator.set_target("charges")
+        evaluator.prepare_data()
+        best_model, _ = evaluator.find_best_regressor_model(cv=3)
+        np.testing.assert_allclose(evaluator.X_test, evaluator.scaler.transform(evaluator.X.loc[evaluator.y_test.index]))
+
+        # The holdout metrics are computed in the feature space of the saved scaler
+        evaluator.evaluate_model(best_model)
+        result = evaluator.stored_result(best_model)
+        self.assertGreater(result["score"], 0.7)
+        np.testing.assert_allclose(result["predictions"], best_model.predict(evaluator.X_test))
+
+    def test_columnar_formats(self):
+        # Test for loading converted datasets with column projection
+        with tempfile.TemporaryDirectory() as folder:
+            for extension in (".parquet", ".feather", ".npyds"):
+                path = convert_dataset("Advertising.csv", os.path.join(folder, "Advertising" + extension))
+
+                # Only the requested columns are read
+                evaluator = Evaluator("regressor", path)
+                evaluator.load_data(columns=["TV", "sales"])
+                evaluator.set_target("sales")
+
+                # Assertions to check the expected output
+                self.assertEqual(list(evaluator.df.columns), ["TV", "sales"])
+                pd.testing.assert_frame_equal(evaluator.df, pd.read_csv("Advertising.csv", usecols=["TV", "sales"]),
+                                              check_dtype=False)
+
+            # Memmap columns are used in place, without a copy
+            base = evaluator.X["TV"].to_numpy()
+            while not isinstance(base, np.memmap):
+                base = base.base
+            self.assertEqual(base.filename, os.path.abspath(os.path.join(path, "0.npy")))
+
+            # A converted dataset gives the same result as the CSV file
+            result = evaluate(path, "sales", "regressor", features=["TV", "radio"])
+            self.assertEqual(result["best_score"], evaluate("Advertising.csv", "sales", "regressor",
+                                                            features=["TV", "radio"])["best_score"])
+
+    def test_prepare_data_categorical(self):
+        # Test for encoding categorical columns and imputing missing values
+
+        # Instantiate the Evaluator on data with strings and a missing value
+        evaluator = Evaluator("regressor", "insurance.csv")
+        evaluator.load_data()
+        evaluator.df.loc[3, "bmi"] = None
+        evaluator.set_target("charges")
+        evaluator.prepare_data()
+
+        # Assertions to check the expected output: 3 numeric columns and 2 + 2 + 4 one-hot columns
+        self.assertEqual(evaluator.X_train.shape[1], 11)
+        self.assertFalse(np.isnan(evaluator.X_train).any())
+        best_model, best_score = evaluator.find_best_regressor_model()
+        self.assertGreater(best_score, 0.5)
+
+        # Categories not seen during the fit are ignored
+        rows = evaluator.X.head(2).copy()
+        rows["region"] = "antarctica"
+        self.assertEqual(len(best_model.predict(evaluator.scaler.transform(rows))), 2)
+
+    def test_race_and_instrumentation_sparse(self):
+        # Test that a race and an instrumented run accept sparse one-hot features
+        for options in ({"race": True}, {"instrument": True}):
+            result = evaluate("insurance.csv", "charges", "regressor", sparse=True, **options)
+            self.assertGreater(result["best_score"], 0.5)
+        self.assertTrue(any(stage["stage"].startswith("fit:") for stage in result["stages"]))
+
+    def test_parallel_sweep_sparse(self):
+        # Test that sparse features are passed to worker processes unchanged
+        serial = evaluate("insurance.csv", "charges", "regressor", sparse=True)
+        parallel = evaluate("insurance.csv", "charges", "regressor", sparse=True, n_jobs=2)
+        self.assertEqual(parallel["best_model"], serial["best_model"])
+        self.assertAlmostEqual(parallel["best_score"], serial["best_score"])
+
+    def test_validate_data(self):
+        # Test that unusable data is rejected before any model is fitted
+        evaluator = Evaluator("regressor", "insurance.csv")
+        evaluator.load_data()
+        evaluator.set_target("smoker")
+        with patch('builtins.print'), self.assertRaises(ValueError) as error:
+            evaluator.prepare_data()
+        self.assertIn("categorical", str(error.exception))
+        self.assertIsNone(evaluator.X_train)
+
+    def test_float32_sparse_mode(self):
+        # Test for preparing float32 arrays with sparse one-hot features
+
+        # Instantiate the Evaluator in float32 mode and keep one-hot features sparse
+        evaluator = Evaluator("regressor", "insurance.csv", dtype="float32", sparse=True)
+        evaluator.load_data()
+        evaluator.set_target("charges")
+        evaluator.prepare_data()
+
+        # Assertions to check the expected output
+        self.assertTrue(scipy.sparse.issparse(evaluator.X_train))
+        self.assertEqual(evaluator.X_train.dtype, np.float32)
+        # Only the features are downcast; the metrics use the exact target
+        self.assertEqual(evaluator.X["bmi"].dtype, np.float32)
+        self.assertEqual(evaluator.y.dtype, np.float64)
+        best_model, best_score = evaluator.find_best_regressor_model()
+        self.assertGreater(best_score, 0.5)
+
+        # Models without sparse support fall back to a C-contiguous dense array
+        dense = adapt_input(GaussianNB(), evaluator.X_train)
+        self.assertIsInstance(dense, np.ndarray)
+        self.assertTrue(dense.flags.c_contiguous)
+        self.assertIs(adapt_input(Ridge(), evaluator.X_train), evaluator.X_train)
+
+    @patch('builtins.input', side_effect=["test_result"])
+    def test_knn_backends(self, mock_input):
+        # Test for the exact and approximate neighbour search backends of the KNN candidate
+
+        # Instantiate the Evaluator with an IVF index for the KNN candidate
+        evaluator = Evaluator("classifier", "hearing_test.csv", knn_backend="ivf", knn_options={"n_probe": 2})
+        evaluator.load_data()
+        evaluator.get_user_input()
+        evaluator.prepare_data()
+        self.assertEqual(evaluator.get_classifier_models()["KNN"].n_probe, 2)
+
+        # Compare the backends on the test set
+        report = evaluator.compare_knn_backends({"kd_tree": {"leaf_size": 60}, "ivf": {"n_probe": 1},
+                                                 "hnsw": {"ef": 50}}, n_queries=300)
+        results = {row["backend"]: row for row in report}
+
+        # Assertions to check the expected output
+        self.assertEqual(results["kd_tree"]["recall"], 1.0)
+        self.assertLess(results["ivf"]["recall"], 1.0)
+        self.assertGreater(results["hnsw"]["recall"], 0.9)
+        for row in report:
+            self.assertGreater(row["queries_per_second"], 0)
+            self.assertGreater(row["accuracy"], 0.85)
+
+        # Probing every list is an exact search: the same neighbour distances as brute force
+        exact = evaluator.make_knn("ivf", n_probe=1000).fit(evaluator.X_train, evaluator.y_train)
+        brute = evaluator.make_knn("brute").fit(evaluator.X_train, evaluator.y_train)
+        np.testing.assert_allclose(exact.kneighbors(evaluator.X_test)[0], brute.kneighbors(evaluator.X_test)[0],
+                                   rtol=1e-4, atol=2e-3)
+
+    @patch('builtins.input', side_effect=["test_result"])
+    def test_kernel_approximation(self, mock_input):
+        # Test for switching SVC to an approximate kernel above a row threshold
+
+        # Instantiate the Evaluator with a threshold below the training rows
+        evaluator = Evaluator("classifier", "hearing_test.csv", kernel_row_threshold=1000)
+        evaluator.load_data()
+        evaluator.get_user_input()
+        evaluator.prepare_data()
+        models = evaluator.get_classifier_models()
+
+        # Assertions to check the expected output
+        self.assertNotIn("SVC", models)
+        self.assertEqual(list(models["SVC (approximate)"].named_steps), ["kernel", "model"])
+        best_model, best_score = evaluator.find_best_classifier_model()
+        self.assertGreater(best_score, 0.85)
+
+        # The automatic switch reports the accuracy lost on a subsample
+        report = evaluator.kernel_report
+        self.assertAlmostEqual(report["score_loss"], report["exact_score"] - report["approximate_score"])
+        self.assertLess(abs(report["score_loss"]), 0.05)
+
+        # The exact kernel is kept below the threshold
+        evaluator.kernel_row_threshold = 100000
+        self.assertIn("SVC", evaluator.get_classifier_models())
+
+    def test_kernel_approximation_cross_validation(self):
+        # Test that cross-validation above the threshold reports the approximation without a prepared split
+        evaluator = Evaluator("classifier", "hearing_test.csv", kernel_row_threshold=1000)
+        evaluator.load_data()
+        evaluator.set_target("test_result")
+        best_model, best_score = evaluator.find_best_classifier_model(cv=3)
+
+        # Assertions to check the expected output
+        self.assertIsNone(evaluator.X_train)
+        self.assertGreater(best_score, 0.85)
+        self.assertEqual(evaluator.kernel_report["n_samples"], 2000)
+        self.assertLess(abs(evaluator.kernel_report["score_loss"]), 0.05)
+
+    @patch('builtins.input', side_effect=["sales", "Advertising.csv", "regressor"])
+    def test_instrumentation(self, mock_input):
+        # Test for recording every stage and candidate model
+
+        # Instantiate the Evaluator with instrumentation and a hook
+        instrumentation = Instrumentation(profiler="cprofile")
+        seen = []
+        instrumentation.add_hook(lambda record: seen.append(record["stage"]))
+        evaluator = Evaluator("regressor", "Advertising.csv", instrumentation=instrumentation)
+
+        # Run the pipeline
+        evaluator.load_data()
+        evaluator.get_user_input()
+        evaluator.prepare_data()
+        evaluator.find_best_regressor_model()
+
+        # Assertions to check the expected output
+        stages = [record["stage"] for record in instrumentation.records]
+        self.assertEqual(seen, stages)
+        for stage in ["load_data", "prepare_data", "select_best_model", "fit:Lasso", "predict:Support Vector Regression"]:
+            self.assertIn(stage, stages)
+        for record in instrumentation.records:
+            self.assertGreaterEqual(record["wall_time"], 0)
+            self.assertIn("cpu_time", record)
+            self.assertIn("memory_delta", record)
+
+        # Export the records and the profile
+        with tempfile.TemporaryDirectory() as folder:
+            instrumentation.to_json(os.path.join(folder, "stages.json"))
+            with open(os.path.join(folder, "stages.json")) as file:
+                self.assertEqual(len(json.load(file)), len(stages))
+            instrumentation.dump_profile(os.path.join(folder, "stages.prof"))
+            self.assertTrue(os.path.getsize(os.path.join(folder, "stages.prof")) > 0)
+
+    def test_instrumentation_disabled(self):
+        # Test that an Evaluator without instrumentation uses a shared no-op stage
+        evaluator = Evaluator("regressor", "Advertising.csv")
+        self.assertIs(evaluator.stage("load_data"), evaluator.stage("prepare_data"))
+
+    def test_resource_governor(self):
+        # Test that candidates over the limits are subsampled or skipped, and the actions recorded
+        evaluator = Evaluator("classifier", "hearing_test.csv", kernel_approximation=False,
+                              governor=ResourceGovernor(memory_limit=20 << 20, min_rows=500))
+        evaluator.load_data()
+        evaluator.set_target("test_result")
+        evaluator.prepare_data()
+        best_model, best_score = evaluator.find_best_classifier_model()
+        report = evaluator.governor_report
+
+        # The linear model fits whole; the kernel cache of the exact SVC needs a subsample
+        self.assertEqual(report["Logistic Regression"]["action"], "fitted")
+        self.assertEqual(report["Logistic Regression"]["n_rows"], len(evaluator.y_train))
+        self.assertEqual(report["SVC"]["action"], "subsampled")
+        self.assertLess(report["SVC"]["n_rows"], len(evaluator.y_train))
+        self.assertLessEqual(report["SVC"]["estimated_memory_bytes"], 20 << 20)
+        self.assertIs(evaluator.stored_result(best_model)["model"], best_model)
+
+        # A candidate that cannot fit even min_rows rows is skipped
+        governor = ResourceGovernor(memory_limit=1 << 20)
+        self.assertEqual(governor.plan(evaluator.get_classifier_models()["SVC"], 100000, 10, 1000)[0], 0)
+
+        # A fit that overruns the time limit is killed
+        with self.assertRaises(TimeoutError):
+            ResourceGovernor(time_limit=0.2).run(time.sleep, 5)
+        self.assertEqual(ResourceGovernor(time_limit=5).run(max, 1, 2), 2)
+
+    def test_resource_limits_unsupported_modes(self):
+        # Test that limits are refused on the paths that do not fit through the governor
+        for options in ({"race": True}, {"cv": 3}, {"incremental": True}, {"refresh_state": "state.joblib"}):
+            with self.assertRaises(ValueError):
+                evaluate("hearing_test.csv", "test_result", "classifier", memory_limit=20 << 20, **options)
+        result = evaluate("hearing_test.csv", "test_result", "classifier", time_limit=60)
+        self.assertEqual(result["governor"]["Logistic Regression"]["action"], "fitted")
+
+    def test_stratified_subsample(self):
+        # Test that a subsample keeps the class proportions and every class
+        y = np.array([0] * 900 + [1] * 90 + [2] * 10)
+        rows = stratified_subsample(y, 100)
+        self.assertEqual(np.bincount(y[rows]).tolist(), [90, 9, 1])
+        self.assertTrue(np.all(np.diff(rows) > 0))
+        # Continuous targets are stratified on quantile bins
+        rows = stratified_subsample(np.arange(1000.0), 100, bins=10)
+        self.assertEqual(np.histogram(rows, bins=10, range=(0, 1000))[0].tolist(), [10] * 10)
+
+    @patch('builtins.input', side_effect=AssertionError("input() must not be called"))
+    def test_evaluate_headless(self, mock_input):
+        # Test for running a whole evaluation without any prompt
+        with tempfile.TemporaryDirectory() as folder:
+            output_path = os.path.join(folder, "model.joblib")
+            result = evaluate("hearing_test.csv", "test_result", "classifier", output_path)
+
+            # Assertions to check the expected output
+            self.assertTrue(os.path.exists(output_path))
+        self.assertEqual(result["best_model"], "SVC")
+        self.assertGreater(result["best_score"], 0.9)
+        self.assertEqual(result["metrics"]["accuracy"], result["best_score"])
+        self.assertEqual(len(result["metrics"]["confusion_matrix"]), 2)
+
+    def test_load_data_missing_file(self):
+        # Test that a missing file raises instead of exiting the process
+        evaluator = Evaluator("regressor", "missing.csv")
+        with patch('builtins.print'):
+            with self.assertRaises(FileNotFoundError):
+                evaluator.load_data()
+
+    def test_evaluate_many(self):
+        # Test for evaluating a manifest of jobs on a process pool
+        with tempfile.TemporaryDirectory() as folder:
+            manifest_path = os.path.join(folder, "manifest.json")
+            with open(manifest_path, "w") as file:
+                json.dump([
+                    {"file_path": os.path.abspath("Advertising.csv"), "target_col": "sales", "model_type": "regressor"},
+                    {"file_path": os.path.abspath("hearing_test.csv"), "target_col": "test_result", "model_type": "classifier"},
+                    {"file_path": "missing.csv", "target_col": "sales", "model_type": "regressor"},
+                ], file)
+            results = evaluate_many(load_manifest(manifest_path), max_workers=2)
+
+        # Results come back in manifest order and a failing job does not stop the others
+        self.assertEqual([result["status"] for result in results], ["ok", "ok", "error"])
+        self.assertEqual(results[0]["target_col"], "sales")
+        self.assertEqual(results[1]["best_model"], "SVC")
+        self.assertIn("FileNotFoundError", results[2]["error"])
+
 if __name__ == '__main__':
     unittest.main()
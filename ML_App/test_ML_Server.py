@@ -0,0 +1,200 @@
+import unittest
+from unittest.mock import patch
+import os
+import io
+import json
+import tempfile
+import threading
+import urllib.request
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge, LogisticRegression
+from sklearn.neighbors import KNeighborsRegressor
+from ML_App import Evaluator
+from ML_Scoring import ARTIFACT_VERSION
+from ML_Server import load_artifact, predict_rows, serve_stream, make_http_server, MicroBatcher
+
+class TestServer(unittest.TestCase):
+    @patch('builtins.input', side_effect=["sales"])
+    def setUp(self, mock_input):
+        # Train a regressor on Advertising.csv and save it with its scaler
+        self.folder = tempfile.TemporaryDirectory()
+        self.evaluator = Evaluator("regressor", "Advertising.csv")
+        self.evaluator.load_data()
+        self.evaluator.get_user_input()
+        self.evaluator.prepare_data()
+        self.best_model, _ = self.evaluator.find_best_regressor_model()
+        self.model_path = os.path.join(self.folder.name, "model.joblib")
+        with patch('builtins.input', side_effect=["y", self.model_path]):
+            self.evaluator.save_best_model(self.best_model)
+        self.rows = pd.read_csv("Advertising.csv").head(20)
+        self.expected = self.best_model.predict(self.evaluator.scaler.transform(self.rows[self.evaluator.feature_names]))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_load_artifact(self):
+        # Test that the saved file bundles the scaler and the feature schema
+        artifact = load_artifact(self.model_path)
+        self.assertEqual(artifact["features"], ["TV", "radio", "newspaper"])
+        self.assertIsNotNone(artifact["scaler"])
+        np.testing.assert_allclose(predict_rows(artifact, self.rows), self.expected)
+
+    def test_load_bare_model(self):
+        # Test that files holding only the estimator can still be served
+        path = os.path.join(self.folder.name, "bare.joblib")
+        joblib.dump(self.best_model, path)
+        artifact = load_artifact(path)
+        self.assertIsNone(artifact["scaler"])
+
+    def test_categorical_artifact(self):
+        # Test that the saved pipeline encodes raw string columns
+        evaluator = Evaluator("regressor", "insurance.csv")
+        evaluator.load_data()
+        evaluator.set_target("charges")
+        evaluator.prepare_data()
+        best_model, _ = evaluator.find_best_regressor_model()
+        path = os.path.join(self.folder.name, "insurance.joblib")
+        evaluator.save_best_model(best_model, path)
+        rows = pd.read_csv("insurance.csv").head(5)
+        self.assertEqual(len(predict_rows(load_artifact(path), rows)), 5)
+
+    def test_linear_export(self):
+        # Test that an exported linear model scores raw rows like the joblib artifact
+        evaluator = Evaluator("regressor", "insurance.csv")
+        evaluator.load_data()
+        evaluator.set_target("charges")
+        evaluator.prepare_data()
+        model = Ridge().fit(evaluator.X_train, evaluator.y_train)
+        path = os.path.join(self.folder.name, "insurance.npz")
+        evaluator.save_best_model(model, path)
+
+        # Missing numbers are imputed and unseen categories are ignored, like the pipeline
+        rows = pd.read_csv("insurance.csv").head(20)
+        rows.loc[0, "bmi"] = np.nan
+        rows.loc[1, "region"] = "unknown"
+        expected = model.predict(evaluator.scaler.transform(rows[evaluator.feature_names]))
+        artifact = load_artifact(path)
+        np.testing.assert_allclose(predict_rows(artifact, rows), expected)
+        # NumPy-only scoring also takes plain columns
+        np.testing.assert_allclose(predict_rows(artifact, rows.to_dict(orient="list")), expected)
+
+        # Classifiers predict their class labels
+        evaluator = Evaluator("classifier", "hearing_test.csv")
+        evaluator.load_data()
+        evaluator.set_target("test_result")
+        evaluator.prepare_data()
+        model = LogisticRegression().fit(evaluator.X_train, evaluator.y_train)
+        evaluator.save_best_model(model, path)
+        rows = pd.read_csv("hearing_test.csv").head(50)
+        np.testing.assert_array_equal(predict_rows(load_artifact(path), rows),
+                                      model.predict(evaluator.scaler.transform(rows[evaluator.feature_names])))
+
+    def test_artifact_version(self):
+        # Test that non-linear models cannot be exported and newer artifacts are refused
+        with self.assertRaises(ValueError):
+            self.evaluator.save_best_model(KNeighborsRegressor().fit(self.evaluator.X_train, self.evaluator.y_train),
+                                           os.path.join(self.folder.name, "knn.npz"))
+        artifact = self.evaluator.build_artifact(self.best_model)
+        self.assertEqual(artifact["version"], ARTIFACT_VERSION)
+        path = os.path.join(self.folder.name, "future.joblib")
+        joblib.dump({**artifact, "version": ARTIFACT_VERSION + 1}, path)
+        with self.assertRaises(ValueError):
+            load_artifact(path)
+
+    def test_micro_batcher(self):
+        # Test that concurrent requests are merged and answered correctly
+        batcher = MicroBatcher(load_artifact(self.model_path), max_wait=0.05)
+        results = {}
+
+        def request(i):
+            results[i] = batcher.predict(self.rows.iloc[[i]])
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(len(self.rows))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        # Assertions to check the expected output
+        np.testing.assert_allclose([results[i][0] for i in range(len(self.rows))], self.expected)
+        stats = batcher.stats.summary()
+        self.assertEqual(stats["rows"], len(self.rows))
+        self.assertLess(stats["batches"], len(self.rows))
+        self.assertIsNotNone(stats["latency_p99_ms"])
+
+    def test_serve_stream(self):
+        # Test for scoring CSV and NDJSON rows from a stream
+        artifact = load_artifact(self.model_path)
+        for input_format, text in [
+            ("csv", self.rows.to_csv(index=False)),
+            ("ndjson", self.rows.to_json(orient="records", lines=True)),
+        ]:
+            output = io.StringIO()
+            stats = serve_stream(artifact, io.StringIO(text), output, input_format, max_batch_rows=8)
+            predictions = [json.loads(line) for line in output.getvalue().splitlines()]
+            np.testing.assert_allclose(predictions, self.expected)
+            self.assertEqual(stats.summary()["rows"], len(self.rows))
+
+    def test_micro_batcher_bad_request(self):
+        # Test that a bad request fails alone and the rest of its batch is answered
+        batcher = MicroBatcher(load_artifact(self.model_path), max_wait=0.05)
+        bad = self.rows.iloc[[0]].astype({"TV": object})
+        bad.loc[bad.index[0], "TV"] = "abc"
+        results, errors = {}, {}
+
+        def request(i):
+            try:
+                results[i] = batcher.predict(bad if i == 0 else self.rows.iloc[[i]])
+            except Exception as error:
+                errors[i] = error
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(len(self.rows))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        # Assertions to check the expected output
+        self.assertEqual(list(errors), [0])
+        np.testing.assert_allclose([results[i][0] for i in range(1, len(self.rows))], self.expected[1:])
+
+    def test_serve_stream_bad_rows(self):
+        # Test that a bad row gets an error record and the other rows of its batch are scored
+        artifact = load_artifact(self.model_path)
+        csv_lines = self.rows.to_csv(index=False).splitlines()
+        csv_lines[3] = "abc,1,2,3"
+        ndjson_lines = self.rows.to_json(orient="records", lines=True).splitlines()
+        ndjson_lines[2] = "{not json"
+        for input_format, lines in [("csv", csv_lines), ("ndjson", ndjson_lines)]:
+            output = io.StringIO()
+            serve_stream(artifact, io.StringIO("\n".join(lines) + "\n"), output, input_format, max_batch_rows=8)
+            records = [json.loads(line) for line in output.getvalue().splitlines()]
+            self.assertIn("error", records[2])
+            np.testing.assert_allclose(records[:2] + records[3:], np.delete(self.expected, 2))
+
+    def test_http_server(self):
+        # Test for scoring rows over a local HTTP socket
+        server = make_http_server(load_artifact(self.model_path), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            body = self.rows.to_csv(index=False).encode()
+            with urllib.request.urlopen(urllib.request.Request(url + "/predict", data=body)) as response:
+                predictions = [json.loads(line) for line in response.read().decode().splitlines()]
+            with urllib.request.urlopen(url + "/stats") as response:
+                stats = json.loads(response.read())
+        finally:
+            server.shutdown()
+            server.batcher.close()
+
+        # Assertions to check the expected output
+        np.testing.assert_allclose(predictions, self.expected)
+        self.assertEqual(stats["rows"], len(self.rows))
+
+if __name__ == '__main__':
+    unittest.main()